@@ -3,6 +3,7 @@ from typing import List, Any
 from flask_restx import Namespace
 
 from src.api.models.dto.todo.create_todo_request_dto import CreateTodoRequestDto
+from src.config import app_config_manager
 from src.domain.todo.entity.todo import Todo
 from src.domain.todo_list.entity.todo_list import TodoList
 
@@ -19,3 +20,10 @@ def create_schemas(api: Namespace) -> List[Any]:
         api.schema_model('Todo', Todo.schema()),
         api.schema_model('TodoList', TodoList.schema()),
     ]
+
+
+def is_async_mode() -> bool:
+    """
+    :return: True if endpoints run the async services on the loop of EventLoopManager
+    """
+    return app_config_manager.get_config().API_ASYNC_MODE
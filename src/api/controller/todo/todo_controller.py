@@ -4,13 +4,16 @@ from http import HTTPStatus
 from flask_restx import Resource, Namespace
 from flask import Response, request
 
-from src.api.controller import create_schemas, ROOT_PATH
+from src.api.controller import create_schemas, is_async_mode, ROOT_PATH
 from src.api.models.base_response import BaseResponse
 from src.api.models.dto.todo.create_todo_request_dto import CreateTodoRequestDto
+from src.api.models.dto.todo.todo_response_dto import TodoResponseDto
 from src.api.models.dto.todo.update_todo_request_dto import UpdateTodoRequestDto
+from src.api.models.dto.page_request_dto import PageRequestDto
 from src.api.security.guards import authorization_guard, todo_scope
+from src.api.services.async_todo_api_service import AsyncTodoApiService
 from src.api.services.todo_api_service import TodoApiService
-from src.domain.todo.entity.todo import Todo
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
 
 namespace = Namespace(
     'Todo API',
@@ -29,24 +32,39 @@ update_todo_request_schema = namespace.schema_model(
 
 # response dto
 todo_response_schema = namespace.schema_model(
-    'todo_response_schema', BaseResponse[Todo].schema())
+    'todo_response_schema', BaseResponse[TodoResponseDto].schema())
 
 todo_list_response_schema = namespace.schema_model(
-    'todo_response_schema', BaseResponse[List[Todo]].schema())
+    'todo_response_schema', BaseResponse[List[TodoResponseDto]].schema())
 
 
 @namespace.route(ROOT_PATH)
 class ToDoController(Resource):
-    @namespace.doc(description='Returns all todos', security='api_key')
+    @namespace.doc(description='Returns a page of todos, next_cursor of the response requests the next page',
+                   security='api_key',
+                   params={'cursor': 'Cursor of the page', 'page_size': 'Number of todos in the page',
+                           'stream': 'Stream all todos if 1, paging parameters are ignored'})
     @namespace.response(200, 'OK', todo_list_response_schema)
     @authorization_guard(todo_scope.read)
     def get(self) -> Response:
-        todo_api = TodoApiService()
-        todos = todo_api.get_all_todos()
+        page_request_dto = PageRequestDto.parse_obj(request.args.to_dict())
+
+        if page_request_dto.stream:
+            # Streams read from a server side cursor while the response is sent, they stay sync
+            todo_stream = map(TodoResponseDto.from_todo, TodoApiService().stream_todos())
+            return BaseResponse.create_stream_response(data=todo_stream,
+                                                       message='Todo obtained.',
+                                                       empty_message='No todo found.')
+
+        if is_async_mode():
+            todos, next_cursor = EventLoopManager.run(AsyncTodoApiService().get_todos_page(page_request_dto))
+        else:
+            todos, next_cursor = TodoApiService().get_todos_page(page_request_dto)
 
         message = 'Todo obtained.' if todos else \
             'No todo found.'
-        return BaseResponse.create_response(message=message, data=todos)
+        return BaseResponse.create_response(message=message, data=[TodoResponseDto.from_todo(todo) for todo in todos],
+                                            next_cursor=next_cursor)
 
     @namespace.doc(description='Create a new todo ', security='api_key')
     @namespace.response(201, 'Created', todo_response_schema)
@@ -56,11 +74,14 @@ class ToDoController(Resource):
         data = request.get_json()
         todo_request_dto = CreateTodoRequestDto.parse_obj(data)
 
-        todo_api = TodoApiService()
-        todo = todo_api.create_todo(todo_request_dto)
+        if is_async_mode():
+            todo = EventLoopManager.run(AsyncTodoApiService().create_todo(todo_request_dto))
+        else:
+            todo = TodoApiService().create_todo(todo_request_dto)
 
         message = 'Todo has been created.'
-        return BaseResponse.create_response(message=message, data=todo, status_code=HTTPStatus.CREATED)
+        return BaseResponse.create_response(message=message, data=TodoResponseDto.from_todo(todo),
+                                            status_code=HTTPStatus.CREATED)
 
 
 @namespace.route('/<todo_id>')
@@ -69,10 +90,12 @@ class ToDoDetailController(Resource):
     @namespace.response(200, 'OK', todo_response_schema)
     @authorization_guard(todo_scope.read)
     def get(self, todo_id: str) -> Response:
-        todo_api = TodoApiService()
-        todo = todo_api.get_todo(todo_id)
+        if is_async_mode():
+            todo = EventLoopManager.run(AsyncTodoApiService().get_todo(todo_id))
+        else:
+            todo = TodoApiService().get_todo(todo_id)
 
-        return BaseResponse.create_response(message='Todo obtained.', data=todo)
+        return BaseResponse.create_response(message='Todo obtained.', data=TodoResponseDto.from_todo(todo))
 
     @namespace.doc(description='Updates a Todo.', security='api_key')
     @namespace.response(200, 'OK')
@@ -83,19 +106,23 @@ class ToDoDetailController(Resource):
         data = request.get_json()
         todo_request_dto = UpdateTodoRequestDto.parse_obj(data)
 
-        todo_api = TodoApiService()
-        todo = todo_api.update_todo(todo_id, todo_request_dto)
+        if is_async_mode():
+            todo = EventLoopManager.run(AsyncTodoApiService().update_todo(todo_id, todo_request_dto))
+        else:
+            todo = TodoApiService().update_todo(todo_id, todo_request_dto)
 
         return BaseResponse.create_response(message='Todo has been updated.',
-                                            data=todo)
+                                            data=TodoResponseDto.from_todo(todo))
 
     @namespace.doc(description='Deletes a todo', security='api_key')
     @namespace.response(200, 'OK')
     @namespace.response(400, 'Todo not found')
     @authorization_guard(todo_scope.write)
     def delete(self, todo_id: str) -> Response:
-        todo_api = TodoApiService()
-        todo_api.delete_todo(todo_id)
+        if is_async_mode():
+            EventLoopManager.run(AsyncTodoApiService().delete_todo(todo_id))
+        else:
+            TodoApiService().delete_todo(todo_id)
 
         return BaseResponse.create_response(message='Todo has been deleted.',
                                             status_code=HTTPStatus.OK)
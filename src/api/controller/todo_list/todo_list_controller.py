@@ -4,15 +4,18 @@ from flask_restx import Namespace, Resource
 from flask import Response, request
 from http import HTTPStatus
 
-from src.api.controller import ROOT_PATH
+from src.api.controller import is_async_mode, ROOT_PATH
 from src.api.models.base_response import BaseResponse
+from src.api.models.dto.page_request_dto import PageRequestDto
 from src.api.models.dto.todo_list.create_todo_list_request_dto import CreateTodoListRequestDto
 from src.api.models.dto.todo_list.todo_list_with_todos_response_dto import TodoListWithTodosResponseDto
 from src.api.models.dto.todo_list.update_todo_list_request_dto import UpdateTodoListRequestDto
 
 from src.api.security.guards import authorization_guard, todo_scope
+from src.api.services.async_todolist_api_service import AsyncTodoListApiService
 from src.api.services.todolist_api_service import TodoListApiService
 from src.domain.todo_list.entity.todo_list import TodoList
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
 
 namespace = Namespace(
     'Todo List API',
@@ -39,16 +42,30 @@ todo_list_with_todos_response_schema = namespace.schema_model(
 
 @namespace.route(ROOT_PATH)
 class TodoListController(Resource):
-    @namespace.doc(description='Return all todo lists', security='api_key')
+    @namespace.doc(description='Return a page of todo lists, next_cursor of the response requests the next page',
+                   security='api_key',
+                   params={'cursor': 'Cursor of the page', 'page_size': 'Number of todo lists in the page',
+                           'stream': 'Stream all todo lists if 1, paging parameters are ignored'})
     @namespace.response(200, 'OK', todo_lists_response_schema)
     @authorization_guard(todo_scope.read)
     def get(self) -> Response:
-        service = TodoListApiService()
-        todo_lists = service.get_todo_lists()
+        page_request_dto = PageRequestDto.parse_obj(request.args.to_dict())
+
+        if page_request_dto.stream:
+            # Streams read from a server side cursor while the response is sent, they stay sync
+            return BaseResponse.create_stream_response(data=TodoListApiService().stream_todo_lists(),
+                                                       message='Todolist obtained.',
+                                                       empty_message='No todolist found.')
+
+        if is_async_mode():
+            todo_lists, next_cursor = EventLoopManager.run(
+                AsyncTodoListApiService().get_todo_lists_page(page_request_dto))
+        else:
+            todo_lists, next_cursor = TodoListApiService().get_todo_lists_page(page_request_dto)
 
         message = 'Todolist obtained.' if todo_lists else \
             'No todolist found.'
-        return BaseResponse.create_response(message=message, data=todo_lists)
+        return BaseResponse.create_response(message=message, data=todo_lists, next_cursor=next_cursor)
 
     @namespace.doc(description='Create a new todo list', security='api_key')
     @namespace.response(200, 'OK', todo_list_response_schema)
@@ -58,8 +75,10 @@ class TodoListController(Resource):
         data = request.get_json()
         todo_list_request_dto = CreateTodoListRequestDto.parse_obj(data)
 
-        service = TodoListApiService()
-        todo_list = service.create_todo_list(todo_list_request_dto)
+        if is_async_mode():
+            todo_list = EventLoopManager.run(AsyncTodoListApiService().create_todo_list(todo_list_request_dto))
+        else:
+            todo_list = TodoListApiService().create_todo_list(todo_list_request_dto)
 
         message = 'Todo list has been created.'
         return BaseResponse.create_response(message=message, data=todo_list, status_code=HTTPStatus.CREATED)
@@ -68,13 +87,16 @@ class TodoListController(Resource):
 @namespace.route('/<todo_list_id>')
 class ToDoListDetailController(Resource):
     @namespace.doc(description='Returns the todo list', security='api_key')
-    @namespace.response(200, 'OK', todo_list_response_schema)
+    @namespace.response(200, 'OK', todo_list_with_todos_response_schema)
     @authorization_guard(todo_scope.read)
     def get(self, todo_list_id: str) -> Response:
-        service = TodoListApiService()
-        todo_list = service.get_todo_list_with_todos(todo_list_id)
+        if is_async_mode():
+            todo_list = EventLoopManager.run(AsyncTodoListApiService().get_todo_list_with_todos(todo_list_id))
+        else:
+            todo_list = TodoListApiService().get_todo_list_with_todos(todo_list_id)
 
-        return BaseResponse.create_response(message='Todo list obtained.', data=todo_list)
+        return BaseResponse.create_response(message='Todo list obtained.',
+                                            data=TodoListWithTodosResponseDto.from_todo_list(todo_list))
 
     @namespace.doc(description='Updates a Todo list.', security='api_key')
     @namespace.response(200, 'OK')
@@ -85,8 +107,11 @@ class ToDoListDetailController(Resource):
         data = request.get_json()
         todo_list_request_dto = UpdateTodoListRequestDto.parse_obj(data)
 
-        service = TodoListApiService()
-        todo_list = service.update_todo_list(todo_list_id, todo_list_request_dto)
+        if is_async_mode():
+            todo_list = EventLoopManager.run(
+                AsyncTodoListApiService().update_todo_list(todo_list_id, todo_list_request_dto))
+        else:
+            todo_list = TodoListApiService().update_todo_list(todo_list_id, todo_list_request_dto)
 
         return BaseResponse.create_response(message='Todo list has been updated.',
                                             data=todo_list)
@@ -96,8 +121,10 @@ class ToDoListDetailController(Resource):
     @namespace.response(400, 'Todo list not found')
     @authorization_guard(todo_scope.write)
     def delete(self, todo_list_id: str) -> Response:
-        service = TodoListApiService()
-        service.delete_todo_list(todo_list_id)
+        if is_async_mode():
+            EventLoopManager.run(AsyncTodoListApiService().delete_todo_list(todo_list_id))
+        else:
+            TodoListApiService().delete_todo_list(todo_list_id)
 
         return BaseResponse.create_response(message='Todo list has been deleted.',
                                             status_code=HTTPStatus.OK)
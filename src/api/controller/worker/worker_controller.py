@@ -1,6 +1,6 @@
 from typing import List, Tuple
 
-from flask import Response
+from flask import Response, request
 from flask_restx import Namespace, Resource
 
 from src.api.models.base_response import BaseResponse
@@ -22,11 +22,19 @@ todo_user_list_response_schema = namespace.schema_model(
 
 @namespace.route('/expired')
 class UpdateExpiredController(Resource):
-    @namespace.doc(description='Updates expired todos', security='api_key')
+    @namespace.doc(description='Updates expired todos. With "Accept: application/x-ndjson", '
+                               'each todo and user pair is streamed as a line, followed by a line of the response',
+                   security='api_key')
     @namespace.response(200, 'OK', todo_user_list_response_schema)
     @authorization_guard(worker_scope.worker)
     def put(self) -> Response:
         service = TodoWorkerService()
+        if request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == \
+                'application/x-ndjson':
+            return BaseResponse.create_ndjson_response(data=service.iter_expired_todos(),
+                                                       message='Expired todos updated.',
+                                                       empty_message='No expired todo found.')
+
         todo_user_list = service.update_expired_todos()
 
         message = 'Expired todos updated.' if todo_user_list \
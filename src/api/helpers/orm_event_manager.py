@@ -1,19 +1,29 @@
+from typing import Sequence
+
 from sqlalchemy import event
 from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Mapper
 
+from src.api.services.async_todo_api_service import AsyncTodoApiService
+from src.api.services.async_todolist_api_service import AsyncTodoListApiService
 from src.api.services.todo_api_service import TodoApiService
 from src.api.services.todolist_api_service import TodoListApiService
 from src.infrastructure.entity.todo.todo import Todo
 from src.domain.todo.entity.todo import Todo as DomainTodo
 from src.infrastructure.entity.todo_list.todo_list import TodoList
 from src.domain.todo_list.entity.todo_list import TodoList as DomainTodoList
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
+from src.infrastructure.repository.base.repository_events import RepositoryEvents
 
 
 class OrmEventManager:
+    _is_initialized = False
 
-    @staticmethod
-    def init() -> None:
+    @classmethod
+    def init(cls) -> None:
+        if cls._is_initialized:
+            return
+        cls._is_initialized = True
 
         @event.listens_for(Todo, 'after_insert')
         def receive_after_insert(mapper: Mapper, connection: Connection, target: Todo) -> None:
@@ -31,15 +41,53 @@ class OrmEventManager:
         def receive_after_update(mapper: Mapper, connection: Connection, target: TodoList) -> None:
             OrmEventManager._on_todo_list_committed(target)
 
+        # Bulk writes and single statement updates of repositories do not emit mapper events
+        RepositoryEvents.listen_write(Todo, OrmEventManager._on_todos_written)
+        RepositoryEvents.listen_write(TodoList, OrmEventManager._on_todo_lists_written)
+
     @staticmethod
     def _on_todo_committed(todo: Todo) -> None:
-        domain_todo = DomainTodo.parse_obj(todo.__dict__)
-        TodoApiService.on_todo_committed(domain_todo)
-
-        # clear todo list cache
-        TodoListApiService.on_todo_committed(domain_todo.user_id)
+        # Attribute values of the flushed instance, the instance state is not a field
+        domain_todo = DomainTodo.parse_obj_trusted(todo.__dict__)
+        OrmEventManager._on_todos_written([domain_todo])
 
     @staticmethod
     def _on_todo_list_committed(todo_list: TodoList) -> None:
-        domain_todo_list = DomainTodoList.parse_obj(todo_list.__dict__)
-        TodoListApiService.on_todo_list_committed(domain_todo_list)
+        domain_todo_list = DomainTodoList.parse_obj_trusted(todo_list.__dict__)
+        OrmEventManager._on_todo_lists_written([domain_todo_list])
+
+    @staticmethod
+    def _on_todos_written(todos: Sequence[DomainTodo]) -> None:
+        # Writes of the async serving mode run on the loop thread, Redis is updated without blocking it
+        if EventLoopManager.is_loop_thread():
+            EventLoopManager.spawn(OrmEventManager._on_todos_written_async(todos))
+            return
+
+        for todo in todos:
+            TodoApiService.on_todo_committed(todo)
+
+        # clear todo list caches once per user
+        for user_id in {todo.user_id for todo in todos}:
+            TodoListApiService.on_todo_committed(user_id)
+
+    @staticmethod
+    def _on_todo_lists_written(todo_lists: Sequence[DomainTodoList]) -> None:
+        if EventLoopManager.is_loop_thread():
+            EventLoopManager.spawn(OrmEventManager._on_todo_lists_written_async(todo_lists))
+            return
+
+        for todo_list in todo_lists:
+            TodoListApiService.on_todo_list_committed(todo_list)
+
+    @staticmethod
+    async def _on_todos_written_async(todos: Sequence[DomainTodo]) -> None:
+        for todo in todos:
+            await AsyncTodoApiService.on_todo_committed(todo)
+
+        for user_id in {todo.user_id for todo in todos}:
+            await AsyncTodoListApiService.on_todo_committed(user_id)
+
+    @staticmethod
+    async def _on_todo_lists_written_async(todo_lists: Sequence[DomainTodoList]) -> None:
+        for todo_list in todo_lists:
+            await AsyncTodoListApiService.on_todo_list_committed(todo_list)
@@ -1,19 +1,29 @@
 from __future__ import annotations
 
+import json
+import logging
 from http import HTTPStatus
-from typing import Optional, TypeVar, Generic
+from itertools import chain
+from typing import Optional, TypeVar, Generic, Iterable, Iterator, Dict, Any, List
 
-from flask import Response
+from flask import Response, stream_with_context
+from pydantic import BaseModel
 from pydantic.generics import GenericModel
+from pydantic.json import pydantic_encoder
 
 DataT = TypeVar('DataT')
 
+logger = logging.getLogger(__name__)
+
 
 class BaseResponse(GenericModel, Generic[DataT]):
     success: bool = True
     message: Optional[str] = None
     code: Optional[str] = None
     data: Optional[DataT] = None
+    next_cursor: Optional[str] = None
+
+    _stream_chunk_size = 64 * 1024  # characters written at once by stream responses
 
     @classmethod
     def create_response(cls,
@@ -21,7 +31,111 @@ class BaseResponse(GenericModel, Generic[DataT]):
                         message: Optional[str] = None,
                         code: Optional[str] = None,
                         data: Optional[DataT] = None,
-                        status_code: int = HTTPStatus.OK) -> Response:
-        base_response = cls(success=success, message=message, code=code, data=data)
+                        status_code: int = HTTPStatus.OK,
+                        next_cursor: Optional[str] = None) -> Response:
+        base_response = cls(success=success, message=message, code=code, data=data, next_cursor=next_cursor)
         return Response(response=base_response.json(exclude_none=True, ensure_ascii=False), status=status_code,
                         mimetype='application/json; charset=utf-8')
+
+    @classmethod
+    def create_stream_response(cls,
+                               data: Iterable[BaseModel],
+                               message: Optional[str] = None,
+                               empty_message: Optional[str] = None,
+                               status_code: int = HTTPStatus.OK) -> Response:
+        """
+        Write items into the response envelope one by one while they are read, instead of building the whole body.
+
+        :param data: Items of the data list, iterated lazily after the first item
+        :param message: Message of the response if there are items
+        :param empty_message: Message of the response if there is no item
+        :param status_code: Status code of the response
+        """
+        items = iter(data)
+        # The first item is read before the response starts, so the message and errors of the query can still be set
+        first_item = next(items, None)
+
+        envelope: Dict[str, Any] = {'success': True}
+        if response_message := message if first_item is not None else empty_message:
+            envelope['message'] = response_message
+        head = json.dumps(envelope, ensure_ascii=False)[:-1]
+
+        def generate() -> Iterator[str]:
+            if first_item is None:
+                yield f'{head}, "data": []}}'
+                return
+
+            chunk: List[str] = [f'{head}, "data": [', first_item.json(exclude_none=True, ensure_ascii=False)]
+            chunk_size = 0
+            try:
+                for item in items:
+                    item_json = item.json(exclude_none=True, ensure_ascii=False)
+                    chunk.append(',')
+                    chunk.append(item_json)
+                    chunk_size += len(item_json)
+                    if chunk_size >= cls._stream_chunk_size:
+                        yield ''.join(chunk)
+                        chunk = []
+                        chunk_size = 0
+            except Exception:
+                # Status is already sent, the response is left as an invalid JSON
+                logger.critical('Stream response is interrupted.', exc_info=True)
+                raise
+            chunk.append(']}')
+            yield ''.join(chunk)
+
+        return Response(response=stream_with_context(generate()), status=status_code,
+                        mimetype='application/json; charset=utf-8')
+
+    @classmethod
+    def create_ndjson_response(cls,
+                               data: Iterable[Any],
+                               message: Optional[str] = None,
+                               empty_message: Optional[str] = None,
+                               status_code: int = HTTPStatus.OK) -> Response:
+        """
+        Write items as lines of JSON while they are read, followed by a line of the response envelope without data.
+        Clients can process the items as they arrive, the envelope line marks the end of a complete response.
+
+        :param data: Items, iterated lazily after the first item
+        :param message: Message of the response if there are items
+        :param empty_message: Message of the response if there is no item
+        :param status_code: Status code of the response
+        """
+        items = iter(data)
+        # The first item is read before the response starts, so errors of the query can still be returned
+        first_item = next(items, None)
+
+        def generate() -> Iterator[str]:
+            chunk: List[str] = []
+            chunk_size = 0
+            if first_item is not None:
+                try:
+                    for item in chain([first_item], items):
+                        item_json = json.dumps(item, default=cls._encode_json, ensure_ascii=False)
+                        chunk.append(f'{item_json}\n')
+                        chunk_size += len(item_json)
+                        if chunk_size >= cls._stream_chunk_size:
+                            yield ''.join(chunk)
+                            chunk = []
+                            chunk_size = 0
+                except Exception:
+                    # Status is already sent, the failure is reported by the envelope line
+                    logger.critical('NDJSON response is interrupted.', exc_info=True)
+                    envelope = cls(success=False, message='Response is interrupted.', code='response_interrupted')
+                    chunk.append(f'{envelope.json(exclude_none=True, ensure_ascii=False)}\n')
+                    yield ''.join(chunk)
+                    return
+
+            envelope = cls(message=message if first_item is not None else empty_message)
+            chunk.append(f'{envelope.json(exclude_none=True, ensure_ascii=False)}\n')
+            yield ''.join(chunk)
+
+        return Response(response=stream_with_context(generate()), status=status_code,
+                        mimetype='application/x-ndjson; charset=utf-8')
+
+    @staticmethod
+    def _encode_json(obj: Any) -> Any:
+        if isinstance(obj, BaseModel):
+            return obj.dict(exclude_none=True)
+        return pydantic_encoder(obj)
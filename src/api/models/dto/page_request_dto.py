@@ -0,0 +1,9 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PageRequestDto(BaseModel):
+    cursor: Optional[str] = None  # next_cursor of the previous page
+    page_size: Optional[int] = Field(default=None, ge=1)
+    stream: bool = False  # stream all items instead of a page
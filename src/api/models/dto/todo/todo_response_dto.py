@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from src.domain.todo.entity.todo import Todo
+
+
+class TodoResponseDto(Todo):
+    # Open todos past their valid until date are expired before the expiry sweep persists the status
+    expired: bool = False
+
+    @classmethod
+    def from_todo(cls, todo: Todo) -> TodoResponseDto:
+        return cls.construct(**todo.__dict__, expired=todo.is_expired)
@@ -1,12 +1,26 @@
+from __future__ import annotations
+
 from typing import List
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
-from src.domain.todo.entity.todo import Todo
+from src.api.models.dto.todo.todo_response_dto import TodoResponseDto
+from src.domain.base.model.base_entity_model import BaseEntityModel
+from src.domain.todo_list.entity.todo_list import TodoList
 
 
-class TodoListWithTodosResponseDto(BaseModel):
+class TodoListWithTodosResponseDto(BaseEntityModel):
     name: str = Field(max_length=50)
     user_id: str
     status_id: int
-    todos: List[Todo]
+    todos: List[TodoResponseDto]
+
+    @classmethod
+    def from_todo_list(cls, todo_list: TodoList) -> TodoListWithTodosResponseDto:
+        return cls.construct(id=todo_list.id,
+                             created_date=todo_list.created_date,
+                             modified_date=todo_list.modified_date,
+                             name=todo_list.name,
+                             user_id=todo_list.user_id,
+                             status_id=todo_list.status_id,
+                             todos=[TodoResponseDto.from_todo(todo) for todo in todo_list.todos or []])
@@ -1,12 +1,16 @@
+import hashlib
 from typing import Dict, Any
 
 import jwt
 from flask import request
-import requests
 
 from src.api.models.dto.user_info_dto import UserInfoResponseDto
+from src.api.security.jwks_key_store import JwksKeyStore
 from src.config import app_config_manager
 from src.domain.common.error.authentication_errors import InvalidTokenError
+from src.infrastructure.cache.ttl_lru_cache import TTLLRUCache
+from src.infrastructure.client.http_session import create_http_session
+from src.profiling.request_timer_manager import RequestTimerManager
 
 
 class Auth0Service:
@@ -18,18 +22,36 @@ class Auth0Service:
         self.issuer_url = f'https://{self.config.AUTH0_DOMAIN}/'
         self.jwks_uri = f'{self.issuer_url}.well-known/jwks.json'
         self.audience = self.config.AUTH0_AUDIENCE
+        # keep-alive connections to Auth0, shared by the threads of the process
+        self.http_session = create_http_session(pool_maxsize=self.config.AUTH0_HTTP_POOL_SIZE)
+        self.jwks_key_store = JwksKeyStore(
+            self.jwks_uri,
+            self.http_session,
+            ttl=self.config.AUTH0_JWKS_CACHE_TTL,
+            stale_ttl=self.config.AUTH0_JWKS_STALE_TTL,
+            min_refresh_interval=self.config.AUTH0_JWKS_MIN_REFRESH_INTERVAL)
+        # validated token payloads by token digest, entries expire at the token exp claim
+        self.token_payload_cache: TTLLRUCache[str, Dict[str, Any]] = TTLLRUCache(
+            maxsize=self.config.AUTH0_TOKEN_CACHE_SIZE)
+        RequestTimerManager.add_metrics_callback('auth0_token_cache', self.token_cache_stats)
 
     def get_signing_key(self, token: str) -> str:
         try:
             if not self.jwks_uri:
                 raise Exception("Initialize Auth Service Error ")
-            jwks_client = jwt.PyJWKClient(self.jwks_uri)
+            kid = jwt.get_unverified_header(token).get('kid')
+            if not kid:
+                raise InvalidTokenError
 
-            return jwks_client.get_signing_key_from_jwt(token).key
+            return self.jwks_key_store.get_signing_key(kid)
         except Exception:
             raise InvalidTokenError
 
     def validate_jwt(self, token: str) -> Dict[str, Any]:
+        token_digest = hashlib.sha256(token.encode()).hexdigest()
+        if payload := self.token_payload_cache.get(token_digest):
+            return payload
+
         try:
             jwt_signing_key = self.get_signing_key(token)
 
@@ -43,8 +65,13 @@ class Auth0Service:
         except Exception:
             raise InvalidTokenError
 
+        if exp := payload.get('exp'):
+            self.token_payload_cache.set(token_digest, payload, expires_at=float(exp))
         return payload
 
+    def token_cache_stats(self) -> Dict[str, int]:
+        return self.token_payload_cache.stats()
+
     def get_bearer_token_from_request(self) -> str:
         authorization_header = request.headers.get("Authorization", None)
 
@@ -68,8 +95,8 @@ class Auth0Service:
         return bearer_token
 
     def get_userinfo(self, token: str) -> UserInfoResponseDto:
-        response = requests.post(f'{self.issuer_url}userinfo',
-                                 headers={f'Authorization': f'Bearer {token}'},
-                                 timeout=4.0)
+        response = self.http_session.post(f'{self.issuer_url}userinfo',
+                                          headers={f'Authorization': f'Bearer {token}'},
+                                          timeout=4.0)
 
         return UserInfoResponseDto.parse_obj(response.json())
@@ -3,6 +3,7 @@ from types import SimpleNamespace
 from typing import Callable, TypeVar, Any, cast
 from flask import g
 
+from src.api.security.user_provisioner import UserProvisioner
 from src.domain.common.error.authentication_errors import InvalidTokenError, PermissionDeniedError
 from src.domain.user.errors.user_errors import DeactivatedUserError
 from src.domain.user.entity.user import User
@@ -69,22 +70,11 @@ def authorization_guard(*required_permissions: SimpleNamespace) -> Callable[...,
 
 def check_user_if_not_upsert(token_sub: str, token: str) -> User:
     uow = UOWManager.get_uow()
-    with uow:
-        user = uow.users.get_sub_id(token_sub)
-        if not user:
-            auth0_service = AuthManager.get_auth()
-            user_info_response_dto = auth0_service.get_userinfo(token)
-
-            user = uow.users.get_by_email(user_info_response_dto.email)
-            if not user:
-                user = User.create(user_info_response_dto.sub,
-                                   user_info_response_dto.email)
-                uow.users.insert(user)
-            else:
-                user.sub_id = user_info_response_dto.sub
-                uow.users.update(user)
+    user = uow.users.get_sub_id_cached(token_sub)
+    if not user:
+        user = UserProvisioner.provision(token_sub, token)
 
-        if user.status_id != UserStatuses.enabled.id:
-            raise DeactivatedUserError(user=user)
+    if user.status_id != UserStatuses.enabled.id:
+        raise DeactivatedUserError(user=user)
 
-        return user
+    return user
@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import jwt
+import requests
+
+from src.domain.common.error.authentication_errors import InvalidTokenError
+
+
+class JwksKeyStore:
+    """
+    Process-wide JSON Web Key Set store indexed by key id (kid).
+
+    Fresh keys are served from memory. Stale keys are still served while a background thread refreshes
+    the key set, so short JWKS outages do not break authentication. Only an unknown kid forces a
+    synchronous refetch, and forced refetches are rate limited.
+    """
+    logger = logging.getLogger(__name__)
+
+    def __init__(self,
+                 jwks_uri: str,
+                 http_session: requests.Session,
+                 ttl: int,
+                 stale_ttl: int,
+                 min_refresh_interval: int,
+                 timeout: float = 4.0) -> None:
+        """
+        :param jwks_uri: URL of the JSON Web Key Set
+        :param http_session: Session to fetch the key set
+        :param ttl: Seconds the fetched key set is considered fresh
+        :param stale_ttl: Seconds a stale key set is still served while it is refreshed
+        :param min_refresh_interval: Minimum seconds between two forced refetches
+        :param timeout: Timeout of the JWKS request in seconds
+        """
+        self.jwks_uri = jwks_uri
+        self.http_session = http_session
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._last_fetch_attempt = 0.0
+        self._fetch_lock = threading.Lock()
+        self._background_refresh_lock = threading.Lock()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self._fetched_at
+
+    def get_signing_key(self, kid: str) -> Any:
+        key = self._keys.get(kid)
+        if key is None:
+            # Unknown kid, keys may be rotated
+            self._refresh(forced=True)
+            key = self._keys.get(kid)
+            if key is None:
+                raise InvalidTokenError(kid=kid)
+            return key
+
+        age = self.age
+        if age <= self.ttl:
+            return key
+
+        if age <= self.ttl + self.stale_ttl:
+            # Serve the stale key and refresh in background
+            self._refresh_in_background()
+            return key
+
+        # Key set is too old to be trusted without a refetch
+        if not self._refresh(forced=False):
+            raise InvalidTokenError(kid=kid)
+        key = self._keys.get(kid)
+        if key is None:
+            raise InvalidTokenError(kid=kid)
+        return key
+
+    def _refresh_in_background(self) -> None:
+        if not self._background_refresh_lock.acquire(blocking=False):
+            # Another thread is already refreshing
+            return
+
+        def refresh() -> None:
+            try:
+                self._refresh(forced=False)
+            finally:
+                self._background_refresh_lock.release()
+
+        try:
+            threading.Thread(target=refresh, name='jwks-refresh', daemon=True).start()
+        except Exception:
+            self._background_refresh_lock.release()
+            raise
+
+    def _refresh(self, forced: bool) -> bool:
+        """
+        Fetch the key set and replace the stored keys.
+
+        :param forced: Refetch requested by an unknown kid, rate limited by min_refresh_interval
+        :return: True if the stored keys are fresh after the call
+        """
+        requested_at = time.monotonic()
+        with self._fetch_lock:
+            if self._fetched_at > requested_at:
+                # Keys are refreshed by another thread meanwhile
+                return True
+
+            now = time.monotonic()
+            if forced and now - self._last_fetch_attempt < self.min_refresh_interval:
+                return False
+            self._last_fetch_attempt = now
+
+            try:
+                keys = self._fetch_keys()
+            except Exception:
+                self.logger.warning('JWKS could not be fetched from %s', self.jwks_uri, exc_info=True)
+                return False
+
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            return True
+
+    def _fetch_keys(self) -> Dict[str, Any]:
+        response = self.http_session.get(self.jwks_uri, timeout=self.timeout)
+        response.raise_for_status()
+
+        jwk_set = jwt.PyJWKSet.from_dict(response.json())
+        keys: Dict[str, Any] = {}
+        for jwk in jwk_set.keys:
+            use: Optional[str] = jwk.public_key_use
+            if jwk.key_id and use in ('sig', None):
+                keys[jwk.key_id] = jwk.key
+        return keys
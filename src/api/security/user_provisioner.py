@@ -0,0 +1,128 @@
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from typing import Dict
+
+from redis.exceptions import LockError, RedisError
+from sqlalchemy.exc import IntegrityError
+
+from src.domain.user.entity.user import User
+from src.infrastructure.manager.auth_manager import AuthManager
+from src.infrastructure.manager.redis_manager import RedisManager
+from src.infrastructure.manager.uow_manager import UOWManager
+
+
+class UserProvisioner:
+    """
+    Coalesces concurrent provisioning of the same user into one userinfo call and one upsert.
+
+    Threads of a worker wait on the future of the first thread, and gunicorn workers are serialized
+    by a Redis lock per sub id. Without Redis workers race, the insert of the loser fails on the unique email
+    and the user of the winner is read.
+    """
+    logger = logging.getLogger(__name__)
+
+    _lock_ttl = 10  # seconds, must be longer than a userinfo call and an upsert
+    _lock_wait = 10  # seconds to wait for the lock of another worker
+    _future_wait = 20  # seconds to wait for the thread which provisions the user
+
+    _in_flight: Dict[str, 'Future[User]'] = {}
+    _in_flight_lock = threading.Lock()
+
+    @classmethod
+    def provision(cls, token_sub: str, token: str) -> User:
+        """
+        Return user of given sub id, create or update it from Auth0 userinfo if not exists.
+
+        :param token_sub: Sub id of the access token
+        :param token: Access token to obtain userinfo
+        :return: Provisioned user
+        """
+        with cls._in_flight_lock:
+            future = cls._in_flight.get(token_sub)
+            is_leader = future is None
+            if future is None:
+                future = Future()
+                cls._in_flight[token_sub] = future
+
+        if not is_leader:
+            try:
+                return future.result(timeout=cls._future_wait).copy()
+            except FuturesTimeoutError:
+                # The Redis lock still serializes the retry with the slow provisioning
+                cls.logger.warning(f'User provision of {token_sub} is not finished in time, retrying.')
+                return cls._provision_with_lock(token_sub, token)
+
+        try:
+            user = cls._provision_with_lock(token_sub, token)
+            future.set_result(user)
+            return user
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with cls._in_flight_lock:
+                cls._in_flight.pop(token_sub, None)
+
+    @classmethod
+    def _provision_with_lock(cls, token_sub: str, token: str) -> User:
+        lock = RedisManager.get_redis().lock(
+            f'lock_user_provision:{token_sub}',
+            timeout=cls._lock_ttl,
+            blocking_timeout=cls._lock_wait)
+        try:
+            locked = lock.acquire()
+            if not locked:
+                cls.logger.warning(f'User provision lock for {token_sub} could not be acquired.')
+        except RedisError:
+            # Provisioning does not depend on Redis, threads of the worker are still coalesced
+            cls.logger.warning(f'User provision lock for {token_sub} is not available.', exc_info=True)
+            locked = False
+
+        try:
+            return cls._upsert_user(token_sub, token)
+        finally:
+            if locked:
+                try:
+                    lock.release()
+                except LockError:
+                    # Lock is expired and may be acquired by another worker
+                    cls.logger.warning(f'User provision lock for {token_sub} is expired.')
+                except RedisError:
+                    cls.logger.warning(f'User provision lock for {token_sub} is not released.', exc_info=True)
+
+    @classmethod
+    def _upsert_user(cls, token_sub: str, token: str) -> User:
+        try:
+            return cls._write_user(token_sub, token)
+        except Exception as e:
+            # Unit of work raises the errors of commit from their cause
+            if not isinstance(e, IntegrityError) and not isinstance(e.__cause__, IntegrityError):
+                raise
+            # Another worker inserted the user without the lock
+            if user := UOWManager.get_uow().users.get_sub_id(token_sub):
+                cls.logger.info(f'User {token_sub} is provisioned by another worker.')
+                return user
+            raise
+
+    @staticmethod
+    def _write_user(token_sub: str, token: str) -> User:
+        uow = UOWManager.get_uow()
+        with uow:
+            # Another worker may provision the user while waiting for the lock
+            user = uow.users.get_sub_id(token_sub)
+            if user:
+                return user
+
+            auth0_service = AuthManager.get_auth()
+            user_info_response_dto = auth0_service.get_userinfo(token)
+
+            user = uow.users.get_by_email(user_info_response_dto.email)
+            if not user:
+                user = User.create(user_info_response_dto.sub,
+                                   user_info_response_dto.email)
+                uow.users.insert(user)
+            else:
+                user.sub_id = user_info_response_dto.sub
+                uow.users.update(user)
+        return user
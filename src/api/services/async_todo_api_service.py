@@ -0,0 +1,153 @@
+from typing import Optional, List, Tuple
+from flask import g
+from src.api.models.dto.todo.create_todo_request_dto import CreateTodoRequestDto
+from src.api.models.dto.todo.update_todo_request_dto import UpdateTodoRequestDto
+from src.api.models.dto.page_request_dto import PageRequestDto
+from src.api.services.base.base_service import AsyncBaseService
+from src.config import app_config_manager
+
+from src.domain.todo.entity.todo import Todo
+from src.domain.todo.entity.todo_status import TodoStatuses
+from src.domain.todo.errors.todo_errors import InvalidTodoError
+from src.domain.user.errors.user_errors import UserNotFoundError
+import logging
+from src.infrastructure.repository.base.async_unit_of_work import AsyncUnitOfWork
+
+
+class AsyncTodoApiService(AsyncBaseService):
+    """
+    Async variant of TodoApiService, its commit hooks run for writes on the loop of EventLoopManager.
+    """
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, uow: Optional[AsyncUnitOfWork] = None) -> None:
+        super().__init__(uow)
+
+    async def get_todo(self, todo_id: str) -> Todo:
+        """
+        Return object belongs to user.
+
+        :param todo_id: ID of object
+        :return: Object of given id
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        todo = await self.uow.todos.user_get_todo(user_id=user.id, todo_id=todo_id)
+        if not todo:
+            raise InvalidTodoError(todo_id=todo_id)
+
+        return todo
+
+    async def get_all_todos(self) -> List[Todo]:
+        """
+        Return all objects belongs to user.
+
+        :return: Objects of user
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        return await self.uow.todos.user_list_todos(user_id=user.id)
+
+    async def get_todos_page(self, page_request_dto: PageRequestDto) -> Tuple[List[Todo], Optional[str]]:
+        """
+        Return a page of objects belongs to user, ordered by creation.
+
+        :param page_request_dto: Request model of page
+        :return: Objects of page and cursor of the next page
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        return await self.uow.todos.user_list_todos_page(user_id=user.id,
+                                                         page_size=self._get_page_size(page_request_dto.page_size),
+                                                         cursor=page_request_dto.cursor)
+
+    async def create_todo(self, todo_request_dto: CreateTodoRequestDto) -> Todo:
+        """
+        Create a new object for user.
+
+        :param todo_request_dto: Request model to create new object
+
+        :return: Created object instance
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        todo = Todo.create(
+            todo_request_dto.title,
+            todo_request_dto.description,
+            todo_request_dto.valid_until,
+            user.id,
+            todo_request_dto.todo_list_id
+        )
+
+        async with self.uow:
+            self.uow.todos.insert(todo)
+
+        return todo
+
+    async def update_todo(self, todo_id: str, todo_request_dto: UpdateTodoRequestDto) -> Todo:
+        """
+        Update an existing object
+
+        :param todo_id: ID of object
+        :param todo_request_dto: Request model to update object
+        :return: Updated object instance
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        todo = await self.uow.todos.user_get_todo(user_id=user.id, todo_id=todo_id)
+        if not todo:
+            raise InvalidTodoError(todo_id=todo_id)
+
+        todo.title = todo_request_dto.title
+        todo.description = todo_request_dto.description
+        todo.valid_until = todo_request_dto.valid_until
+        todo.todo_list_id = todo_request_dto.todo_list_id
+        todo.status_id = todo_request_dto.status_id
+
+        async with self.uow:
+            await self.uow.todos.update(todo)
+        return todo
+
+    async def delete_todo(self, todo_id: str) -> None:
+        """
+        Soft delete an existing object
+
+        :param todo_id: ID of object
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        async with self.uow:
+            is_updated = await self.uow.todos.user_update_status(
+                user_id=user.id, todo_id=todo_id, status=TodoStatuses.deleted)
+            if not is_updated:
+                raise InvalidTodoError(todo_id=todo_id)
+
+    @classmethod
+    async def on_todo_committed(cls, todo: Todo) -> None:
+        """
+        Async variant of TodoApiService.on_todo_committed, the loop is not blocked by Redis
+
+        :param todo: Todo instance that committed
+        """
+        try:
+            service = cls()
+            await service.update_redis_entry(todo)
+        except:
+            cls.logger.error(f'ToDo for {todo.id} is not updated at Redis', exc_info=True)
+
+    async def update_redis_entry(self, todo: Todo) -> None:
+        await self.uow.todos.update_todo_redis_entry(todo)
+        if app_config_manager.get_config().REDIS_TODO_EXPIRY_INDEX:
+            await self.uow.todos.update_todo_expiry_index(todo)
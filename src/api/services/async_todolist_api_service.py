@@ -0,0 +1,149 @@
+from typing import Optional, List, Tuple
+from flask import g
+
+from src.api.models.dto.page_request_dto import PageRequestDto
+from src.api.models.dto.todo_list.create_todo_list_request_dto import CreateTodoListRequestDto
+from src.api.models.dto.todo_list.update_todo_list_request_dto import UpdateTodoListRequestDto
+from src.api.services.base.base_service import AsyncBaseService
+
+from src.domain.todo_list.entity.todo_list import TodoList
+import logging
+
+from src.domain.todo_list.entity.todo_list_status import TodoListStatuses
+from src.domain.todo_list.errors.todo_list_errors import InvalidTodoListError
+from src.domain.user.errors.user_errors import UserNotFoundError
+from src.infrastructure.repository.base.async_unit_of_work import AsyncUnitOfWork
+
+
+class AsyncTodoListApiService(AsyncBaseService):
+    """
+    Async variant of TodoListApiService, its commit hooks run for writes on the loop of EventLoopManager.
+    """
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, uow: Optional[AsyncUnitOfWork] = None) -> None:
+        super().__init__(uow)
+
+    async def get_todo_lists_page(self, page_request_dto: PageRequestDto) -> Tuple[List[TodoList], Optional[str]]:
+        """
+        Return a page of objects belongs to user, ordered by creation.
+
+        :param page_request_dto: Request model of page
+        :return: Objects of page and cursor of the next page
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        return await self.uow.todo_lists.user_list_todo_lists_page(
+            user_id=user.id,
+            page_size=self._get_page_size(page_request_dto.page_size),
+            cursor=page_request_dto.cursor)
+
+    async def create_todo_list(self, todo_list_request_dto: CreateTodoListRequestDto) -> TodoList:
+        """
+        Create a new object for user.
+
+        :param todo_list_request_dto: Request model to create new object
+
+        :return: Created object instance
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        todo_list = TodoList.create(
+            todo_list_request_dto.name,
+            user.id
+        )
+
+        async with self.uow:
+            self.uow.todo_lists.insert(todo_list)
+
+        return todo_list
+
+    async def get_todo_list_with_todos(self, todo_list_id: str) -> TodoList:
+        """
+        Get the existing object
+
+        :param todo_list_id: ID of object
+        :return: Returns object instance
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        todo_list = await self.uow.todo_lists.user_get_todo_list_with_todo(user_id=user.id,
+                                                                           todo_list_id=todo_list_id)
+        if not todo_list:
+            raise InvalidTodoListError(todo_list_id=todo_list_id)
+
+        return todo_list
+
+    async def update_todo_list(self, todo_list_id: str, todo_list_request_dto: UpdateTodoListRequestDto) -> TodoList:
+        """
+        Update an existing object
+
+        :param todo_list_id: ID of object
+        :param todo_list_request_dto: Request model to update object
+        :return: Updated object instance
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        todo_list = await self.uow.todo_lists.user_get_todo_list(user_id=user.id, todo_list_id=todo_list_id)
+        if not todo_list:
+            raise InvalidTodoListError(todo_list_id=todo_list_id)
+
+        todo_list.name = todo_list_request_dto.name
+        todo_list.status_id = todo_list_request_dto.status_id
+
+        async with self.uow:
+            await self.uow.todo_lists.update(todo_list)
+        return todo_list
+
+    async def delete_todo_list(self, todo_list_id: str) -> None:
+        """
+        Soft delete an existing object
+
+        :param todo_list_id: ID of object
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        async with self.uow:
+            is_updated = await self.uow.todo_lists.user_update_status(
+                user_id=user.id, todo_list_id=todo_list_id, status=TodoListStatuses.deleted)
+            if not is_updated:
+                raise InvalidTodoListError(todo_list_id=todo_list_id)
+
+    @classmethod
+    async def on_todo_list_committed(cls, todo_list: TodoList) -> None:
+        """
+        Async variant of TodoListApiService.on_todo_list_committed, the loop is not blocked by Redis
+
+        :param todo_list: TodoList instance that committed
+        """
+        try:
+            service = cls()
+            await service.invalidate_redis_entry(todo_list.user_id)
+        except:
+            cls.logger.error(f'TodoList for {todo_list.id} is not updated at Redis', exc_info=True)
+
+    @classmethod
+    async def on_todo_committed(cls, user_id: str) -> None:
+        """
+        Async variant of TodoListApiService.on_todo_committed, the loop is not blocked by Redis
+
+        :param user_id: user id that committed for
+        """
+        try:
+            service = cls()
+            await service.invalidate_redis_entry(user_id)
+        except:
+            cls.logger.error(f'TodoList for {user_id} is not updated at Redis', exc_info=True)
+
+    async def invalidate_redis_entry(self, user_id: str) -> None:
+        await self.uow.todo_lists.invalidate_redis_entry(user_id)
@@ -1,6 +1,8 @@
 from typing import Optional
 
+from src.config import app_config_manager
 from src.infrastructure.manager.uow_manager import UOWManager
+from src.infrastructure.repository.base.async_unit_of_work import AsyncUnitOfWork
 from src.infrastructure.repository.base.unit_of_work import UnitOfWork
 
 
@@ -11,4 +13,24 @@ class BaseService:
 
     @property
     def uow(self) -> UnitOfWork:
-        return UOWManager().get_uow()
+        return self._uow or UOWManager().get_uow()
+
+    @staticmethod
+    def _get_page_size(page_size: Optional[int]) -> int:
+        config = app_config_manager.get_config()
+        return min(page_size or config.API_DEFAULT_PAGE_SIZE, config.API_MAX_PAGE_SIZE)
+
+
+class AsyncBaseService:
+    """
+    Base of the async services, their coroutines run on the loop of EventLoopManager.
+    """
+
+    def __init__(self, uow: Optional[AsyncUnitOfWork] = None) -> None:
+        self._uow: Optional[AsyncUnitOfWork] = uow
+
+    @property
+    def uow(self) -> AsyncUnitOfWork:
+        return self._uow or UOWManager.get_async_uow()
+
+    _get_page_size = staticmethod(BaseService._get_page_size)
@@ -1,8 +1,10 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, Iterator
 from flask import g
 from src.api.models.dto.todo.create_todo_request_dto import CreateTodoRequestDto
 from src.api.models.dto.todo.update_todo_request_dto import UpdateTodoRequestDto
+from src.api.models.dto.page_request_dto import PageRequestDto
 from src.api.services.base.base_service import BaseService
+from src.config import app_config_manager
 
 from src.domain.todo.entity.todo import Todo
 from src.domain.todo.entity.todo_status import TodoStatuses
@@ -48,6 +50,34 @@ class TodoApiService(BaseService):
 
         return self.uow.todos.user_list_todos(user_id=user.id)
 
+    def stream_todos(self) -> Iterator[Todo]:
+        """
+        Iterate all objects belongs to user, ordered by creation.
+
+        :return: Objects of user, read in batches while iterated
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        batch_size = app_config_manager.get_config().API_STREAM_BATCH_SIZE
+        return self.uow.todos.user_iter_todos(user_id=user.id, batch_size=batch_size)
+
+    def get_todos_page(self, page_request_dto: PageRequestDto) -> Tuple[List[Todo], Optional[str]]:
+        """
+        Return a page of objects belongs to user, ordered by creation.
+
+        :param page_request_dto: Request model of page
+        :return: Objects of page and cursor of the next page
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        return self.uow.todos.user_list_todos_page(user_id=user.id,
+                                                   page_size=self._get_page_size(page_request_dto.page_size),
+                                                   cursor=page_request_dto.cursor)
+
     def create_todo(self, todo_request_dto: CreateTodoRequestDto) -> Todo:
         """
         Create a new object for user.
@@ -132,3 +162,5 @@ class TodoApiService(BaseService):
 
     def update_redis_entry(self, todo: Todo) -> None:
         self.uow.todos.update_todo_redis_entry(todo)
+        if app_config_manager.get_config().REDIS_TODO_EXPIRY_INDEX:
+            self.uow.todos.update_todo_expiry_index(todo)
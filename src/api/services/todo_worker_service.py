@@ -1,12 +1,17 @@
-from typing import Optional, List, Tuple
+import logging
+from typing import Optional, List, Tuple, Iterator
+
+from redis import RedisError
 
 from src.api.services.base.base_service import BaseService
+from src.config import app_config_manager
 from src.domain.todo.entity.todo import Todo
 from src.domain.user.entity.user import User
 from src.infrastructure.repository.base.unit_of_work import UnitOfWork
 
 
 class TodoWorkerService(BaseService):
+    logger = logging.getLogger(__name__)
 
     def __init__(self, uow: Optional[UnitOfWork] = None) -> None:
         super().__init__(uow)
@@ -17,6 +22,67 @@ class TodoWorkerService(BaseService):
 
         :return: Objects and owner users list
         """
-        with self.uow:
-            todo_user_list = self.uow.todos.worker_update_expired_todos()
-        return todo_user_list
+        return list(self.iter_expired_todos())
+
+    def iter_expired_todos(self) -> Iterator[Tuple[Todo, User]]:
+        """
+        Update expired objects in chunks,
+        each chunk is committed in its own transaction before its objects are yielded.
+        Remaining objects over the maximum chunk count are left to the next run.
+
+        Candidates are read from the Redis expiry index if enabled, so a run without due objects
+        does not query the table. The table is scanned if the index is not available.
+
+        :return: Objects and owner users, a chunk is held in memory at once
+        """
+        config = app_config_manager.get_config()
+        chunk_size = config.DB_EXPIRE_CHUNK_SIZE
+        use_index = config.REDIS_TODO_EXPIRY_INDEX and self._ensure_expiry_index()
+
+        for _ in range(config.DB_EXPIRE_MAX_CHUNKS):
+            todo_ids: Optional[List[str]] = None
+            if use_index:
+                try:
+                    todo_ids = self.uow.todos.list_due_todo_ids(limit=chunk_size)
+                except RedisError:
+                    self.logger.warning('Todo expiry index is not available, scanning todos.', exc_info=True)
+                    use_index = False
+                else:
+                    if not todo_ids:
+                        break
+
+            with self.uow:
+                chunk = self.uow.todos.worker_update_expired_todos(limit=chunk_size, todo_ids=todo_ids)
+
+            if todo_ids is not None:
+                self._sync_expiry_index(todo_ids, [todo.id for todo, _ in chunk])
+            yield from chunk
+
+            if todo_ids is None:
+                if len(chunk) < chunk_size:
+                    break
+            # Candidates locked by other workers stay in the index for the next run
+            elif len(todo_ids) < chunk_size or not chunk:
+                break
+
+    def _ensure_expiry_index(self) -> bool:
+        try:
+            batch_size = app_config_manager.get_config().DB_BULK_BATCH_SIZE
+            return self.uow.todos.ensure_todo_expiry_index(batch_size=batch_size)
+        except RedisError:
+            self.logger.warning('Todo expiry index is not available, scanning todos.', exc_info=True)
+            return False
+
+    def _sync_expiry_index(self, todo_ids: List[str], expired_ids: List[str]) -> None:
+        """
+        Remove expired candidates from the expiry index, and re-index the others from DB.
+        Candidates may be stale, if their todos are updated by writes that are not indexed.
+        """
+        try:
+            self.uow.todos.remove_from_todo_expiry_index(*expired_ids)
+            if remaining_ids := set(todo_ids).difference(expired_ids):
+                todos = self.uow.todos.get_many(*remaining_ids) or []
+                self.uow.todos.update_todo_expiry_index(*todos)
+                self.uow.todos.remove_from_todo_expiry_index(*remaining_ids.difference(t.id for t in todos))
+        except RedisError:
+            self.logger.warning('Todo expiry index is not updated.', exc_info=True)
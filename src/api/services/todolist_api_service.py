@@ -1,10 +1,12 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, Iterator
 from flask import g
 
+from src.api.models.dto.page_request_dto import PageRequestDto
 from src.api.models.dto.todo_list.create_todo_list_request_dto import CreateTodoListRequestDto
 from src.api.models.dto.todo_list.todo_list_with_todos_response_dto import TodoListWithTodosResponseDto
 from src.api.models.dto.todo_list.update_todo_list_request_dto import UpdateTodoListRequestDto
 from src.api.services.base.base_service import BaseService
+from src.config import app_config_manager
 
 from src.domain.todo_list.entity.todo_list import TodoList
 import logging
@@ -32,6 +34,34 @@ class TodoListApiService(BaseService):
 
         return self.uow.todo_lists.user_list_todo_lists(user_id=user.id)
 
+    def stream_todo_lists(self) -> Iterator[TodoList]:
+        """
+        Iterate all objects belongs to user, ordered by creation.
+
+        :return: Objects of user, read in batches while iterated
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        batch_size = app_config_manager.get_config().API_STREAM_BATCH_SIZE
+        return self.uow.todo_lists.user_iter_todo_lists(user_id=user.id, batch_size=batch_size)
+
+    def get_todo_lists_page(self, page_request_dto: PageRequestDto) -> Tuple[List[TodoList], Optional[str]]:
+        """
+        Return a page of objects belongs to user, ordered by creation.
+
+        :param page_request_dto: Request model of page
+        :return: Objects of page and cursor of the next page
+        """
+        user = g.get('user')
+        if not user:
+            raise UserNotFoundError
+
+        return self.uow.todo_lists.user_list_todo_lists_page(user_id=user.id,
+                                                             page_size=self._get_page_size(page_request_dto.page_size),
+                                                             cursor=page_request_dto.cursor)
+
     def create_todo_list(self, todo_list_request_dto: CreateTodoListRequestDto) -> TodoList:
         """
         Create a new object for user.
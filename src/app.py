@@ -21,6 +21,9 @@ def create_app() -> Flask:
     from src.infrastructure.manager.db_manager import DBManager
     DBManager.init_db(app)
 
+    from src.infrastructure.manager.uow_manager import UOWManager
+    UOWManager.init_manager(app)
+
     from src.infrastructure.manager.db_migration_manager import DBMigrationManager
     DBMigrationManager.init_migration(app)
 
@@ -27,4 +27,5 @@ class BaseConfig(BaseSettings):
 
     REDIS_TODOS_PREFIX: str = Field('todo')
     REDIS_TODO_LISTS_PREFIX: str = Field('todo_lists')
+    REDIS_USERS_PREFIX: str = Field('user')
 
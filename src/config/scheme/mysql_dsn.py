@@ -5,6 +5,7 @@ class MysqlDsn(MultiHostDsn):
     allowed_schemes = {
         'mysql',
         'mysql+mysqldb',
+        'mysql+pymysql',
     }
     user_required = True
 
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Literal
 
-from pydantic import BaseSettings, Extra, PositiveInt, AmqpDsn
+from pydantic import BaseSettings, Extra, Field, PositiveInt, AmqpDsn
 
 
 from src.config.base.base_config import BaseConfig
@@ -22,11 +22,18 @@ class GlobalConfig(BaseConfig):
     AUTH0_M2M_CLIENT_SECRET: str
 
     BEAT_CHECK_EXPIRED_TODOS_INTERVAL: int = PositiveInt(1)
+    BEAT_CHECK_EXPIRED_TODOS_SECONDS: Optional[PositiveInt]  # overrides the interval in minutes
     EXPIRE_TIME_OF_TASKS: int = PositiveInt(60)
 
     TODO_API_URL: str
+    TODO_API_HTTP_POOL_SIZE: int = PositiveInt(4)  # keep-alive connections per host and worker process
+    TODO_API_HTTP_RETRIES: int = Field(3, ge=0)  # retries of failed connections and idempotent requests
+    TODO_API_HTTP_BACKOFF: float = Field(0.5, ge=0)  # seconds, backoff factor of retries with jitter
+    STATUS_WORKER_MODE: Literal['api', 'db'] = Field('api')  # db runs the sweep in process, requires the app db config
 
     MAIL_SENDER_API_KEY: Optional[str]
+    MAIL_DIGEST_MAX_TODOS: int = PositiveInt(100)  # todos per digest message, larger digests are split
+    MAIL_DIGEST_MAX_BUFFERED_TODOS: int = PositiveInt(10000)  # todos held for digests before they are sent early
 
     class Config(BaseSettings.Config):
         extra: Extra = Extra.ignore
@@ -1,19 +1,114 @@
+import json
 from datetime import datetime
-from typing import Optional, TypeVar
+from typing import Optional, TypeVar, Set, Any, Dict, List, Mapping, Tuple, Type
 
-from pydantic import BaseModel, Field, BaseConfig
+from pydantic import BaseModel, Field, BaseConfig, PrivateAttr
+from pydantic.fields import SHAPE_LIST
 
 from src.domain.common.factory.datetime import datetime_factory
 from src.domain.common.factory.uuid import id_factory
 
+TModel = TypeVar('TModel', bound='BaseEntityModel')
+
+# Fields of models for the trusted constructors: name, nested model type, list of models, datetime, required
+_trusted_fields: Dict[type, List[Tuple[str, Any, bool, bool, bool]]] = {}
+_missing = object()
+
 
 class BaseEntityModel(BaseModel):
     id: str = Field(default_factory=id_factory)
     created_date: datetime = Field(default_factory=datetime_factory)
     modified_date: Optional[datetime] = None
 
+    # Fields changed after construction, repositories update only these columns
+    _changed_fields: Set[str] = PrivateAttr(default_factory=set)
+
     class Config(BaseConfig):
         orm_mode = True
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        changed = name in self.__fields__ and self.__dict__.get(name, _missing) != value
+        super().__setattr__(name, value)
+        if changed:
+            self._changed_fields.add(name)
+
+    def copy(self: TModel, **kwargs: Any) -> TModel:
+        m = super().copy(**kwargs)
+        # Private attributes are shallow copied, copies must not share the changed fields
+        object.__setattr__(m, '_changed_fields', set(self._changed_fields))
+        return m
+
+    @property
+    def changed_fields(self) -> Set[str]:
+        return set(self._changed_fields)
+
+    def mark_clean(self) -> None:
+        self._changed_fields.clear()
+
+    @classmethod
+    def from_orm_trusted(cls: Type[TModel], obj: Any) -> TModel:
+        """
+        Create model from attributes of an ORM instance or a row without validation, like construct.
+        Use it only for data which is validated before it is written, like rows of the repositories.
+        Objects without a required field are validated by from_orm.
+
+        :param obj: ORM instance or row with the fields of model as attributes
+        :return: Model instance
+        """
+        values: Dict[str, Any] = {}
+        for name, model_type, is_list, _, is_required in cls._get_trusted_fields():
+            value: Any = getattr(obj, name, _missing)
+            if value is _missing:
+                if is_required:
+                    return cls.from_orm(obj)
+                # Default of field, like relationships which are not loaded in rows
+                continue
+            if model_type and value is not None:
+                value = [model_type.from_orm_trusted(v) for v in value] if is_list \
+                    else model_type.from_orm_trusted(value)
+            values[name] = value
+        return cls.construct(**values)
+
+    @classmethod
+    def parse_obj_trusted(cls: Type[TModel], obj: Mapping[str, Any]) -> TModel:
+        """
+        Create model from a dict or a JSON document written by json() without validation, like construct.
+        Use it only for data which is validated before it is written, like cache entries of the repositories.
+        Documents without a required field, like entries of an older schema, are validated by parse_obj.
+
+        :param obj: Field values, datetimes may be ISO 8601 strings
+        :return: Model instance
+        """
+        values: Dict[str, Any] = {}
+        for name, model_type, is_list, is_datetime, is_required in cls._get_trusted_fields():
+            if name not in obj:
+                if is_required:
+                    return cls.parse_obj(obj)
+                continue
+            value = obj[name]
+            if is_datetime and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            elif model_type and value is not None:
+                value = [model_type.parse_obj_trusted(v) for v in value] if is_list \
+                    else model_type.parse_obj_trusted(value)
+            values[name] = value
+        return cls.construct(**values)
+
+    @classmethod
+    def parse_raw_trusted(cls: Type[TModel], b: str) -> TModel:
+        return cls.parse_obj_trusted(json.loads(b))
+
+    @classmethod
+    def _get_trusted_fields(cls) -> List[Tuple[str, Any, bool, bool, bool]]:
+        if (fields := _trusted_fields.get(cls)) is None:
+            fields = []
+            for name, field in cls.__fields__.items():
+                is_type = isinstance(field.type_, type)
+                model_type = field.type_ if is_type and issubclass(field.type_, BaseEntityModel) else None
+                is_datetime = is_type and issubclass(field.type_, datetime)
+                fields.append((name, model_type, field.shape == SHAPE_LIST, is_datetime, field.required is True))
+            _trusted_fields[cls] = fields
+        return fields
+
 
 EType = TypeVar('EType', bound=BaseEntityModel)
@@ -0,0 +1,12 @@
+import logging
+from typing import Any
+
+from src.domain.base.error.base_error import BaseError
+
+
+class InvalidCursorError(BaseError):
+    code = 'invalid_cursor'
+
+    def __init__(self, **context_data: Any) -> None:
+        message = 'Invalid cursor.'
+        super().__init__(message, self.code, log_level=logging.WARNING, **context_data)
@@ -0,0 +1,14 @@
+import logging
+from http import HTTPStatus
+from typing import Any
+
+from src.domain.base.error.base_error import BaseError
+
+
+class RequestTimeoutError(BaseError):
+    code = 'request_timeout'
+
+    def __init__(self, **context_data: Any) -> None:
+        message = 'Request timed out. Please try later.'
+        super().__init__(message, self.code, status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                         log_level=logging.ERROR, **context_data)
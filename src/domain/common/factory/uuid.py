@@ -1,5 +1,18 @@
+import os
+import time
 import uuid
 
 
 def id_factory() -> str:
-    return str(uuid.uuid4())
+    """
+    :return: Time ordered UUID (version 7), a millisecond timestamp followed by random bits.
+        Ids of new rows are appended to the end of primary key indexes instead of random pages.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    random_bits = int.from_bytes(os.urandom(10), 'big')
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 \
+        | 0x7 << 76 \
+        | (random_bits >> 62 & 0xFFF) << 64 \
+        | 0b10 << 62 \
+        | random_bits & (1 << 62) - 1
+    return str(uuid.UUID(int=value))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 from pydantic import Field
@@ -21,6 +21,23 @@ class Todo(BaseEntityModel):
     def status(self) -> TodoStatus:
         return TodoStatuses.get_status(self.status_id)
 
+    def is_past_valid_until(self, now: Optional[datetime] = None) -> bool:
+        """
+        :param now: Naive UTC time to compare, current time if not given
+        """
+        valid_until = self.valid_until
+        if valid_until.tzinfo:
+            valid_until = valid_until.astimezone(timezone.utc).replace(tzinfo=None)
+        return valid_until < (now or datetime.utcnow())
+
+    @property
+    def is_expired(self) -> bool:
+        """
+        Expired, or open and past its valid until date before the expiry sweep persists the expired status
+        """
+        return self.status_id == TodoStatuses.expired.id or \
+            (self.status_id == TodoStatuses.open.id and self.is_past_valid_until())
+
     @classmethod
     def create(
             cls,
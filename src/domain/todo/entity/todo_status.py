@@ -1,13 +1,13 @@
 from typing import Dict, List
 
-from src.domain.base.model.base_enum_model import BaseEnumModel
+from src.domain.base.model.base_enum_model import BaseEnumModel, BaseDeletableStatuses
 
 
 class TodoStatus(BaseEnumModel):
     name: str
 
 
-class TodoStatuses:
+class TodoStatuses(BaseDeletableStatuses[TodoStatus]):
     open = TodoStatus.construct(id=1, name='Open')
     closed = TodoStatus.construct(id=2, name='Closed')
     expired = TodoStatus.construct(id=3, name='Expired')
@@ -1,13 +1,13 @@
 from typing import Dict, List
 
-from src.domain.base.model.base_enum_model import BaseEnumModel
+from src.domain.base.model.base_enum_model import BaseEnumModel, BaseDeletableStatuses
 
 
 class TodoListStatus(BaseEnumModel):
     name: str
 
 
-class TodoListStatuses:
+class TodoListStatuses(BaseDeletableStatuses[TodoListStatus]):
     open = TodoListStatus.construct(id=1, name='Open')
     closed = TodoListStatus.construct(id=2, name='Closed')
     deleted = TodoListStatus.construct(id=3, name='Deleted')
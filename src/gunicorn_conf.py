@@ -10,6 +10,9 @@ if _web_concurrency == 0:
 workers = _web_concurrency
 threads = os.getenv('WEB_THREAD', 2)
 worker_class = os.getenv('WORKER_CLASS', 'gthread')
+# Concurrent requests per worker of cooperative worker classes (gevent),
+# use a cooperative MySQL driver with them, e.g. MYSQL_URL=mysql+pymysql://...
+worker_connections = int(os.getenv('WORKER_CONNECTIONS', 1000))
 
 timeout = os.getenv('WORKER_TIMEOUT', 28)
 graceful_timeout = os.getenv('WORKER_GRACEFUL_TIMEOUT', 29)
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar, Optional, Tuple, Dict
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class TTLLRUCache(Generic[K, V]):
+    """
+    Thread-safe in-process LRU cache with a size cap and per entry expiry
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        :param maxsize: Maximum number of entries, 0 for disable
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: 'OrderedDict[K, Tuple[V, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = item
+            if expires_at <= now:
+                del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        """
+        :param key: Cache key
+        :param value: Value to cache
+        :param expires_at: Unix timestamp the entry expires at
+        """
+        if self.maxsize < 1 or expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._items),
+            'maxsize': self.maxsize
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
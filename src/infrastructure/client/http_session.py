@@ -0,0 +1,119 @@
+import random
+import time
+from typing import Any, Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.util.retry import Retry
+
+from src.profiling.request_timer_manager import session_request_timer
+
+ConnectHook = Callable[[str, float], None]
+
+
+class JitterRetry(Retry):
+    """
+    Retry with full jitter, the backoff is a random time up to the exponential backoff.
+    Clients retrying at the same time do not retry at the same time again.
+    """
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+class _TimedConnectionMixin:
+    connect_hook: Optional[ConnectHook] = None
+
+    def connect(self) -> None:
+        host: str = self.host  # type: ignore
+        request_timer_context = None
+        if request_timer := session_request_timer():
+            request_timer_context = request_timer('http_connect', host=host)
+            request_timer_context.open()
+
+        start_time = time.perf_counter()
+        try:
+            super().connect()  # type: ignore
+        finally:
+            if request_timer_context:
+                request_timer_context.close()
+            if self.connect_hook:
+                self.connect_hook(host, time.perf_counter() - start_time)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+    connect_hook: Optional[ConnectHook] = None
+
+    def _new_conn(self) -> Any:
+        conn: Any = super()._new_conn()
+        conn.connect_hook = self.connect_hook
+        return conn
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+    connect_hook: Optional[ConnectHook] = None
+
+    def _new_conn(self) -> Any:
+        conn: Any = super()._new_conn()
+        conn.connect_hook = self.connect_hook
+        return conn
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that measures the setup time of new connections, including TLS handshakes.
+
+    Setups are reported to the request timer as 'http_connect', and to the connect hook with the host.
+    """
+
+    def __init__(self, *args: Any, connect_hook: Optional[ConnectHook] = None, **kwargs: Any) -> None:
+        self.connect_hook = connect_hook
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        attributes = {'connect_hook': staticmethod(self.connect_hook) if self.connect_hook else None}
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('TimedHTTPConnectionPool', (_TimedHTTPConnectionPool,), attributes),
+            'https': type('TimedHTTPSConnectionPool', (_TimedHTTPSConnectionPool,), attributes),
+        }
+
+    def __setstate__(self, state: Any) -> None:
+        # Pickled adapters do not keep the hook
+        self.connect_hook = None
+        super().__setstate__(state)
+
+
+def create_http_session(pool_connections: int = 10,
+                        pool_maxsize: int = 10,
+                        retries: Optional[Retry] = None,
+                        connect_hook: Optional[ConnectHook] = None) -> requests.Session:
+    """
+    Create a keep-alive session with pooled connections.
+
+    :param pool_connections: Number of hosts to keep connection pools for
+    :param pool_maxsize: Maximum number of connections to keep per host
+    :param retries: Retry policy of requests, no retries if not given
+    :param connect_hook: Called with the host and seconds spent to set up each new connection
+    :return: Session instance, share it in the process instead of creating one per request
+    """
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(pool_connections=pool_connections,
+                               pool_maxsize=pool_maxsize,
+                               max_retries=retries or 0,
+                               connect_hook=connect_hook)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -1,16 +1,23 @@
+import json
+import logging
+import os
 from datetime import datetime
-from typing import Optional, Any, TypeVar, Type, List, Tuple, Final
+from typing import Optional, Any, TypeVar, Type, List, Tuple, Final, Iterator
 from urllib.parse import urljoin
 
-import requests
 from dateutil.relativedelta import relativedelta
-from requests import PreparedRequest, Response
+from pydantic import parse_obj_as
+from redis import Redis, RedisError
+from redis.exceptions import LockError
+from requests import PreparedRequest, Response, Session
 from requests.auth import AuthBase
 
 from src.api.models.base_response import BaseResponse
 from src.config import worker_config_manager
 from src.domain.todo.entity.todo import Todo
 from src.domain.user.entity.user import User
+from src.infrastructure.client.http_session import create_http_session, JitterRetry
+from src.infrastructure.manager.redis_manager import RedisManager
 
 Model = TypeVar('Model')
 
@@ -30,23 +37,97 @@ class TodoApiAuthBase(AuthBase):
 
 
 class TodoApiClient:
+    logger = logging.getLogger(__name__)
+
     __auth: Optional[TodoApiAuthBase] = None
     __default_timeout: Final = 4.0
 
+    # Connections are kept alive per process, pooled connections must not be shared with forked processes
+    __http_session: Optional[Session] = None
+    __http_session_pid: Optional[int] = None
+    # Read errors and error statuses are retried only for these methods, the worker updates are not idempotent
+    __retry_allowed_methods: Final = frozenset({'GET', 'HEAD', 'OPTIONS'})
+    __retry_status_forcelist: Final = (502, 503, 504)
+
+    # M2M token is shared by worker processes and nodes through Redis
+    __token_key: Final = 'todo_api_client:m2m_token'
+    __token_lock_key: Final = 'lock_todo_api_client:m2m_token'
+    __token_lock_ttl: Final = 10  # seconds, must be longer than a token request
+    __token_refresh_margin: Final = 5 * 60  # seconds before expiry the token is refreshed
+
     __update_expired_todos_url: Final = 'api/v1/worker/expired'
+    __ndjson_mimetype: Final = 'application/x-ndjson'
 
     @staticmethod
     def __get_endpoint(service_url: str) -> str:
         base_url = worker_config_manager.get_config().TODO_API_URL
         return urljoin(base_url, service_url)
 
+    def __get_http_session(self) -> Session:
+        if self.__http_session is None or self.__http_session_pid != os.getpid():
+            config = worker_config_manager.get_config()
+            retries = JitterRetry(total=config.TODO_API_HTTP_RETRIES,
+                                  backoff_factor=config.TODO_API_HTTP_BACKOFF,
+                                  allowed_methods=self.__retry_allowed_methods,
+                                  status_forcelist=self.__retry_status_forcelist,
+                                  raise_on_status=False)
+            # Pools of the Auth0 and the Todo API hosts
+            self.__http_session = create_http_session(pool_connections=2,
+                                                      pool_maxsize=config.TODO_API_HTTP_POOL_SIZE,
+                                                      retries=retries,
+                                                      connect_hook=self.__on_connect)
+            self.__http_session_pid = os.getpid()
+        return self.__http_session
+
+    def __on_connect(self, host: str, seconds: float) -> None:
+        self.logger.debug(f'Connected to {host} in {seconds * 1000:.1f} ms.')
+
     def __get_auth(self) -> TodoApiAuthBase:
         if not self.__auth or self.__auth.is_expired:
-            token, expires_in = self.__get_token()
-            self.__auth = TodoApiAuthBase(token=token, expires_in=expires_in)
+            try:
+                self.__auth = self.__get_shared_auth(RedisManager.get_redis())
+            except RedisError:
+                self.logger.warning('Shared M2M token could not be used, requesting a new one.', exc_info=True)
+                token, expires_in = self.__get_token()
+                self.__auth = TodoApiAuthBase(token=token, expires_in=expires_in - self.__token_refresh_margin)
 
         return self.__auth
 
+    def __get_shared_auth(self, redis: Redis) -> TodoApiAuthBase:  # type: ignore
+        if auth := self.__load_shared_auth(redis):
+            return auth
+
+        lock = redis.lock(self.__token_lock_key, timeout=self.__token_lock_ttl, blocking_timeout=self.__token_lock_ttl)
+        locked = lock.acquire()
+        try:
+            # Another process may refresh the token while waiting for the lock
+            if locked and (auth := self.__load_shared_auth(redis)):
+                return auth
+
+            token, expires_in = self.__get_token()
+            expired_at = datetime.utcnow() + relativedelta(seconds=expires_in)
+            redis.set(self.__token_key,
+                      json.dumps({'access_token': token, 'expired_at': expired_at.isoformat()}),
+                      ex=max(expires_in - self.__token_refresh_margin, 1))
+            return TodoApiAuthBase(token=token, expires_in=expires_in - self.__token_refresh_margin)
+        finally:
+            if locked:
+                try:
+                    lock.release()
+                except LockError:
+                    self.logger.warning('M2M token lock is expired.')
+
+    def __load_shared_auth(self, redis: Redis) -> Optional[TodoApiAuthBase]:  # type: ignore
+        if not (data := redis.get(self.__token_key)):
+            return None
+
+        shared_token = json.loads(data)
+        expires_in = (datetime.fromisoformat(shared_token['expired_at']) - datetime.utcnow()).total_seconds()
+        if expires_in <= self.__token_refresh_margin:
+            return None
+        return TodoApiAuthBase(token=shared_token['access_token'],
+                               expires_in=int(expires_in) - self.__token_refresh_margin)
+
     def __get_token(self) -> Tuple[str, int]:
         config = worker_config_manager.get_config()
         token_request = {
@@ -56,7 +137,7 @@ class TodoApiClient:
             'grant_type': 'client_credentials'
         }
 
-        response = requests.post(
+        response = self.__get_http_session().post(
             f'https://{worker_config_manager.get_config().AUTH0_DOMAIN}/oauth/token',
             json=token_request,
             timeout=self.__default_timeout)
@@ -66,6 +147,15 @@ class TodoApiClient:
         return data['access_token'], data['expires_in']
 
     def __clear_auth(self) -> None:
+        if self.__auth:
+            try:
+                # Remove the shared token only if it is not refreshed by another process
+                redis = RedisManager.get_redis()
+                if (data := redis.get(self.__token_key)) and \
+                        json.loads(data)['access_token'] == self.__auth.token:
+                    redis.delete(self.__token_key)
+            except RedisError:
+                self.logger.warning('Shared M2M token could not be cleared.', exc_info=True)
         self.__auth = None
 
     def __check_response(self, response: Response) -> None:
@@ -84,21 +174,49 @@ class TodoApiClient:
             raise Exception(f'Todo API error, message: {base_response.message}')
         return base_response.data
 
-    def __check_unauthorized(self, response: Response) -> Response:
+    def __check_unauthorized(self, response: Response, stream: bool = False) -> Response:
         if response.status_code == 401:
             # Renew auth
             self.__clear_auth()
             request = response.request.copy()
             request.prepare_auth(self.__get_auth())
-            with requests.session() as s:
-                response = s.send(request)
+            response.close()
+            response = self.__get_http_session().send(request, timeout=self.__default_timeout, stream=stream)
         return response
 
-    def update_expired_todos(self) -> Optional[List[Tuple[Todo, User]]]:
-        endpoint = self.__get_endpoint(self.__update_expired_todos_url)
-        response = requests.put(endpoint,
-                                auth=self.__get_auth(),
-                                timeout=self.__default_timeout)
+    @staticmethod
+    def __iter_ndjson_data(response: Response, model: Type[Model]) -> Iterator[Model]:
+        base_response: Optional[BaseResponse[Any]] = None
+        for line in response.iter_lines():
+            if not line:
+                continue
+            item = json.loads(line)
+            # The response envelope follows the items
+            if isinstance(item, dict):
+                base_response = BaseResponse[Any].parse_obj(item)
+                break
+            yield parse_obj_as(model, item)
+
+        if not base_response:
+            raise Exception('Todo API error, message: Response is interrupted.')
+        if not base_response.success:
+            raise Exception(f'Todo API error, message: {base_response.message}')
 
-        data = self.__check_response_and_get_data(response, List[Tuple[Todo, User]])
-        return data
+    def iter_expired_todos(self) -> Iterator[Tuple[Todo, User]]:
+        """
+        Update expired todos, reading todo and user pairs of the NDJSON response as they arrive.
+        The JSON response of an API without streaming is read as a whole.
+        """
+        endpoint = self.__get_endpoint(self.__update_expired_todos_url)
+        response = self.__get_http_session().put(endpoint,
+                                                 auth=self.__get_auth(),
+                                                 headers={'Accept': f'{self.__ndjson_mimetype}, application/json;q=0.9'},
+                                                 timeout=self.__default_timeout,
+                                                 stream=True)
+        response = self.__check_unauthorized(response, stream=True)
+        with response:
+            response.raise_for_status()
+            if response.headers.get('Content-Type', '').split(';')[0] != self.__ndjson_mimetype:
+                yield from self.__check_response_and_get_data(response, List[Tuple[Todo, User]]) or []
+                return
+            yield from self.__iter_ndjson_data(response, Tuple[Todo, User])  # type: ignore
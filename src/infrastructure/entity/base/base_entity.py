@@ -1,10 +1,11 @@
 from typing import Type, TypeVar
 
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, DateTime
 from sqlalchemy.orm import declared_attr
 
 from src.domain.base.model.base_entity_model import EType
 from src.infrastructure.entity.base import mapper_registry
+from src.infrastructure.entity.base.compact_uuid import CompactUUID
 
 TEntity = TypeVar('TEntity', bound='BaseEntity')
 
@@ -17,7 +18,7 @@ class BaseEntity:
     def __tablename__(cls) -> str:
         return cls.table_name()
 
-    id = Column(String(36), primary_key=True, nullable=False)
+    id = Column(CompactUUID, primary_key=True, nullable=False)
     created_date = Column(DateTime, nullable=False)
     modified_date = Column(DateTime, nullable=True)
 
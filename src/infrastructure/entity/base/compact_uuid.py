@@ -0,0 +1,36 @@
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy import String
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class CompactUUID(TypeDecorator):
+    """
+    UUID stored as BINARY(16) in MySQL and exposed as its 36 characters string,
+    other dialects store the string.
+
+    Values which are not UUIDs are bound as NULL, lookups of malformed ids find nothing.
+    """
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine:
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(mysql.BINARY(16))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value: Optional[Any], dialect: Dialect) -> Optional[Any]:
+        if value is None or dialect.name != 'mysql':
+            return value
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            return None
+
+    def process_result_value(self, value: Optional[Any], dialect: Dialect) -> Optional[str]:
+        if value is None or dialect.name != 'mysql':
+            return value
+        return str(uuid.UUID(bytes=bytes(value)))
@@ -3,11 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Type
 
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index
 
 from src.domain.base.model.base_entity_model import EType
 from src.domain.todo.entity.todo import Todo as DomainTodo
 from src.infrastructure.entity.base.base_entity import BaseEntity
+from src.infrastructure.entity.base.compact_uuid import CompactUUID
 from src.infrastructure.entity.todo.todo_status import TodoStatus
 from src.infrastructure.entity.todo_list.todo_list import TodoList
 from src.infrastructure.entity.user.user import User
@@ -15,11 +16,19 @@ from src.infrastructure.entity.user.user import User
 
 @dataclass(init=True)
 class Todo(BaseEntity):
+    __table_args__ = (
+        # Todos of user in listing order, InnoDB appends id so keyset pages are read without a filesort.
+        # Status IN predicates filter the rows of the range
+        Index('ix_todo_user_id_created_date', 'user_id', 'created_date'),
+        # Open todos past valid_until
+        Index('ix_todo_status_id_valid_until', 'status_id', 'valid_until'),
+    )
+
     title = Column(String(50), nullable=False)
     description = Column(String(255), nullable=True)
     valid_until = Column(DateTime, index=True, nullable=False)
-    user_id = Column(String(36), ForeignKey(User.id), nullable=False)
-    todo_list_id = Column(String(36), ForeignKey(TodoList.id), nullable=False)
+    user_id = Column(CompactUUID, ForeignKey(User.id), nullable=False)
+    todo_list_id = Column(CompactUUID, ForeignKey(TodoList.id), nullable=False)
     status_id = Column(Integer, ForeignKey(TodoStatus.id), nullable=False)
 
     @classmethod
@@ -1,43 +1,190 @@
+import os
 import threading
-from typing import Any, Tuple
+import time
+from typing import Any, Tuple, Dict, Optional
 
 from flask import Flask, g
-from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Connection, Engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker, scoped_session, Session, SessionTransaction
 
 from src.config import app_config_manager
+from src.infrastructure.repository.base.transaction_hooks import TransactionHooks
+from src.profiling.db_pool_metrics import InstrumentedQueuePool
 from src.profiling.db_query_counter_manager import session_db_query_counter
-from src.profiling.request_timer_manager import session_request_timer
+from src.profiling.request_timer_manager import RequestTimerManager, session_request_timer
+
+try:
+    # Greenlets of cooperative workers (gevent) share a thread, sessions are scoped per greenlet.
+    # The main greenlet of each thread is distinct, threaded workers keep a session per thread.
+    from greenlet import getcurrent as _get_scope_ident
+except ImportError:  # pragma: no cover
+    from threading import get_ident as _get_scope_ident
 
 
 class DBManager:
+    __engine: Optional[Engine] = None
+    __async_session_factory: Optional[sessionmaker] = None
+    __async_pid: Optional[int] = None
+    __async_lock = threading.Lock()
 
     @staticmethod
-    def _get_engine_url() -> str:
+    def _get_engine_url(mysql_url: Optional[str] = None) -> str:
         config = app_config_manager.get_config()
-        url = config.MYSQL_URL.rstrip('/')  # Remove trailing "/" char
+        url = (mysql_url or config.MYSQL_URL).rstrip('/')  # Remove trailing "/" char
         url = f'{url}/{config.MYSQL_DB_NAME}?charset={config.MYSQL_DB_CHARSET}'
         return url
 
     @staticmethod
-    def _create_session_factory(debug: bool = False) -> scoped_session:
-        url = DBManager._get_engine_url()
+    def _create_engine(url: str, debug: bool = False) -> Engine:
+        config = app_config_manager.get_config()
         engine = create_engine(
             url,
-            pool_timeout=5,
-            pool_pre_ping=True,
+            poolclass=InstrumentedQueuePool,
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_pre_ping=config.DB_POOL_PRE_PING,
             echo=debug
         )
+        if not config.DB_POOL_PRE_PING and config.DB_POOL_PING_IDLE_THRESHOLD > 0:
+            DBManager._listen_idle_ping(engine, config.DB_POOL_PING_IDLE_THRESHOLD)
+        return engine
+
+    @staticmethod
+    def _create_session_factory(debug: bool = False) -> scoped_session:
+        engine = DBManager._create_engine(DBManager._get_engine_url(), debug=debug)
+        DBManager.__engine = engine
 
         return scoped_session(
             session_factory=sessionmaker(bind=engine),
-            scopefunc=threading.get_ident
+            scopefunc=_get_scope_ident
+        )
+
+    @staticmethod
+    def _create_read_only_session_factory(debug: bool = False,
+                                          primary_engine: Optional[Engine] = None) -> scoped_session:
+        """
+        Create sessions of read only transactions on the replica,
+        or on the primary engine if no replica is configured.
+        """
+        config = app_config_manager.get_config()
+        if config.MYSQL_REPLICA_URL:
+            engine = DBManager._create_engine(DBManager._get_engine_url(config.MYSQL_REPLICA_URL), debug=debug)
+        elif primary_engine:
+            engine = primary_engine
+        else:
+            engine = DBManager._create_engine(DBManager._get_engine_url(), debug=debug)
+
+        session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        def start_read_only_transaction(session: Session, transaction: SessionTransaction,
+                                        connection: Connection) -> None:
+            if transaction.nested:
+                return
+            # Applies to the transaction which is implicitly started by the next statement
+            connection.exec_driver_sql('SET TRANSACTION READ ONLY')
+
+        event.listen(session_factory, 'after_begin', start_read_only_transaction)
+
+        return scoped_session(
+            session_factory=session_factory,
+            scopefunc=_get_scope_ident
+        )
+
+    @staticmethod
+    def _create_async_engine(debug: bool = False) -> AsyncEngine:
+        config = app_config_manager.get_config()
+        url = make_url(DBManager._get_engine_url()).set(drivername=f'mysql+{config.MYSQL_ASYNC_DRIVER}')
+        engine = create_async_engine(
+            url,
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_pre_ping=config.DB_POOL_PRE_PING,
+            echo=debug
         )
+        if not config.DB_POOL_PRE_PING and config.DB_POOL_PING_IDLE_THRESHOLD > 0:
+            DBManager._listen_idle_ping(engine.sync_engine, config.DB_POOL_PING_IDLE_THRESHOLD)
+        return engine
+
+    @staticmethod
+    def get_async_session_factory() -> sessionmaker:
+        """
+        Session factory of the async serving mode, created once per process.
+        Connections belong to the event loop of EventLoopManager, sessions must be used on it.
+        """
+        if DBManager.__async_pid != os.getpid():
+            with DBManager.__async_lock:
+                if DBManager.__async_pid != os.getpid():
+                    # Attributes of committed instances are not reloaded, lazy loads cannot run implicitly
+                    DBManager.__async_session_factory = sessionmaker(bind=DBManager._create_async_engine(),
+                                                                     class_=AsyncSession,
+                                                                     expire_on_commit=False)
+                    DBManager.__async_pid = os.getpid()
+        assert DBManager.__async_session_factory
+        return DBManager.__async_session_factory
+
+    @staticmethod
+    def _listen_idle_ping(engine: Engine, idle_threshold: int) -> None:
+        """
+        Ping only the connections idle longer than the threshold on checkout,
+        instead of a round trip on every checkout like pool_pre_ping.
+        """
+        checked_in_key = 'checked_in_at'
+
+        def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            connection_record.info.pop(checked_in_key, None)
+
+        def on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+            connection_record.info[checked_in_key] = time.monotonic()
+
+        def on_checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+            checked_in_at = connection_record.info.get(checked_in_key)
+            if checked_in_at is None or time.monotonic() - checked_in_at < idle_threshold:
+                return
+
+            DBManager._ping_connection(dbapi_connection)
+
+        event.listen(engine, 'connect', on_connect)
+        event.listen(engine, 'checkin', on_checkin)
+        event.listen(engine, 'checkout', on_checkout)
+
+    @staticmethod
+    def _ping_connection(dbapi_connection: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        except Exception:
+            # Pool discards the connection and retries the checkout with a new one
+            raise exc.DisconnectionError()
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def get_pool_metrics() -> Dict[str, Any]:
+        """
+        :return: Pool state and checkout counters of the current process
+        """
+        if not DBManager.__engine or not isinstance(DBManager.__engine.pool, InstrumentedQueuePool):
+            return {}
+        pool = DBManager.__engine.pool
+        return pool.metrics.snapshot(pool)
 
     @staticmethod
     def init_db(app: Flask) -> None:
         scoped_session_factory = DBManager._create_session_factory(debug=app.debug)
+        read_only_scoped_session_factory = DBManager._create_read_only_session_factory(
+            debug=app.debug,
+            primary_engine=scoped_session_factory.bind)
+        TransactionHooks.init()
+        RequestTimerManager.add_metrics_callback('db', DBManager.get_pool_metrics)
 
         def attach_scoped_session() -> None:
             """
@@ -46,6 +193,8 @@ class DBManager:
             """
             if 'scoped_session_factory' not in g:
                 g.scoped_session_factory = scoped_session_factory
+            if 'read_only_scoped_session_factory' not in g:
+                g.read_only_scoped_session_factory = read_only_scoped_session_factory
 
         def remove_scoped_session(exp: Any) -> None:
             """
@@ -54,6 +203,8 @@ class DBManager:
             """
             if session_factory := g.pop('scoped_session_factory', None):
                 session_factory.remove()
+            if read_only_session_factory := g.pop('read_only_scoped_session_factory', None):
+                read_only_session_factory.remove()
 
         # Register flask context events
         app.before_request(attach_scoped_session)
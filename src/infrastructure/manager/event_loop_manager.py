@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Coroutine, Optional, Set, TypeVar
+
+from src.config import app_config_manager
+from src.domain.common.error.timeout_errors import RequestTimeoutError
+
+T = TypeVar('T')
+
+
+class EventLoopManager:
+    """
+    Runs the coroutines of the async serving mode on an event loop thread of the process.
+
+    Request threads wait for their coroutines, while the I/O of all requests is multiplexed on one loop
+    and on its connection pools. Coroutines run in a copy of the caller context, Flask contexts included.
+    Waits are bounded, a coroutine is cancelled once its thread stops waiting for it.
+    """
+    logger = logging.getLogger(__name__)
+
+    __loop: Optional[asyncio.AbstractEventLoop] = None
+    __pid: Optional[int] = None
+    __lock = threading.Lock()
+    __background_tasks: Set['asyncio.Future[Any]'] = set()
+
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        # The loop thread does not survive a fork, workers start their own loop
+        if cls.__pid != os.getpid():
+            with cls.__lock:
+                if cls.__pid != os.getpid():
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name='event_loop', daemon=True).start()
+                    cls.__background_tasks = set()
+                    cls.__loop = loop
+                    cls.__pid = os.getpid()
+        assert cls.__loop
+        return cls.__loop
+
+    @classmethod
+    def run(cls, coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run coroutine on the event loop and wait for its result, must not be called from the loop thread.
+
+        :param coroutine: Coroutine to run
+        :param timeout: Seconds to wait for the result, API_ASYNC_TIMEOUT if None
+        :return: Result of coroutine, its exception is raised
+        :raises RequestTimeoutError: If coroutine does not complete in time, it is cancelled
+        """
+        if timeout is None:
+            timeout = app_config_manager.get_config().API_ASYNC_TIMEOUT
+
+        future = asyncio.run_coroutine_threadsafe(coroutine, cls.get_loop())
+        try:
+            return future.result(timeout)
+        except FuturesTimeoutError:
+            # Nobody waits for the result anymore, the transaction of the coroutine is rolled back
+            future.cancel()
+            raise RequestTimeoutError(timeout=timeout)
+
+    @classmethod
+    def is_loop_thread(cls) -> bool:
+        """
+        :return: True if called on the loop thread, where blocking calls stall the requests of all threads
+        """
+        try:
+            return asyncio.get_running_loop() is cls.__loop
+        except RuntimeError:
+            return False
+
+    @classmethod
+    def spawn(cls, coroutine: Coroutine[Any, Any, Any]) -> None:
+        """
+        Run coroutine in the background, called from the loop thread like after commit callbacks.
+        """
+        task = asyncio.ensure_future(coroutine)
+        # The loop keeps weak references to tasks only
+        cls.__background_tasks.add(task)
+        task.add_done_callback(cls.__on_background_task_done)
+
+    @classmethod
+    def offload(cls, callback: Callable[[], Any]) -> None:
+        """
+        Run blocking callback in the default executor if called from the loop thread, directly otherwise.
+        """
+        if not cls.is_loop_thread():
+            callback()
+            return
+        future = cls.get_loop().run_in_executor(None, callback)
+        cls.__background_tasks.add(future)
+        future.add_done_callback(cls.__on_background_task_done)
+
+    @classmethod
+    def __on_background_task_done(cls, task: 'asyncio.Future[Any]') -> None:
+        cls.__background_tasks.discard(task)
+        if not task.cancelled() and (exception := task.exception()):
+            cls.logger.error('Background task failed.', exc_info=exception)
@@ -1,5 +1,7 @@
-from typing import Optional
+import os
+from typing import Any, Dict, Optional
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 
 from src.config import get_environment
 from src.config.base.base_config import BaseConfig
@@ -8,6 +10,9 @@ from src.domain.common.error.configuration_error import ConfigurationError
 
 class RedisManager:
     __redis_instance: Optional[Redis] = None  # type: ignore
+    __async_redis_instance: Optional[AsyncRedis] = None  # type: ignore
+    __async_redis_pid: Optional[int] = None
+    __connection_kwargs: Optional[Dict[str, Any]] = None
 
     @classmethod
     def init_redis(cls, config: BaseConfig) -> None:
@@ -16,15 +21,29 @@ class RedisManager:
         if config.REDIS_HOST and config.REDIS_PORT:
             # No check for REDIS_PASSWORD and REDIS_DB in local and test env
             if env in ('test', 'local') or config.REDIS_PASSWORD:
-                cls.__redis_instance = Redis(
+                cls.__connection_kwargs = dict(
                     host=config.REDIS_HOST,
                     port=config.REDIS_PORT,
                     password=config.REDIS_PASSWORD,
                     db=config.REDIS_DB,
                     decode_responses=True)
+                cls.__redis_instance = Redis(**cls.__connection_kwargs)
 
     @classmethod
     def get_redis(cls) -> Redis:  # type: ignore
         if not cls.__redis_instance:
             raise ConfigurationError('Redis is not initialized.', 'redis_not_initialized')
         return cls.__redis_instance
+
+    @classmethod
+    def get_async_redis(cls) -> AsyncRedis:  # type: ignore
+        """
+        :return: Client of the async serving mode, its connections belong to the event loop of EventLoopManager
+        """
+        if not cls.__connection_kwargs:
+            raise ConfigurationError('Redis is not initialized.', 'redis_not_initialized')
+        # Connections of a parent process are not reused after fork
+        if cls.__async_redis_pid != os.getpid():
+            cls.__async_redis_instance = AsyncRedis(**cls.__connection_kwargs)
+            cls.__async_redis_pid = os.getpid()
+        return cls.__async_redis_instance
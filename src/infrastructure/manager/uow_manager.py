@@ -1,13 +1,74 @@
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Any, Iterator
 
+from flask import Flask, g
+
+from src.infrastructure.manager.db_manager import DBManager
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
+from src.infrastructure.repository.base.async_unit_of_work import AsyncUnitOfWork
 from src.infrastructure.repository.base.unit_of_work import UnitOfWork
 
+# Context variables are isolated per thread, and per greenlet of cooperative workers
+_context_uow: ContextVar[Optional[UnitOfWork]] = ContextVar('uow', default=None)
+
 
 class UOWManager:
+    # Unit of work shared by all threads, set by tests
     _uow: Optional[UnitOfWork] = None
 
+    _uow_key = 'uow'
+    _async_uow_key = 'async_uow'
+
+    @staticmethod
+    def init_manager(app: Flask) -> None:
+        app.teardown_appcontext(UOWManager._remove_uow)
+
     @classmethod
     def get_uow(cls) -> UnitOfWork:
-        if cls._uow is None:
-            cls._uow = UnitOfWork()
-        return cls._uow
+        """
+        :return: Unit of work of the current app context, the transactions of concurrent requests are not shared
+        """
+        if (uow := _context_uow.get()) is not None:
+            return uow
+        if cls._uow is not None:
+            return cls._uow
+
+        if (uow := g.get(cls._uow_key)) is None:
+            uow = UnitOfWork()
+            setattr(g, cls._uow_key, uow)
+        return uow
+
+    @staticmethod
+    @contextmanager
+    def use_uow(uow: UnitOfWork) -> Iterator[UnitOfWork]:
+        """
+        Use uow in the current context outside of Flask, like for the commit hooks of workers.
+        Other threads and greenlets do not see it.
+        """
+        token = _context_uow.set(uow)
+        try:
+            yield uow
+        finally:
+            _context_uow.reset(token)
+
+    @classmethod
+    def get_async_uow(cls) -> AsyncUnitOfWork:
+        """
+        :return: Async unit of work of the current app context, used on the loop of EventLoopManager
+        """
+        if (uow := g.get(cls._async_uow_key)) is None:
+            uow = AsyncUnitOfWork(DBManager.get_async_session_factory())
+            setattr(g, cls._async_uow_key, uow)
+        return uow
+
+    @classmethod
+    def _remove_uow(cls, exp: Any) -> None:
+        """
+        Called when the application context is popped.
+        https://flask.palletsprojects.com/en/2.2.x/api/#flask.Flask.teardown_appcontext
+        """
+        if uow := g.pop(cls._uow_key, None):
+            uow.close()
+        if async_uow := g.pop(cls._async_uow_key, None):
+            EventLoopManager.run(async_uow.close())
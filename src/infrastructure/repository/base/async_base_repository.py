@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import List, Optional, Type, Callable, Generic, Sequence
+
+from redis.asyncio import Redis as AsyncRedis
+from sqlalchemy import delete, select, update, Table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import operators, Select
+
+from src.domain.base.model.base_entity_model import EType
+from src.infrastructure.entity.base.base_entity import BaseEntity
+from src.infrastructure.manager.redis_manager import RedisManager
+from src.infrastructure.repository.base.repository_events import RepositoryEvents
+from src.infrastructure.repository.base.transaction_hooks import TransactionHooks
+
+
+class AsyncRedisRepository:
+    @property
+    def redis(self) -> AsyncRedis:  # type: ignore
+        return RedisManager.get_async_redis()
+
+
+class AsyncBaseRepository(Generic[EType]):
+    """
+    Async variant of BaseRepository on AsyncSession, used by the async serving mode.
+
+    Transaction hooks, mapper events and repository events are shared with the sync repositories,
+    they run on the sync session wrapped by AsyncSession. Their Redis updates are spawned on the loop.
+    """
+
+    def __init__(self, entity_type: Type[BaseEntity], session_callable: Callable[..., AsyncSession]) -> None:
+        self.entity_type = entity_type
+        self.session_callable = session_callable
+
+    @property
+    def session(self) -> AsyncSession:
+        return self.session_callable()
+
+    def select(self) -> Select:
+        return select(self.entity_type)
+
+    def insert(self, entity: EType) -> None:
+        instance = self.entity_type.from_model(entity)
+        self.session.add(instance)
+
+    def insert_many(self, *entity: EType) -> None:
+        if not entity:
+            return
+        instances = [self.entity_type.from_model(e) for e in entity]
+        self.session.add_all(instances)
+
+    async def update(self, entity: EType) -> None:
+        await self._update_entity(entity)
+
+    async def update_many(self, *entity: EType) -> None:
+        for e in entity:
+            await self._update_entity(e)
+
+    async def _update_entity(self, entity: EType) -> None:
+        """
+        Update only the changed fields of entity with a single UPDATE statement without reading the row first.
+        Entity without changed fields is not written.
+        """
+        changed_columns = entity.changed_fields.intersection(self.table.columns.keys()) - {'id', 'created_date'}
+        if not changed_columns:
+            return
+
+        entity.modified_date = datetime.utcnow()
+        values = {c: getattr(entity, c) for c in changed_columns}
+        values['modified_date'] = entity.modified_date
+        await self.session.execute(
+            update(self.entity_type)
+            .where(self.entity_type.id == entity.id)
+            .values(values)
+            .execution_options(synchronize_session='evaluate'))
+        entity.mark_clean()
+        self._dispatch_write([entity])
+
+    async def delete(self, entity_id: str) -> None:
+        await self.session.execute(
+            delete(self.entity_type)
+            .where(self.entity_type.id == entity_id)
+            .execution_options(synchronize_session=False))
+
+    async def delete_many(self, *entity_id: str) -> None:
+        if not entity_id:
+            return
+        await self.session.execute(
+            delete(self.entity_type)
+            .where(operators.in_op(self.entity_type.id, entity_id))
+            .execution_options(synchronize_session=False))
+
+    @property
+    def table(self) -> Table:
+        return self.entity_type.__table__  # type: ignore
+
+    def _dispatch_write(self, entities: Sequence[EType]) -> None:
+        written = list(entities)
+        TransactionHooks.after_commit(
+            self.session.sync_session,
+            lambda: RepositoryEvents.dispatch_write(self.entity_type, written))
+
+    async def get(self, entity_id: str) -> Optional[EType]:
+        instance = await self.session.get(self.entity_type, entity_id)
+        if not instance:
+            return None
+        t: Type[EType] = self.entity_type.domain_model()
+        return t.from_orm(instance)
+
+    async def get_many(self, *entity_id: str) -> Optional[List[EType]]:
+        if not entity_id:
+            return None
+        instances = await self.session.scalars(self.select().where(operators.in_op(self.entity_type.id, entity_id)))
+        t: Type[EType] = self.entity_type.domain_model()
+        return [t.from_orm(instance) for instance in instances]
+
+    async def all(self) -> List[EType]:
+        instances = await self.session.scalars(self.select())
+        t: Type[EType] = self.entity_type.domain_model()
+        return [t.from_orm(instance) for instance in instances]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Any, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+from sqlalchemy.orm import sessionmaker
+
+from src.infrastructure.repository.todo.async_todo_repository import AsyncTodoRepository
+from src.infrastructure.repository.todo_list.async_todo_list_repositories import AsyncTodoListRepository
+
+
+class AsyncUnitOfWork:
+    """
+    Async variant of UnitOfWork, one instance per request of the async serving mode.
+
+    Reads and writes use the primary, the instance is not shared by concurrent requests.
+    """
+
+    def __init__(self, session_factory: sessionmaker) -> None:
+        self._session_factory = session_factory
+        self._session_transactions: List[AsyncSessionTransaction] = []
+        self._default_session: Optional[AsyncSession] = None
+
+    async def __aenter__(self) -> AsyncUnitOfWork:
+        # Close the default session if exists
+        await self._close_default_session()
+
+        if not self._session_transactions:
+            _session_transaction = await self._session_factory().begin()
+        else:
+            _session_transaction = await self._session_transactions[-1].session.begin_nested()
+        self._session_transactions.append(_session_transaction)
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        _session_transaction = self._session_transactions.pop()
+        try:
+            # Cancelled coroutines are rolled back, CancelledError is not an Exception
+            if exc_value is None:
+                await _session_transaction.commit()
+            else:
+                await _session_transaction.rollback()
+        except Exception as ex:
+            await _session_transaction.rollback()
+            raise Exception('An error occurred when performing DB operation.') from ex
+
+        # Close the session if there is no active transaction left
+        if not self._session_transactions:
+            await _session_transaction.session.close()
+
+    def session(self) -> AsyncSession:
+        if self._session_transactions:
+            # The last session in context is actually current session
+            return self._session_transactions[-1].session
+
+        # Create a default session if not exists
+        if not self._default_session:
+            self._default_session = self._session_factory()
+        return self._default_session
+
+    async def _close_default_session(self) -> None:
+        if self._default_session:
+            await self._default_session.close()
+            self._default_session = None
+
+    async def close(self) -> None:
+        """
+        Close the session outside of a transaction, at the end of a request.
+        """
+        await self._close_default_session()
+
+    async def commit(self) -> None:
+        await self.session().commit()
+
+    async def rollback(self) -> None:
+        await self.session().rollback()
+
+    @cached_property
+    def todos(self) -> AsyncTodoRepository:
+        return AsyncTodoRepository(session_callable=self.session)
+
+    @cached_property
+    def todo_lists(self) -> AsyncTodoListRepository:
+        return AsyncTodoListRepository(session_callable=self.session)
@@ -1,14 +1,18 @@
 from datetime import datetime
-from typing import List, Optional, Type, Callable, Generic
+from typing import List, Optional, Type, Callable, Generic, Dict, Any, Sequence, Iterator
 
 from redis import Redis
-from sqlalchemy import func
+from sqlalchemy import func, insert, update, bindparam, Table
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import Session, Query
 from sqlalchemy.sql import operators
 
+from src.config import app_config_manager
 from src.domain.base.model.base_entity_model import EType
 from src.infrastructure.entity.base.base_entity import BaseEntity
 from src.infrastructure.manager.redis_manager import RedisManager
+from src.infrastructure.repository.base.repository_events import RepositoryEvents
+from src.infrastructure.repository.base.transaction_hooks import TransactionHooks
 
 
 class _QueryExtension:
@@ -45,6 +49,14 @@ class BaseRepository(Generic[EType]):
         else:
             return self.session.query(*entity_type)
 
+    @property
+    def rows(self) -> Query:
+        """
+        Query of the columns of entity, its rows are mapped with from_orm_trusted of the domain model
+        without ORM instances and validation.
+        """
+        return self.session.query(*self.table.columns)
+
     def apply(self, query: Query) -> _QueryExtension:
         return _QueryExtension(query)
 
@@ -62,17 +74,33 @@ class BaseRepository(Generic[EType]):
         self.session.add_all(instances)
 
     def update(self, entity: EType) -> None:
-        instance = self.entity_type.from_model(entity)
-        instance.modified_date = datetime.utcnow()
-        self.session.merge(instance)
+        self._update_entity(entity)
 
     def update_many(self, *entity: EType) -> None:
         if not entity:
             return
         for e in entity:
-            instance = self.entity_type.from_model(e)
-            instance.modified_date = datetime.utcnow()
-            self.session.merge(instance)
+            self._update_entity(e)
+
+    def _update_entity(self, entity: EType) -> None:
+        """
+        Update only the changed fields of entity with a single UPDATE statement without reading the row first.
+        Entity without changed fields is not written.
+        """
+        changed_columns = entity.changed_fields.intersection(self.table.columns.keys()) - {'id', 'created_date'}
+        if not changed_columns:
+            return
+
+        entity.modified_date = datetime.utcnow()
+        values = {c: getattr(entity, c) for c in changed_columns}
+        values['modified_date'] = entity.modified_date
+        self.session.execute(
+            update(self.entity_type)
+            .where(self.entity_type.id == entity.id)
+            .values(values)
+            .execution_options(synchronize_session='evaluate'))
+        entity.mark_clean()
+        self._dispatch_write([entity])
 
     def delete(self, entity_id: str) -> None:
         self.query.filter(self.entity_type.id == entity_id).delete(synchronize_session=False)
@@ -82,6 +110,95 @@ class BaseRepository(Generic[EType]):
             return
         self.query.filter(operators.in_op(self.entity_type.id, entity_id)).delete(synchronize_session=False)
 
+    def bulk_insert(self, *entity: EType) -> None:
+        """
+        Insert entities with executemany INSERT statements, bypassing the ORM unit of work.
+
+        :param entity: Domain models to insert
+        """
+        if not entity:
+            return
+        self._flush_pending()
+        statement = insert(self.table)
+        for batch in self._batches(entity):
+            self.session.execute(statement, [self._to_row(e) for e in batch])
+        self._dispatch_write(entity)
+
+    def bulk_update(self, *entity: EType) -> None:
+        """
+        Update entities by primary key with executemany UPDATE statements,
+        without selecting them first like merge. Entities loaded in the session are not refreshed.
+
+        :param entity: Domain models to update, all columns are written
+        """
+        if not entity:
+            return
+        self._flush_pending()
+        modified_date = datetime.utcnow()
+        for e in entity:
+            e.modified_date = modified_date
+
+        columns = [c for c in self.table.columns.keys() if c not in ('id', 'created_date')]
+        statement = update(self.table) \
+            .where(self.table.c.id == bindparam('b_id')) \
+            .values({c: bindparam(c) for c in columns})
+        for batch in self._batches(entity):
+            rows = []
+            for e in batch:
+                row = self._to_row(e)
+                row['b_id'] = row.pop('id')
+                row.pop('created_date')
+                rows.append(row)
+            self.session.execute(statement, rows)
+        self._dispatch_write(entity)
+
+    def bulk_upsert(self, *entity: EType) -> None:
+        """
+        Insert entities, or update all columns of the existing rows
+        with MySQL INSERT ... ON DUPLICATE KEY UPDATE statements.
+
+        :param entity: Domain models to upsert
+        """
+        if not entity:
+            return
+        self._flush_pending()
+        statement = mysql.insert(self.table)
+        update_columns: Dict[str, Any] = {
+            c: statement.inserted[c] for c in self.table.columns.keys()
+            if c not in ('id', 'created_date', 'modified_date')
+        }
+        update_columns['modified_date'] = datetime.utcnow()
+        statement = statement.on_duplicate_key_update(update_columns)
+        for batch in self._batches(entity):
+            self.session.execute(statement, [self._to_row(e) for e in batch])
+        self._dispatch_write(entity)
+
+    @property
+    def table(self) -> Table:
+        return self.entity_type.__table__  # type: ignore
+
+    def _to_row(self, entity: EType) -> Dict[str, Any]:
+        # Relationships of domain models are not columns
+        return entity.dict(include=set(self.table.columns.keys()))
+
+    @staticmethod
+    def _batches(entities: Sequence[EType]) -> Iterator[Sequence[EType]]:
+        batch_size = app_config_manager.get_config().DB_BULK_BATCH_SIZE
+        for i in range(0, len(entities), batch_size):
+            yield entities[i:i + batch_size]
+
+    def _flush_pending(self) -> None:
+        # Core statements do not autoflush, pending rows may be referenced by foreign keys
+        session = self.session
+        if session.new or session.dirty or session.deleted:
+            session.flush()
+
+    def _dispatch_write(self, entities: Sequence[EType]) -> None:
+        written = list(entities)
+        TransactionHooks.after_commit(
+            self.session,
+            lambda: RepositoryEvents.dispatch_write(self.entity_type, written))
+
     def get(self, entity_id: str) -> Optional[EType]:
         instance = self.session.get(self.entity_type, entity_id)
         if not instance:
@@ -0,0 +1,99 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple, List, Optional, TypeVar, Type
+
+from sqlalchemy import or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import ColumnElement, Select
+
+from src.domain.common.error.pagination_errors import InvalidCursorError
+from src.infrastructure.entity.base.base_entity import BaseEntity
+
+TEntity = TypeVar('TEntity', bound=BaseEntity)
+
+
+def encode_cursor(created_date: datetime, entity_id: str) -> str:
+    """
+    :return: Opaque token of the (created_date, id) position after which the next page starts
+    """
+    data = json.dumps([created_date.isoformat(), entity_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_date, entity_id = json.loads(data)
+        return datetime.fromisoformat(created_date), str(entity_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidCursorError(cursor=cursor)
+
+
+def paginate(query: Query,
+             entity_type: Type[TEntity],
+             page_size: int,
+             cursor: Optional[str] = None) -> Tuple[List[TEntity], Optional[str]]:
+    """
+    Return a page of query ordered by (created_date, id), seeking past the cursor instead of an offset.
+
+    :param query: Query of entity_type, or of its columns
+    :param entity_type: Entity type of query
+    :param page_size: Maximum number of items in page
+    :param cursor: Cursor returned with the previous page, None for the first page
+    :return: Items of page and cursor of the next page, None if there is no next page
+    """
+    if cursor:
+        query = query.filter(_seek_after_cursor(entity_type, cursor))
+
+    # Entities of the session may hold fractional seconds which are rounded by DATETIME columns,
+    # the cursor must be built from the stored values
+    items = query.order_by(entity_type.created_date, entity_type.id) \
+        .limit(page_size + 1) \
+        .populate_existing() \
+        .all()
+    return _split_page(items, page_size)
+
+
+async def paginate_async(session: AsyncSession,
+                         statement: Select,
+                         entity_type: Type[TEntity],
+                         page_size: int,
+                         cursor: Optional[str] = None) -> Tuple[List[TEntity], Optional[str]]:
+    """
+    Async variant of paginate for select statements of entity_type.
+
+    :param session: Session to execute statement
+    :param statement: Select statement of entity_type
+    :param entity_type: Entity type of statement
+    :param page_size: Maximum number of items in page
+    :param cursor: Cursor returned with the previous page, None for the first page
+    :return: Items of page and cursor of the next page, None if there is no next page
+    """
+    if cursor:
+        statement = statement.where(_seek_after_cursor(entity_type, cursor))
+
+    result = await session.execute(
+        statement.order_by(entity_type.created_date, entity_type.id)
+        .limit(page_size + 1)
+        .execution_options(populate_existing=True))
+    return _split_page(result.scalars().all(), page_size)
+
+
+def _seek_after_cursor(entity_type: Type[TEntity], cursor: str) -> ColumnElement:
+    created_date, entity_id = decode_cursor(cursor)
+    # Expanded row comparison, MySQL uses the index range only in this form
+    return or_(entity_type.created_date > created_date,
+               and_(entity_type.created_date == created_date,
+                    entity_type.id > entity_id))
+
+
+def _split_page(items: List[TEntity], page_size: int) -> Tuple[List[TEntity], Optional[str]]:
+    if len(items) <= page_size:
+        return items, None
+
+    items = items[:page_size]
+    last = items[-1]
+    return items, encode_cursor(last.created_date, last.id)
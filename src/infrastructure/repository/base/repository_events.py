@@ -0,0 +1,37 @@
+import logging
+from typing import Any, Callable, Dict, List, Sequence, Type
+
+from src.infrastructure.entity.base.base_entity import BaseEntity
+
+WriteListener = Callable[[Sequence[Any]], None]
+
+
+class RepositoryEvents:
+    """
+    Listeners of repository writes that bypass the ORM unit of work,
+    like Core bulk statements and single statement updates.
+
+    Mapper events (after_insert, after_update) are not emitted for those writes,
+    so consumers of the mapper events register here as well.
+    """
+    logger = logging.getLogger(__name__)
+
+    _write_listeners: Dict[Type[BaseEntity], List[WriteListener]] = {}
+
+    @classmethod
+    def listen_write(cls, entity_type: Type[BaseEntity], listener: WriteListener) -> None:
+        listeners = cls._write_listeners.setdefault(entity_type, [])
+        if listener not in listeners:
+            listeners.append(listener)
+
+    @classmethod
+    def dispatch_write(cls, entity_type: Type[BaseEntity], entities: Sequence[Any]) -> None:
+        """
+        :param entity_type: Entity type of the written table
+        :param entities: Written domain models
+        """
+        for listener in cls._write_listeners.get(entity_type, []):
+            try:
+                listener(entities)
+            except Exception:
+                cls.logger.error(f'Write listener of {entity_type.table_name()} failed.', exc_info=True)
@@ -0,0 +1,78 @@
+import logging
+from typing import Any, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, ORMExecuteState
+
+
+class TransactionHooks:
+    """
+    Defers side effects like cache writes until the data they depend on is committed.
+
+    A session that has written in its current transaction keeps the callbacks until the root
+    transaction commits, and drops them on rollback. Callbacks of a clean session run immediately.
+    """
+    logger = logging.getLogger(__name__)
+
+    _callbacks_key = 'after_commit_callbacks'
+    _has_writes_key = 'has_writes'
+    _is_initialized = False
+
+    @classmethod
+    def init(cls) -> None:
+        if cls._is_initialized:
+            return
+        cls._is_initialized = True
+
+        event.listen(Session, 'after_flush', cls._on_after_flush)
+        event.listen(Session, 'do_orm_execute', cls._on_orm_execute)
+        event.listen(Session, 'after_commit', cls._on_after_commit)
+        event.listen(Session, 'after_rollback', cls._on_after_rollback)
+
+    @classmethod
+    def after_commit(cls, session: Session, callback: Callable[[], None]) -> None:
+        if not session.info.get(cls._has_writes_key):
+            cls._run(callback)
+            return
+        session.info.setdefault(cls._callbacks_key, []).append(callback)
+
+    @classmethod
+    def has_writes(cls, session: Session) -> bool:
+        """
+        :return: True if session has pending or uncommitted writes, caches do not reflect them
+        """
+        return bool(session.new or session.dirty or session.deleted or session.info.get(cls._has_writes_key))
+
+    @classmethod
+    def _run(cls, callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception:
+            cls.logger.error('After commit callback failed.', exc_info=True)
+
+    @classmethod
+    def _on_after_flush(cls, session: Session, flush_context: Any) -> None:
+        session.info[cls._has_writes_key] = True
+
+    @classmethod
+    def _on_orm_execute(cls, orm_execute_state: ORMExecuteState) -> None:
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            orm_execute_state.session.info[cls._has_writes_key] = True
+
+    @classmethod
+    def _on_after_commit(cls, session: Session) -> None:
+        if session.in_nested_transaction():
+            # Savepoint is released, data is not committed yet
+            return
+
+        session.info.pop(cls._has_writes_key, None)
+        callbacks: List[Callable[[], None]] = session.info.pop(cls._callbacks_key, [])
+        for callback in callbacks:
+            cls._run(callback)
+
+    @classmethod
+    def _on_after_rollback(cls, session: Session) -> None:
+        # Dropping callbacks on a savepoint rollback is safe, nothing they depend on is committed
+        session.info.pop(cls._callbacks_key, None)
+        if not session.in_nested_transaction():
+            session.info.pop(cls._has_writes_key, None)
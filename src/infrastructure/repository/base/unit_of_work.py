@@ -1,30 +1,40 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from functools import cached_property
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Iterator
 
-from flask import g
+from flask import g, has_app_context
 from sqlalchemy.orm import Session, scoped_session, SessionTransaction
 
+from src.config import app_config_manager
 from src.infrastructure.repository.todo.todo_repository import TodoRepository
 from src.infrastructure.repository.todo_list.todo_list_repositories import TodoListRepository
 from src.infrastructure.repository.user.user_repository import UserRepository
 
 
 class UnitOfWork:
-    def __init__(self, scoped_session_factory: Optional[scoped_session] = None) -> None:
+    _primary_pin_key = 'uow_pinned_to_primary'
+
+    def __init__(self,
+                 scoped_session_factory: Optional[scoped_session] = None,
+                 read_only_scoped_session_factory: Optional[scoped_session] = None) -> None:
         if scoped_session_factory:
             self._scoped_session_factory = scoped_session_factory
+            self._read_only_scoped_session_factory = read_only_scoped_session_factory
         else:
             self._scoped_session_factory = g.get('scoped_session_factory')
+            self._read_only_scoped_session_factory = g.get('read_only_scoped_session_factory')
         self._session_transactions: List[SessionTransaction] = []
         self._default_session: Optional[Session] = None
+        self._default_read_only_session: Optional[Session] = None
+        self._read_only_depth = 0
+        # Without a replica, reads stay in the default session and only read_only blocks are read only
+        self._has_replica = bool(app_config_manager.get_config().MYSQL_REPLICA_URL)
 
     def __enter__(self) -> UnitOfWork:
-        # Close the default session if exists
-        if self._default_session:
-            self._default_session.close()
-            self._default_session = None
+        # Close the default sessions if exist
+        self._close_default_sessions()
 
         if not self._session_transactions:
             _session_transaction = self._scoped_session_factory.begin()
@@ -48,17 +58,69 @@ class UnitOfWork:
         # Close scoped session factory if there is no active transaction left
         if not self._session_transactions:
             self._scoped_session_factory.remove()
+            if not isinstance(exc_value, Exception):
+                self._pin_to_primary()
+
+    @contextmanager
+    def read_only(self) -> Iterator[UnitOfWork]:
+        """
+        Run the reads of the block in a read only transaction on the replica.
+        Reads of an active transaction stay in it.
+        """
+        if self._session_transactions or not self._read_only_scoped_session_factory:
+            yield self
+            return
+
+        self._read_only_depth += 1
+        try:
+            yield self
+        finally:
+            self._read_only_depth -= 1
+            if not self._read_only_depth:
+                self._default_read_only_session = None
+                self._read_only_scoped_session_factory.remove()
 
     def session(self) -> Session:
         if self._session_transactions:
             # The last session in context is actually current session
             return self._session_transactions[-1].session
 
+        if self._read_only_scoped_session_factory and (self._read_only_depth or self._routes_reads_to_replica()):
+            # Create a default read only session if not exists
+            if not self._default_read_only_session:
+                self._default_read_only_session = self._read_only_scoped_session_factory()
+            return self._default_read_only_session
+
         # Create a default session if not exists
         if not self._default_session:
             self._default_session = self._scoped_session_factory()
         return self._default_session
 
+    def _routes_reads_to_replica(self) -> bool:
+        # Reads outside of a request are not routed, writes of them cannot be pinned
+        return self._has_replica and has_app_context() and not g.get(self._primary_pin_key)
+
+    def _pin_to_primary(self) -> None:
+        # Read your writes, the replica may not have the committed data yet
+        if has_app_context():
+            setattr(g, self._primary_pin_key, True)
+
+    def _close_default_sessions(self) -> None:
+        if self._default_session:
+            self._default_session.close()
+            self._default_session = None
+        if self._default_read_only_session and not self._read_only_depth:
+            self._default_read_only_session.close()
+            self._default_read_only_session = None
+
+    def close(self) -> None:
+        """
+        Close the sessions outside of a transaction, at the end of a request or a worker run.
+        """
+        self._close_default_sessions()
+        if self._scoped_session_factory:
+            self._scoped_session_factory.remove()
+
     def commit(self) -> None:
         self.session().commit()
 
@@ -0,0 +1,126 @@
+import logging
+from datetime import datetime
+from typing import List, Callable, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import operators
+
+from src.config import app_config_manager
+from src.domain.common.error.configuration_error import ConfigurationError
+from src.domain.todo.entity.todo import Todo as DomainTodo
+from src.domain.todo.entity.todo_status import TodoStatus, TodoStatuses
+from src.infrastructure.entity.todo.todo import Todo
+from src.infrastructure.repository.base.async_base_repository import AsyncBaseRepository, AsyncRedisRepository
+from src.infrastructure.repository.base.keyset_pagination import paginate_async
+from src.infrastructure.repository.todo.todo_repository import TodoRepository
+
+
+class AsyncTodoRepository(AsyncBaseRepository[DomainTodo],
+                          AsyncRedisRepository):
+    """
+    Async variant of TodoRepository for the API, it shares the Redis entries of TodoRepository.
+    """
+    logger = logging.getLogger(__name__)
+
+    _inactive_todo_redis_ttl = TodoRepository._inactive_todo_redis_ttl
+    _get_expiry_score = staticmethod(TodoRepository._get_expiry_score)
+    __todos_prefix: Optional[str] = None
+
+    def __init__(self, session_callable: Callable[..., AsyncSession]) -> None:
+        config = app_config_manager.get_config()
+        self.__todos_prefix = config.REDIS_TODOS_PREFIX
+        super().__init__(Todo, session_callable)
+
+    def get_todo_key(self, todo_id: str) -> str:
+        if not self.__todos_prefix:
+            raise ConfigurationError('Cannot create todo key', 'invalid_todos_prefix')
+        return f'{self.__todos_prefix}:{todo_id}'
+
+    def get_todo_expiry_index_key(self) -> str:
+        if not self.__todos_prefix:
+            raise ConfigurationError('Cannot create todo expiry index key', 'invalid_todos_prefix')
+        return f'{self.__todos_prefix}:expiry_index'
+
+    async def user_list_todos(self, user_id: str) -> List[DomainTodo]:
+        todos = await self.session.scalars(
+            self.select().where(Todo.user_id == user_id,
+                                operators.in_op(Todo.status_id, TodoStatuses.get_active_ids())))
+        return [DomainTodo.from_orm_trusted(instance) for instance in todos]
+
+    async def user_list_todos_page(self,
+                                   user_id: str,
+                                   page_size: int,
+                                   cursor: Optional[str] = None) -> Tuple[List[DomainTodo], Optional[str]]:
+        statement = self.select().where(Todo.user_id == user_id,
+                                        operators.in_op(Todo.status_id, TodoStatuses.get_active_ids()))
+        todos, next_cursor = await paginate_async(self.session, statement, Todo, page_size, cursor)
+        return [DomainTodo.from_orm_trusted(instance) for instance in todos], next_cursor
+
+    async def user_get_todo(self, user_id: str, todo_id: str) -> Optional[DomainTodo]:
+        if todo := await self._user_get_todo_from_redis(todo_id):
+            if todo.status_id == TodoStatuses.deleted.id:
+                return None
+            return todo
+
+        result = await self.session.execute(
+            self.select().where(Todo.id == todo_id, Todo.user_id == user_id,
+                                operators.in_op(Todo.status_id, TodoStatuses.get_active_ids())))
+        if todo := result.scalars().one_or_none():
+            todo_domain = DomainTodo.from_orm_trusted(todo)
+            await self.update_todo_redis_entry(todo_domain)
+            return todo_domain
+        return None
+
+    async def _user_get_todo_from_redis(self, todo_id: str) -> Optional[DomainTodo]:
+        todo_key = self.get_todo_key(todo_id)
+        if todo := await self.redis.get(todo_key):
+            return DomainTodo.parse_raw_trusted(todo)
+        return None
+
+    async def update_todo_redis_entry(self, todo: DomainTodo) -> None:
+        todo_key = self.get_todo_key(todo.id)
+        await self.redis.set(todo_key, todo.json(), ex=self._inactive_todo_redis_ttl)
+
+    async def update_todo_expiry_index(self, *todo: DomainTodo) -> None:
+        """
+        Keep open todos in the expiry index scored by valid until, remove the others.
+        """
+        if not todo:
+            return
+        index_key = self.get_todo_expiry_index_key()
+        pipeline = self.redis.pipeline(transaction=False)
+        for t in todo:
+            if t.status_id == TodoStatuses.open.id:
+                pipeline.zadd(index_key, {t.id: self._get_expiry_score(t.valid_until)})
+            else:
+                pipeline.zrem(index_key, t.id)
+        await pipeline.execute()
+
+    async def user_list_todos_by_status(self, user_id: str, status: TodoStatus) -> List[DomainTodo]:
+        # Open todos past their valid until date are expired, whether or not the sweep persisted it
+        now = datetime.utcnow()
+        if status.id == TodoStatuses.open.id:
+            status_filter = and_(Todo.status_id == status.id, Todo.valid_until >= now)
+        elif status.id == TodoStatuses.expired.id:
+            status_filter = or_(Todo.status_id == status.id,
+                                and_(Todo.status_id == TodoStatuses.open.id, Todo.valid_until < now))
+        else:
+            status_filter = Todo.status_id == status.id
+
+        todos = await self.session.scalars(self.select().where(Todo.user_id == user_id, status_filter))
+        return [DomainTodo.from_orm_trusted(instance) for instance in todos]
+
+    async def user_update_status(self, user_id: str, todo_id: str, status: TodoStatus) -> bool:
+        result = await self.session.execute(
+            self.select().where(Todo.id == todo_id,
+                                Todo.user_id == user_id,
+                                Todo.status_id != status.id))
+
+        if todo := result.scalars().one_or_none():
+            todo_domain = DomainTodo.from_orm_trusted(todo)
+            todo_domain.status_id = status.id
+
+            await self.update(todo_domain)
+            return True
+        return False
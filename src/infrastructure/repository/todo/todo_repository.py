@@ -1,6 +1,9 @@
-from datetime import datetime
-from typing import List, Callable, Optional, Tuple
+import logging
+from datetime import datetime, timezone
+from typing import List, Callable, Optional, Tuple, Iterator, Sequence
 
+from redis.exceptions import LockError
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import operators
 
@@ -12,12 +15,16 @@ from src.domain.user.entity.user import User as DomainUser
 from src.infrastructure.entity.todo.todo import Todo
 from src.infrastructure.entity.user.user import User
 from src.infrastructure.repository.base.base_repository import BaseRepository, RedisRepository
+from src.infrastructure.repository.base.keyset_pagination import paginate
 
 
 class TodoRepository(BaseRepository[DomainTodo],
                      RedisRepository):
+    logger = logging.getLogger(__name__)
 
     _inactive_todo_redis_ttl = 5 * 60  # TTL in seconds for todos cache
+    _todo_expiry_index_ttl = 60 * 60  # TTL in seconds of the expiry index until it is rebuilt from DB
+    _todo_expiry_index_lock_ttl = 5 * 60  # seconds, must be longer than a rebuild
     __todos_prefix: Optional[str] = None
 
     def __init__(self, session_callable: Callable[..., Session]) -> None:
@@ -30,10 +37,39 @@ class TodoRepository(BaseRepository[DomainTodo],
             raise ConfigurationError('Cannot create todo key', 'invalid_todos_prefix')
         return f'{self.__todos_prefix}:{todo_id}'
 
+    def get_todo_expiry_index_key(self) -> str:
+        if not self.__todos_prefix:
+            raise ConfigurationError('Cannot create todo expiry index key', 'invalid_todos_prefix')
+        return f'{self.__todos_prefix}:expiry_index'
+
+    def get_todo_expiry_index_built_key(self) -> str:
+        return f'{self.get_todo_expiry_index_key()}:built'
+
     def user_list_todos(self, user_id: str) -> List[DomainTodo]:
-        todos = self.query.filter(Todo.user_id == user_id,
-                                  Todo.status_id != TodoStatuses.deleted.id).all()
-        return [DomainTodo.from_orm(instance) for instance in todos]
+        rows = self.rows.filter(Todo.user_id == user_id,
+                                operators.in_op(Todo.status_id, TodoStatuses.get_active_ids())).all()
+        return [DomainTodo.from_orm_trusted(row) for row in rows]
+
+    def user_list_todos_page(self,
+                             user_id: str,
+                             page_size: int,
+                             cursor: Optional[str] = None) -> Tuple[List[DomainTodo], Optional[str]]:
+        query = self.rows.filter(Todo.user_id == user_id,
+                                 operators.in_op(Todo.status_id, TodoStatuses.get_active_ids()))
+        rows, next_cursor = paginate(query, Todo, page_size, cursor)
+        return [DomainTodo.from_orm_trusted(row) for row in rows], next_cursor
+
+    def user_iter_todos(self, user_id: str, batch_size: int) -> Iterator[DomainTodo]:
+        """
+        Iterate todos of user from a server side cursor, holding only a batch of rows at once.
+        """
+        rows = self.rows.filter(Todo.user_id == user_id,
+                                operators.in_op(Todo.status_id, TodoStatuses.get_active_ids())) \
+            .order_by(Todo.created_date, Todo.id) \
+            .execution_options(stream_results=True) \
+            .yield_per(batch_size)
+        for row in rows:
+            yield DomainTodo.from_orm_trusted(row)
 
     def user_get_todo(self, user_id: str, todo_id: str) -> Optional[DomainTodo]:
         if todo := self._user_get_todo_from_redis(todo_id):
@@ -42,7 +78,7 @@ class TodoRepository(BaseRepository[DomainTodo],
             return todo
 
         todo = self.query.filter(Todo.id == todo_id, Todo.user_id == user_id,
-                                 Todo.status_id != TodoStatuses.deleted.id).one_or_none()
+                                 operators.in_op(Todo.status_id, TodoStatuses.get_active_ids())).one_or_none()
         if todo:
             todo_domain = DomainTodo.from_orm(todo)
             self.update_todo_redis_entry(todo_domain)
@@ -52,7 +88,7 @@ class TodoRepository(BaseRepository[DomainTodo],
     def _user_get_todo_from_redis(self, todo_id: str) -> Optional[DomainTodo]:
         todo_key = self.get_todo_key(todo_id)
         if todo := self.redis.get(todo_key):
-            return DomainTodo.parse_raw(todo)
+            return DomainTodo.parse_raw_trusted(todo)
         return None
 
     def update_todo_redis_entry(self, todo: DomainTodo) -> None:
@@ -60,8 +96,18 @@ class TodoRepository(BaseRepository[DomainTodo],
         self.redis.set(todo_key, todo.json(), ex=self._inactive_todo_redis_ttl)
 
     def user_list_todos_by_status(self, user_id: str, status: TodoStatus) -> List[DomainTodo]:
-        todos = self.query.filter_by(user_id=user_id, status_id=status.id).all()
-        return [DomainTodo.from_orm(instance) for instance in todos]
+        # Open todos past their valid until date are expired, whether or not the sweep persisted it
+        now = datetime.utcnow()
+        if status.id == TodoStatuses.open.id:
+            status_filter = and_(Todo.status_id == status.id, Todo.valid_until >= now)
+        elif status.id == TodoStatuses.expired.id:
+            status_filter = or_(Todo.status_id == status.id,
+                                and_(Todo.status_id == TodoStatuses.open.id, Todo.valid_until < now))
+        else:
+            status_filter = Todo.status_id == status.id
+
+        rows = self.rows.filter(Todo.user_id == user_id, status_filter).all()
+        return [DomainTodo.from_orm_trusted(row) for row in rows]
 
     def user_update_status(self, user_id: str, todo_id: str, status: TodoStatus) -> bool:
         todo = self.query.filter(
@@ -77,21 +123,113 @@ class TodoRepository(BaseRepository[DomainTodo],
             return True
         return False
 
-    def worker_update_expired_todos(self) -> List[Tuple[DomainTodo, DomainUser]]:
-        id_list = self.session.query(Todo.id).filter(
-            Todo.status_id == TodoStatuses.open.id,
-            Todo.valid_until < datetime.utcnow()
-        ).all()
-
-        id_list = [obj_id for obj_id, in id_list]
-
-        self.query.filter(operators.in_op(Todo.id, id_list),
-                          Todo.status_id == TodoStatuses.open.id) \
-            .update({Todo.status_id: TodoStatuses.expired.id},
-                    synchronize_session=False)
-
-        todo_user_list = self.session.query(Todo, User).join(User, Todo.user_id == User.id)\
-            .filter(operators.in_op(Todo.id, id_list),
-                    Todo.status_id == TodoStatuses.expired.id).all()
+    def worker_update_expired_todos(self,
+                                    limit: int,
+                                    todo_ids: Optional[Sequence[str]] = None) -> List[Tuple[DomainTodo, DomainUser]]:
+        """
+        Expire a chunk of open todos whose valid until date has passed.
+
+        Todo rows are locked with FOR UPDATE SKIP LOCKED, so workers running in parallel expire disjoint chunks.
+        Commit each chunk in its own transaction to release its locks.
+
+        :param limit: Maximum number of todos to expire
+        :param todo_ids: Candidate todos from the expiry index, all due todos if not given
+        :return: Expired todos and owner users list
+        """
+        query = self.query.filter(Todo.status_id == TodoStatuses.open.id,
+                                  Todo.valid_until < datetime.utcnow())
+        if todo_ids is not None:
+            query = query.filter(operators.in_op(Todo.id, todo_ids))
+
+        todos = query \
+            .order_by(Todo.valid_until) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True) \
+            .populate_existing() \
+            .all()
+        if not todos:
+            return []
+
+        self.query.filter(operators.in_op(Todo.id, [todo.id for todo in todos])) \
+            .update({Todo.status_id: TodoStatuses.expired.id, Todo.modified_date: datetime.utcnow()},
+                    synchronize_session='evaluate')
+
+        # Owners are read without locks, parallel workers may expire todos of the same user
+        users = self.session.query(User).filter(operators.in_op(User.id, {todo.user_id for todo in todos})).all()
+        domain_users = {user.id: DomainUser.from_orm_trusted(user) for user in users}
+
+        domain_todos = [DomainTodo.from_orm_trusted(todo) for todo in todos]
+        self._dispatch_write(domain_todos)
+        return [(todo, domain_users[todo.user_id]) for todo in domain_todos]
+
+    def update_todo_expiry_index(self, *todo: DomainTodo) -> None:
+        """
+        Keep open todos in the expiry index scored by valid until, remove the others.
+        """
+        if not todo:
+            return
+        index_key = self.get_todo_expiry_index_key()
+        pipeline = self.redis.pipeline(transaction=False)
+        for t in todo:
+            if t.status_id == TodoStatuses.open.id:
+                pipeline.zadd(index_key, {t.id: self._get_expiry_score(t.valid_until)})
+            else:
+                pipeline.zrem(index_key, t.id)
+        pipeline.execute()
+
+    def remove_from_todo_expiry_index(self, *todo_id: str) -> None:
+        if todo_id:
+            self.redis.zrem(self.get_todo_expiry_index_key(), *todo_id)
+
+    def list_due_todo_ids(self, limit: int) -> List[str]:
+        """
+        :param limit: Maximum number of ids
+        :return: Ids of open todos due until now in the expiry index, earliest first
+        """
+        score = self._get_expiry_score(datetime.utcnow())
+        return self.redis.zrangebyscore(self.get_todo_expiry_index_key(), '-inf', score, start=0, num=limit)
+
+    def ensure_todo_expiry_index(self, batch_size: int) -> bool:
+        """
+        Rebuild the expiry index from DB if it is missing or its TTL is expired.
+        Writes that do not emit repository or mapper events are recovered by the periodic rebuild.
+
+        :param batch_size: Rows read from DB at once
+        :return: False if another process is rebuilding the index
+        """
+        built_key = self.get_todo_expiry_index_built_key()
+        if self.redis.exists(built_key):
+            return True
 
-        return [(DomainTodo.from_orm(todo), DomainUser.from_orm(user)) for todo, user in todo_user_list]
+        lock = self.redis.lock(f'lock_{built_key}', timeout=self._todo_expiry_index_lock_ttl, blocking_timeout=0)
+        if not lock.acquire():
+            return False
+        try:
+            # Entries are added over the existing index, hooks may update it during the rebuild
+            index_key = self.get_todo_expiry_index_key()
+            rows = self.session.query(Todo.id, Todo.valid_until) \
+                .filter(Todo.status_id == TodoStatuses.open.id) \
+                .execution_options(stream_results=True) \
+                .yield_per(batch_size)
+            mapping = {}
+            for todo_id, valid_until in rows:
+                mapping[todo_id] = self._get_expiry_score(valid_until)
+                if len(mapping) >= batch_size:
+                    self.redis.zadd(index_key, mapping)
+                    mapping = {}
+            if mapping:
+                self.redis.zadd(index_key, mapping)
+            self.redis.set(built_key, datetime.utcnow().isoformat(), ex=self._todo_expiry_index_ttl)
+            return True
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                self.logger.warning('Todo expiry index lock is expired.')
+
+    @staticmethod
+    def _get_expiry_score(valid_until: datetime) -> float:
+        # Naive dates are UTC
+        if not valid_until.tzinfo:
+            valid_until = valid_until.replace(tzinfo=timezone.utc)
+        return valid_until.timestamp()
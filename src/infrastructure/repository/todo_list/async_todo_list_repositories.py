@@ -0,0 +1,127 @@
+import json
+import logging
+from typing import Callable, List, Optional, Tuple
+
+from redis import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import operators
+
+from src.config import app_config_manager
+from src.domain.common.error.configuration_error import ConfigurationError
+from src.domain.todo_list.entity.todo_list_status import TodoListStatuses, TodoListStatus
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
+from src.infrastructure.repository.base.async_base_repository import AsyncBaseRepository, AsyncRedisRepository
+from src.infrastructure.repository.base.keyset_pagination import paginate_async
+from src.infrastructure.repository.base.transaction_hooks import TransactionHooks
+from src.infrastructure.repository.todo_list.todo_list_repositories import TodoListRepository
+from src.domain.todo_list.entity.todo_list import TodoList as DomainTodoList
+from src.infrastructure.entity.todo_list.todo_list import TodoList
+
+
+class AsyncTodoListRepository(AsyncBaseRepository[DomainTodoList],
+                              AsyncRedisRepository):
+    """
+    Async variant of TodoListRepository for the API, it shares the Redis entries of TodoListRepository.
+    """
+    logger = logging.getLogger(__name__)
+
+    _todo_list_pages_redis_ttl = TodoListRepository._todo_list_pages_redis_ttl
+    __todo_lists_prefix: Optional[str] = None
+
+    def __init__(self, session_callable: Callable[..., AsyncSession]) -> None:
+        config = app_config_manager.get_config()
+        self.__todo_lists_prefix = config.REDIS_TODO_LISTS_PREFIX
+        super().__init__(TodoList, session_callable)
+
+    def get_user_todo_list_key(self, user_id: str) -> str:
+        if not self.__todo_lists_prefix:
+            raise ConfigurationError('Cannot create todo list key', 'invalid_todo_lists_prefix')
+        return f'{self.__todo_lists_prefix}:{user_id}'
+
+    def get_user_todo_list_pages_key(self, user_id: str) -> str:
+        return f'{self.get_user_todo_list_key(user_id)}:pages'
+
+    async def user_list_todo_lists_page(self,
+                                        user_id: str,
+                                        page_size: int,
+                                        cursor: Optional[str] = None) -> Tuple[List[DomainTodoList], Optional[str]]:
+        page_field = f'{page_size}:{cursor or ""}'
+        # Cached pages do not reflect writes of the current transaction
+        use_cache = not TransactionHooks.has_writes(self.session.sync_session)
+
+        if use_cache and (page := await self._user_get_todo_lists_page_from_redis(user_id, page_field)):
+            return page
+
+        statement = self.select().where(TodoList.user_id == user_id,
+                                        operators.in_op(TodoList.status_id, TodoListStatuses.get_active_ids()))
+        instances, next_cursor = await paginate_async(self.session, statement, TodoList, page_size, cursor)
+        todo_lists = [DomainTodoList.from_orm_trusted(instance) for instance in instances]
+
+        if use_cache:
+            TransactionHooks.after_commit(
+                self.session.sync_session,
+                lambda: EventLoopManager.spawn(
+                    self._add_todo_lists_page_to_redis_entry(user_id, page_field, todo_lists, next_cursor)))
+        return todo_lists, next_cursor
+
+    async def user_get_todo_list(self, user_id: str, todo_list_id: str) -> Optional[DomainTodoList]:
+        result = await self.session.execute(
+            self.select().where(TodoList.id == todo_list_id, TodoList.user_id == user_id,
+                                operators.in_op(TodoList.status_id, TodoListStatuses.get_active_ids())))
+        if todo_list := result.scalars().one_or_none():
+            return DomainTodoList.from_orm(todo_list)
+        return None
+
+    async def user_get_todo_list_with_todo(self, user_id: str, todo_list_id: str) -> Optional[DomainTodoList]:
+        result = await self.session.execute(
+            self.select().where(TodoList.id == todo_list_id, TodoList.user_id == user_id,
+                                operators.in_op(TodoList.status_id, TodoListStatuses.get_active_ids()))
+            .options(joinedload(TodoList.todos)))
+
+        # Rows of the joined collection repeat the todo list
+        if todo_list := result.unique().scalars().one_or_none():
+            return DomainTodoList.from_orm_trusted(todo_list)
+        return None
+
+    async def user_update_status(self, user_id: str, todo_list_id: str, status: TodoListStatus) -> bool:
+        result = await self.session.execute(
+            self.select().where(TodoList.id == todo_list_id,
+                                TodoList.user_id == user_id,
+                                TodoList.status_id != status.id))
+
+        if todo_list := result.scalars().one_or_none():
+            todo_list_domain = DomainTodoList.from_orm(todo_list)
+            todo_list_domain.status_id = status.id
+
+            await self.update(todo_list_domain)
+            return True
+        return False
+
+    async def _user_get_todo_lists_page_from_redis(
+            self, user_id: str, page_field: str) -> Optional[Tuple[List[DomainTodoList], Optional[str]]]:
+        try:
+            if page := await self.redis.hget(self.get_user_todo_list_pages_key(user_id), page_field):
+                data = json.loads(page)
+                return [DomainTodoList.parse_obj_trusted(todo_list) for todo_list in data['items']], \
+                    data['next_cursor']
+        except RedisError:
+            self.logger.warning(f'TodoList page of {user_id} could not be obtained from Redis', exc_info=True)
+        return None
+
+    async def _add_todo_lists_page_to_redis_entry(self,
+                                                  user_id: str,
+                                                  page_field: str,
+                                                  todo_lists: List[DomainTodoList],
+                                                  next_cursor: Optional[str]) -> None:
+        pages_key = self.get_user_todo_list_pages_key(user_id)
+        page = json.dumps({'items': [json.loads(todo_list.json()) for todo_list in todo_lists],
+                           'next_cursor': next_cursor})
+        pipeline = self.redis.pipeline()
+        pipeline.hset(pages_key, page_field, page)
+        pipeline.expire(pages_key, self._todo_list_pages_redis_ttl)
+        await pipeline.execute()
+
+    async def invalidate_redis_entry(self, user_id: str) -> None:
+        todo_lists_key = self.get_user_todo_list_key(user_id)
+        await self.redis.delete(todo_lists_key, self.get_user_todo_list_pages_key(user_id))
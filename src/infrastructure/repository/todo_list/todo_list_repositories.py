@@ -1,17 +1,27 @@
-from typing import Callable, List, Optional
+import json
+import logging
+from typing import Callable, List, Optional, Tuple, Iterator
+
+from redis import RedisError
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import operators
 
 from src.config import app_config_manager
 from src.domain.common.error.configuration_error import ConfigurationError
 from src.domain.todo_list.entity.todo_list_status import TodoListStatuses, TodoListStatus
 from src.infrastructure.repository.base.base_repository import BaseRepository, RedisRepository
+from src.infrastructure.repository.base.keyset_pagination import paginate
+from src.infrastructure.repository.base.transaction_hooks import TransactionHooks
 from src.domain.todo_list.entity.todo_list import TodoList as DomainTodoList
 from src.infrastructure.entity.todo_list.todo_list import TodoList
 
 
 class TodoListRepository(BaseRepository[DomainTodoList],
                          RedisRepository):
+    logger = logging.getLogger(__name__)
+
+    _todo_list_pages_redis_ttl = 5 * 60  # TTL in seconds for todo list pages cache
     __todo_lists_prefix: Optional[str] = None
 
     def __init__(self, session_callable: Callable[..., Session]) -> None:
@@ -24,22 +34,61 @@ class TodoListRepository(BaseRepository[DomainTodoList],
             raise ConfigurationError('Cannot create todo list key', 'invalid_todo_lists_prefix')
         return f'{self.__todo_lists_prefix}:{user_id}'
 
+    def get_user_todo_list_pages_key(self, user_id: str) -> str:
+        return f'{self.get_user_todo_list_key(user_id)}:pages'
+
     def user_list_todo_lists(self, user_id: str) -> List[DomainTodoList]:
 
         if todo_lists_redis := self._user_get_todo_lists_from_redis(user_id):
             return todo_lists_redis
 
-        todo_lists = self.query.filter(TodoList.user_id == user_id,
-                                       TodoList.status_id != TodoListStatuses.deleted.id).all()
+        rows = self.rows.filter(TodoList.user_id == user_id,
+                                operators.in_op(TodoList.status_id, TodoListStatuses.get_active_ids())).all()
+        todo_lists = [DomainTodoList.from_orm_trusted(row) for row in rows]
 
         for todo_list in todo_lists:
-            self.add_todo_list_to_redis_entry(DomainTodoList.from_orm(todo_list))
-
-        return [DomainTodoList.from_orm(instance) for instance in todo_lists]
+            self.add_todo_list_to_redis_entry(todo_list)
+
+        return todo_lists
+
+    def user_list_todo_lists_page(self,
+                                  user_id: str,
+                                  page_size: int,
+                                  cursor: Optional[str] = None) -> Tuple[List[DomainTodoList], Optional[str]]:
+        page_field = f'{page_size}:{cursor or ""}'
+        # Cached pages do not reflect writes of the current transaction
+        use_cache = not TransactionHooks.has_writes(self.session)
+
+        if use_cache and (page := self._user_get_todo_lists_page_from_redis(user_id, page_field)):
+            return page
+
+        query = self.rows.filter(TodoList.user_id == user_id,
+                                 operators.in_op(TodoList.status_id, TodoListStatuses.get_active_ids()))
+        rows, next_cursor = paginate(query, TodoList, page_size, cursor)
+        todo_lists = [DomainTodoList.from_orm_trusted(row) for row in rows]
+
+        if use_cache:
+            TransactionHooks.after_commit(
+                self.session,
+                lambda: self._add_todo_lists_page_to_redis_entry(user_id, page_field, todo_lists, next_cursor))
+        return todo_lists, next_cursor
+
+    def user_iter_todo_lists(self, user_id: str, batch_size: int) -> Iterator[DomainTodoList]:
+        """
+        Iterate todo lists of user from a server side cursor, holding only a batch of rows at once.
+        """
+        rows = self.rows.filter(TodoList.user_id == user_id,
+                                operators.in_op(TodoList.status_id, TodoListStatuses.get_active_ids())) \
+            .order_by(TodoList.created_date, TodoList.id) \
+            .execution_options(stream_results=True) \
+            .yield_per(batch_size)
+        for row in rows:
+            yield DomainTodoList.from_orm_trusted(row)
 
     def user_get_todo_list(self, user_id: str, todo_list_id: str) -> Optional[DomainTodoList]:
         todo_list = self.query.filter(TodoList.id == todo_list_id, TodoList.user_id == user_id,
-                                      TodoList.status_id != TodoListStatuses.deleted.id).one_or_none()
+                                      operators.in_op(TodoList.status_id, TodoListStatuses.get_active_ids())) \
+            .one_or_none()
         if todo_list:
             todo_list_domain = DomainTodoList.from_orm(todo_list)
             return todo_list_domain
@@ -47,13 +96,12 @@ class TodoListRepository(BaseRepository[DomainTodoList],
 
     def user_get_todo_list_with_todo(self, user_id: str, todo_list_id: str) -> Optional[DomainTodoList]:
         todo_list = self.query.filter(TodoList.id == todo_list_id, TodoList.user_id == user_id,
-                                      TodoList.status_id != TodoListStatuses.deleted.id)\
+                                      operators.in_op(TodoList.status_id, TodoListStatuses.get_active_ids()))\
             .options(joinedload(TodoList.todos)) \
             .one_or_none()
 
         if todo_list:
-            todo_list_domain = DomainTodoList.from_orm(todo_list)
-            return todo_list_domain
+            return DomainTodoList.from_orm_trusted(todo_list)
         return None
 
     def user_update_status(self, user_id: str, todo_list_id: str, status: TodoListStatus) -> bool:
@@ -73,13 +121,37 @@ class TodoListRepository(BaseRepository[DomainTodoList],
     def _user_get_todo_lists_from_redis(self, user_id: str) -> Optional[List[DomainTodoList]]:
         todo_lists_key = self.get_user_todo_list_key(user_id)
         if todo_lists := self.redis.smembers(todo_lists_key):
-            return [DomainTodoList.parse_raw(todo_list) for todo_list in todo_lists]
+            return [DomainTodoList.parse_raw_trusted(todo_list) for todo_list in todo_lists]
         return None
 
     def add_todo_list_to_redis_entry(self, todo_list: DomainTodoList) -> None:
         todo_lists_key = self.get_user_todo_list_key(todo_list.user_id)
         self.redis.sadd(todo_lists_key, todo_list.json())
 
+    def _user_get_todo_lists_page_from_redis(
+            self, user_id: str, page_field: str) -> Optional[Tuple[List[DomainTodoList], Optional[str]]]:
+        try:
+            if page := self.redis.hget(self.get_user_todo_list_pages_key(user_id), page_field):
+                data = json.loads(page)
+                return [DomainTodoList.parse_obj_trusted(todo_list) for todo_list in data['items']], \
+                    data['next_cursor']
+        except RedisError:
+            self.logger.warning(f'TodoList page of {user_id} could not be obtained from Redis', exc_info=True)
+        return None
+
+    def _add_todo_lists_page_to_redis_entry(self,
+                                            user_id: str,
+                                            page_field: str,
+                                            todo_lists: List[DomainTodoList],
+                                            next_cursor: Optional[str]) -> None:
+        pages_key = self.get_user_todo_list_pages_key(user_id)
+        page = json.dumps({'items': [json.loads(todo_list.json()) for todo_list in todo_lists],
+                           'next_cursor': next_cursor})
+        pipeline = self.redis.pipeline()
+        pipeline.hset(pages_key, page_field, page)
+        pipeline.expire(pages_key, self._todo_list_pages_redis_ttl)
+        pipeline.execute()
+
     def invalidate_redis_entry(self, user_id: str) -> None:
         todo_lists_key = self.get_user_todo_list_key(user_id)
-        self.redis.delete(todo_lists_key)
+        self.redis.delete(todo_lists_key, self.get_user_todo_list_pages_key(user_id))
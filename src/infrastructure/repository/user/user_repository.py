@@ -1,17 +1,96 @@
-from typing import Callable, Optional
+import logging
+import time
+from typing import Callable, List, Optional, Union
 
+from redis import RedisError
 from sqlalchemy.orm import Session
 
+from src.config import app_config_manager
+from src.domain.common.error.configuration_error import ConfigurationError
 from src.domain.user.entity.user import User as DomainUser
+from src.infrastructure.cache.ttl_lru_cache import TTLLRUCache
 from src.infrastructure.entity.user.user import User
-from src.infrastructure.repository.base.base_repository import BaseRepository
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
+from src.infrastructure.repository.base.base_repository import BaseRepository, RedisRepository
+from src.infrastructure.repository.base.transaction_hooks import TransactionHooks
 
 
-class UserRepository(BaseRepository[DomainUser]):
+class UserRepository(BaseRepository[DomainUser],
+                     RedisRepository):
+    logger = logging.getLogger(__name__)
+
+    _user_redis_ttl = 5 * 60  # TTL in seconds for users cache
+    _user_local_ttl = 30  # TTL in seconds for in-process users cache, bounds staleness across processes
+    _user_local_cache: TTLLRUCache[str, DomainUser] = TTLLRUCache(maxsize=1024)
+    __users_prefix: Optional[str] = None
 
     def __init__(self, session_callable: Callable[..., Session]) -> None:
+        config = app_config_manager.get_config()
+        self.__users_prefix = config.REDIS_USERS_PREFIX
         super().__init__(User, session_callable)
 
+    def get_user_key(self, sub_id: str) -> str:
+        if not self.__users_prefix:
+            raise ConfigurationError('Cannot create user key', 'invalid_users_prefix')
+        return f'{self.__users_prefix}:{sub_id}'
+
+    def insert(self, entity: DomainUser) -> None:
+        super().insert(entity)
+        self.invalidate_user_cache_entry(entity.sub_id)
+
+    def insert_many(self, *entity: DomainUser) -> None:
+        super().insert_many(*entity)
+        self.invalidate_user_cache_entry(*[e.sub_id for e in entity])
+
+    def update(self, entity: DomainUser) -> None:
+        self.update_many(entity)
+
+    def update_many(self, *entity: DomainUser) -> None:
+        # Changed fields are cleared by the update
+        changed = [e for e in entity if e.changed_fields]
+        stored_sub_ids = self._get_stored_sub_ids(*changed)
+        super().update_many(*entity)
+        self.invalidate_user_cache_entry(*[e.sub_id for e in changed], *stored_sub_ids)
+
+    def delete(self, entity_id: Union[str, DomainUser]) -> None:
+        self.delete_many(entity_id)
+
+    def delete_many(self, *entity_id: Union[str, DomainUser]) -> None:
+        """
+        :param entity_id: Ids of users, or users whose cache entries are invalidated without reading their rows
+        """
+        users = [e for e in entity_id if isinstance(e, DomainUser)]
+        user_ids = [e for e in entity_id if isinstance(e, str)]
+        sub_ids = [u.sub_id for u in users]
+        if user_ids:
+            sub_ids.extend(sub_id for sub_id, in self.session.query(User.sub_id).filter(User.id.in_(user_ids)))
+        super().delete_many(*user_ids, *[u.id for u in users])
+        self.invalidate_user_cache_entry(*sub_ids)
+
+    def bulk_insert(self, *entity: DomainUser) -> None:
+        super().bulk_insert(*entity)
+        self.invalidate_user_cache_entry(*[e.sub_id for e in entity])
+
+    def bulk_update(self, *entity: DomainUser) -> None:
+        stored_sub_ids = self._get_stored_sub_ids(*entity)
+        super().bulk_update(*entity)
+        self.invalidate_user_cache_entry(*[e.sub_id for e in entity], *stored_sub_ids)
+
+    def bulk_upsert(self, *entity: DomainUser) -> None:
+        stored_sub_ids = self._get_stored_sub_ids(*entity)
+        super().bulk_upsert(*entity)
+        self.invalidate_user_cache_entry(*[e.sub_id for e in entity], *stored_sub_ids)
+
+    def _get_stored_sub_ids(self, *entity: DomainUser) -> List[str]:
+        """
+        Sub ids of users before a write which changes them, entries of the old sub ids are invalidated too.
+        Other writes do not read the rows.
+        """
+        user_ids = [e.id for e in entity if 'sub_id' in e.changed_fields]
+        if not user_ids:
+            return []
+        return [sub_id for sub_id, in self.session.query(User.sub_id).filter(User.id.in_(user_ids))]
+
     def get_by_email(self, email: str) -> Optional[DomainUser]:
         user = self.query.filter_by(email=email).one_or_none()
         if user:
@@ -24,3 +103,58 @@ class UserRepository(BaseRepository[DomainUser]):
             return DomainUser.from_orm(user)
         return None
 
+    def get_sub_id_cached(self, sub_id: str) -> Optional[DomainUser]:
+        """
+        Return user of given sub id from in-process cache, then Redis and then DB.
+
+        :param sub_id: Auth0 sub id of user
+        :return: User of given sub id
+        """
+        if user := self._user_local_cache.get(sub_id):
+            return user.copy()
+
+        if user := self._get_user_from_redis(sub_id):
+            self._user_local_cache.set(sub_id, user, expires_at=time.time() + self._user_local_ttl)
+            return user.copy()
+
+        user = self.get_sub_id(sub_id)
+        if user:
+            cached_user = user.copy()
+            # Cache only committed data
+            TransactionHooks.after_commit(
+                self.session, lambda: EventLoopManager.offload(lambda: self.update_user_cache_entry(cached_user)))
+        return user
+
+    def _get_user_from_redis(self, sub_id: str) -> Optional[DomainUser]:
+        try:
+            if user := self.redis.get(self.get_user_key(sub_id)):
+                return DomainUser.parse_raw_trusted(user)
+        except RedisError:
+            self.logger.warning(f'User for {sub_id} could not be obtained from Redis', exc_info=True)
+        return None
+
+    def update_user_cache_entry(self, user: DomainUser) -> None:
+        self._user_local_cache.set(user.sub_id, user, expires_at=time.time() + self._user_local_ttl)
+        try:
+            self.redis.set(self.get_user_key(user.sub_id), user.json(), ex=self._user_redis_ttl)
+        except RedisError:
+            self.logger.warning(f'User for {user.sub_id} could not be added to Redis', exc_info=True)
+
+    def invalidate_user_cache_entry(self, *sub_id: str) -> None:
+        sub_ids = set(sub_id)
+        if not sub_ids:
+            return
+
+        def invalidate() -> None:
+            for s in sub_ids:
+                self._user_local_cache.pop(s)
+            try:
+                self.redis.delete(*[self.get_user_key(s) for s in sub_ids])
+            except RedisError:
+                # Entries expire with the Redis TTL, writes must not fail on a Redis outage
+                self.logger.warning(f'Users for {", ".join(sub_ids)} could not be invalidated in Redis',
+                                    exc_info=True)
+
+        invalidate()
+        # Invalidate again on commit, a concurrent reader may cache the old row until then
+        TransactionHooks.after_commit(self.session, lambda: EventLoopManager.offload(invalidate))
@@ -0,0 +1,39 @@
+"""composite query indexes
+
+Revision ID: cd84ea3d750a
+Revises: 5b527b51d4ec
+Create Date: 2026-10-18 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cd84ea3d750a'
+down_revision = '5b527b51d4ec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('todo', schema=None) as batch_op:
+        batch_op.create_index('ix_todo_user_id_created_date', ['user_id', 'created_date'], unique=False)
+        batch_op.create_index('ix_todo_status_id_valid_until', ['status_id', 'valid_until'], unique=False)
+
+    with op.batch_alter_table('todolist', schema=None) as batch_op:
+        batch_op.create_index('ix_todolist_user_id_created_date', ['user_id', 'created_date'], unique=False)
+
+
+def downgrade():
+    # MySQL drops the implicit foreign key indexes of user_id and status_id once the composite indexes cover them,
+    # foreign keys need their own indexes before the composite indexes are dropped
+    with op.batch_alter_table('todolist', schema=None) as batch_op:
+        batch_op.create_index('ix_todolist_user_id', ['user_id'], unique=False)
+        batch_op.drop_index('ix_todolist_user_id_created_date')
+
+    with op.batch_alter_table('todo', schema=None) as batch_op:
+        batch_op.create_index('ix_todo_user_id', ['user_id'], unique=False)
+        batch_op.create_index('ix_todo_status_id', ['status_id'], unique=False)
+        batch_op.drop_index('ix_todo_status_id_valid_until')
+        batch_op.drop_index('ix_todo_user_id_created_date')
@@ -0,0 +1,70 @@
+"""compact uuid keys
+
+Revision ID: 8f2d61c4b7a9
+Revises: cd84ea3d750a
+Create Date: 2026-10-18 10:00:00.000000+00:00
+
+"""
+from typing import Any, Dict, List, Tuple
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2d61c4b7a9'
+down_revision = 'cd84ea3d750a'
+branch_labels = None
+depends_on = None
+
+# UUID columns of tables, primary keys and the foreign keys referencing them
+_uuid_columns = {
+    'user': ['id'],
+    'todolist': ['id', 'user_id'],
+    'todo': ['id', 'user_id', 'todo_list_id'],
+}
+
+
+def upgrade():
+    foreign_keys = _drop_foreign_keys()
+    for table, columns in _uuid_columns.items():
+        # Binary strings keep the bytes of the UUID strings until they are converted
+        _modify_columns(table, columns, 'VARBINARY(36)')
+        op.execute(f'UPDATE `{table}` SET ' +
+                   ', '.join(f"`{c}` = UNHEX(REPLACE(`{c}`, '-', ''))" for c in columns))
+        _modify_columns(table, columns, 'BINARY(16)')
+    _create_foreign_keys(foreign_keys)
+
+
+def downgrade():
+    foreign_keys = _drop_foreign_keys()
+    for table, columns in _uuid_columns.items():
+        _modify_columns(table, columns, 'VARBINARY(36)')
+        # 8-4-4-4-12 groups of the hex digits, inserted from the end so the positions do not shift
+        op.execute(f'UPDATE `{table}` SET ' +
+                   ', '.join(f"`{c}` = LOWER(INSERT(INSERT(INSERT(INSERT(HEX(`{c}`), 21, 0, '-'), 17, 0, '-'), "
+                             f"13, 0, '-'), 9, 0, '-'))" for c in columns))
+        _modify_columns(table, columns, 'VARCHAR(36)')
+    _create_foreign_keys(foreign_keys)
+
+
+def _modify_columns(table: str, columns: List[str], column_type: str) -> None:
+    op.execute(f'ALTER TABLE `{table}` ' + ', '.join(f'MODIFY `{c}` {column_type} NOT NULL' for c in columns))
+
+
+def _drop_foreign_keys() -> List[Tuple[str, Dict[str, Any]]]:
+    # Foreign keys of earlier revisions have generated names, they are looked up
+    inspector = sa.inspect(op.get_bind())
+    foreign_keys = []
+    for table in _uuid_columns:
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key['referred_table'] in _uuid_columns:
+                op.drop_constraint(foreign_key['name'], table, type_='foreignkey')
+                foreign_keys.append((table, foreign_key))
+    return foreign_keys
+
+
+def _create_foreign_keys(foreign_keys: List[Tuple[str, Dict[str, Any]]]) -> None:
+    for table, foreign_key in foreign_keys:
+        op.create_foreign_key(foreign_key['name'], table, foreign_key['referred_table'],
+                              foreign_key['constrained_columns'], foreign_key['referred_columns'])
@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from src.profiling.request_timer_manager import session_request_timer
+
+logger = logging.getLogger(__name__)
+
+
+class DBPoolMetrics:
+    """
+    Process-wide checkout counters of a connection pool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_checkout(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            if timed_out:
+                self.timeouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pool_size': pool.size(),
+                'pool_checked_out': pool.checkedout(),
+                'pool_checked_in': pool.checkedin(),
+                'pool_overflow': pool.overflow(),
+                'pool_checkouts': self.checkouts,
+                'pool_timeouts': self.timeouts,
+                'pool_wait_total': self.wait_total,
+                'pool_wait_max': self.wait_max,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that measures the time spent waiting for a connection.
+
+    Waits are reported to the request timer as 'db_pool_checkout' with the pool state at checkout,
+    and timeouts are logged with a snapshot of the pool metrics.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = DBPoolMetrics()
+
+    def _do_get(self) -> Any:
+        request_timer_context = None
+        if request_timer := session_request_timer():
+            request_timer_context = request_timer('db_pool_checkout',
+                                                  pool_checked_out=self.checkedout(),
+                                                  pool_overflow=self.overflow())
+            request_timer_context.open()
+
+        start_time = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - start_time, timed_out=True)
+            logger.warning('DB connection pool checkout timed out.', extra=self.metrics.snapshot(self))
+            raise
+        finally:
+            if request_timer_context:
+                request_timer_context.close()
+
+        self.metrics.record_checkout(time.perf_counter() - start_time)
+        return connection
+
+    def recreate(self) -> 'InstrumentedQueuePool':
+        pool: InstrumentedQueuePool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
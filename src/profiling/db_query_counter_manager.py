@@ -1,4 +1,4 @@
-import threading
+from contextvars import ContextVar
 from typing import Any, Optional
 
 from flask import Flask, request
@@ -6,7 +6,8 @@ from flask import Flask, request
 from src.config import app_config_manager
 from src.profiling.db_query_counter import DBQueryCounter
 
-_thread_local = threading.local()
+# Context variables are isolated per thread, and per greenlet of cooperative workers
+_query_counter: ContextVar[Optional[DBQueryCounter]] = ContextVar('query_counter', default=None)
 
 
 class DBQueryCounterManager:
@@ -22,19 +23,16 @@ class DBQueryCounterManager:
     @staticmethod
     def create_query_counter(name: str, **kwargs: Any) -> DBQueryCounter:
         counter = DBQueryCounter(name, **kwargs)
-        _thread_local.query_counter = counter
+        _query_counter.set(counter)
         return counter
 
     @staticmethod
     def get_query_counter() -> Optional[DBQueryCounter]:
-        return getattr(_thread_local, 'query_counter', None)
+        return _query_counter.get()
 
     @staticmethod
     def remove_query_counter() -> None:
-        try:
-            delattr(_thread_local, 'query_counter')
-        except AttributeError:
-            pass
+        _query_counter.set(None)
 
     @staticmethod
     def _start_flask_query_counting() -> None:
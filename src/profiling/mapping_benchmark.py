@@ -0,0 +1,56 @@
+"""
+Compare the validating and the trusted mapping of rows and cache entries to domain models.
+
+Usage: python -m src.profiling.mapping_benchmark [rows] [repeat]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from src.domain.todo.entity.todo import Todo
+from src.domain.todo_list.entity.todo_list import TodoList
+
+
+def _create_rows(count: int) -> List[Any]:
+    todo_list = TodoList.create('benchmark', 'benchmark-user')
+    return [SimpleNamespace(**Todo.create(f'todo {i}', 'description', datetime.utcnow() + timedelta(days=1),
+                                          todo_list.user_id, todo_list.id).dict())
+            for i in range(count)]
+
+
+def _measure(name: str, func: Callable[[], Any], count: int, repeat: int) -> Dict[str, Any]:
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    return {'name': name, 'total_ms': round(best * 1000, 3), 'per_row_us': round(best / count * 1e6, 3)}
+
+
+def run(count: int = 1000, repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    :param count: Number of rows mapped in a measurement
+    :param repeat: Number of measurements, the best one is reported
+    :return: Timing of each mapping
+    """
+    rows = _create_rows(count)
+    entries = [Todo.from_orm(row).json() for row in rows]
+    todo_list = SimpleNamespace(**TodoList.create('benchmark', 'benchmark-user').dict(exclude={'todos'}),
+                                todos=rows)
+    todo_list_entry = TodoList.from_orm(todo_list).json()
+
+    return [
+        _measure('rows from_orm', lambda: [Todo.from_orm(row) for row in rows], count, repeat),
+        _measure('rows from_orm_trusted', lambda: [Todo.from_orm_trusted(row) for row in rows], count, repeat),
+        _measure('cache parse_raw', lambda: [Todo.parse_raw(entry) for entry in entries], count, repeat),
+        _measure('cache parse_raw_trusted', lambda: [Todo.parse_raw_trusted(entry) for entry in entries],
+                 count, repeat),
+        _measure('nested from_orm', lambda: TodoList.from_orm(todo_list), count, repeat),
+        _measure('nested from_orm_trusted', lambda: TodoList.from_orm_trusted(todo_list), count, repeat),
+        _measure('nested parse_raw', lambda: TodoList.parse_raw(todo_list_entry), count, repeat),
+        _measure('nested parse_raw_trusted', lambda: TodoList.parse_raw_trusted(todo_list_entry), count, repeat),
+    ]
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    for result in run(*args):
+        print(f"{result['name']:<28}{result['total_ms']:>12} ms{result['per_row_us']:>12} us/row")
@@ -119,6 +119,8 @@ class _RequestTimerStack:
 
 
 class RequestTimer:
+    # Process-wide metrics logged with slow requests, keys are prefixed by the callback name
+    __metrics_callbacks: Dict[str, Callable[[], Dict[str, Any]]] = dict()
 
     def __init__(self, name: str, **kwargs: Any) -> None:
         self.name = name
@@ -143,6 +145,17 @@ class RequestTimer:
         self.stack.append(context)
         return context
 
+    @staticmethod
+    def add_metrics_callback(name: str, callback: Callable[[], Dict[str, Any]]) -> None:
+        RequestTimer.__metrics_callbacks[name] = callback
+
+    @staticmethod
+    def collect_metrics() -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {}
+        for name, callback in RequestTimer.__metrics_callbacks.items():
+            metrics.update({f'{name}_{key}': value for key, value in callback().items()})
+        return metrics
+
     def _opened(self) -> int:
         self._context_index += 1
         return self._context_index
@@ -171,8 +184,9 @@ class RequestTimer:
             # no need to log
             return
         try:
+            metrics = RequestTimer.collect_metrics()
             for log in self.stack.logs():
                 self.time_logger_adapter.warning(f'High response time for timer {self.name}',
-                                                 extra=log)
+                                                 extra={**log, **metrics})
         except:
             logger.error('Request timer error occurred.', exc_info=True)
@@ -1,12 +1,13 @@
-import threading
-from typing import Any, Dict, Optional, Union
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Union
 
 from flask import Flask, request, g, has_app_context
 
 from src.config import app_config_manager
 from src.profiling.request_timer import RequestTimer, _RequestTimerContext, _MockTimerContext
 
-_thread_local = threading.local()
+# Context variables are isolated per thread, and per greenlet of cooperative workers
+_request_timer: ContextVar[Optional[RequestTimer]] = ContextVar('request_timer', default=None)
 
 
 class RequestTimerManager:
@@ -21,14 +22,24 @@ class RequestTimerManager:
             app.before_request(RequestTimerManager._start_flask_request_timing)
             app.teardown_request(RequestTimerManager._end_flask_request_timing)
 
+    @staticmethod
+    def add_metrics_callback(name: str, callback: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Register process-wide metrics, like cache or pool counters, logged with the slow requests.
+
+        :param name: Prefix of the metric keys
+        :param callback: Returns the current metrics
+        """
+        RequestTimer.add_metrics_callback(name, callback)
+
     @staticmethod
     def get_request_timer() -> Optional[RequestTimer]:
-        return getattr(_thread_local, 'request_timer', None)
+        return _request_timer.get()
 
     @staticmethod
     def create_request_timer(name: str, **kwargs: Any) -> RequestTimer:
         timer = RequestTimer(name, **kwargs)
-        _thread_local.request_timer = timer
+        _request_timer.set(timer)
         return timer
 
     @staticmethod
@@ -41,10 +52,7 @@ class RequestTimerManager:
 
     @staticmethod
     def remove_request_timer() -> None:
-        try:
-            delattr(_thread_local, 'request_timer')
-        except AttributeError:
-            pass
+        _request_timer.set(None)
 
     @staticmethod
     def _init_gunicorn_hooks() -> None:
@@ -1,3 +1,5 @@
+from typing import List
+
 from src.infrastructure.manager.mail_sender_manager import MailSenderManager
 
 
@@ -7,3 +9,9 @@ class MailWorkerService:
     def send_expired_mail(name: str, email: str) -> None:
         # Create an email body
         MailSenderManager.send_mail(recipient=email, name=name)
+
+    @staticmethod
+    def send_expired_digest_mail(email: str, titles: List[str]) -> None:
+        # Create a single email body listing all expired todos
+        body = '\n'.join([f'{len(titles)} of your todos expired:'] + [f'- {title}' for title in titles])
+        MailSenderManager.send_mail(recipient=email, titles=titles, body=body)
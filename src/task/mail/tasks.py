@@ -1,3 +1,5 @@
+from typing import List
+
 from src.task.mail.mail_worker_service import MailWorkerService
 from src.task.task_lock import TaskLock
 from src.worker import celery
@@ -6,3 +8,8 @@ from src.worker import celery
 @celery.task()
 def send_expired_mail(name: str, email: str) -> None:
     MailWorkerService.send_expired_mail(name, email)
+
+
+@celery.task()
+def send_expired_digest_mail(email: str, titles: List[str]) -> None:
+    MailWorkerService.send_expired_digest_mail(email, titles)
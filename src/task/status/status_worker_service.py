@@ -1,14 +1,95 @@
-from typing import List, Any, Tuple, Optional
+import logging
+import os
+from typing import List, Tuple, Optional, Dict, Iterable, Iterator
 
+from src.api.helpers.orm_event_manager import OrmEventManager
+from src.api.services.todo_worker_service import TodoWorkerService
+from src.config import worker_config_manager
 from src.domain.todo.entity.todo import Todo
 from src.domain.user.entity.user import User
 from src.infrastructure.client.todo_api_client import TodoApiClient
+from src.infrastructure.manager.db_manager import DBManager
+from src.infrastructure.manager.uow_manager import UOWManager
+from src.infrastructure.repository.base.transaction_hooks import TransactionHooks
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
 
 todo_api_client = TodoApiClient()
 
 
 class StatusWorkerService:
+    logger = logging.getLogger(__name__)
+
+    __uow: Optional[UnitOfWork] = None
+    __uow_pid: Optional[int] = None
+
+    @classmethod
+    def iter_expired_todos(cls) -> Iterator[Tuple[Todo, User]]:
+        """
+        Update expired todos in process in db mode, or by the API.
+        The API is used as a fallback if the database cannot be used,
+        it continues with the todos that are not expired in the database yet.
+
+        :return: Expired todos and owner users, yielded as they are committed
+        """
+        if worker_config_manager.get_config().STATUS_WORKER_MODE == 'db':
+            try:
+                yield from cls.__iter_expired_todos_in_db()
+                return
+            except Exception:
+                cls.logger.error('Expired todos could not be updated in DB, using API.', exc_info=True)
+        yield from todo_api_client.iter_expired_todos()
+
+    @classmethod
+    def __iter_expired_todos_in_db(cls) -> Iterator[Tuple[Todo, User]]:
+        uow = cls.__get_uow()
+        try:
+            # Cache and expiry index hooks of the API run on commits of the worker as well
+            with UOWManager.use_uow(uow):
+                yield from TodoWorkerService(uow).iter_expired_todos()
+        finally:
+            uow.close()
+
+    @classmethod
+    def __get_uow(cls) -> UnitOfWork:
+        # Connections must not be shared with the parent of the worker pool, create the engine after fork
+        if cls.__uow is None or cls.__uow_pid != os.getpid():
+            cls.__uow = UnitOfWork(scoped_session_factory=DBManager._create_session_factory())
+            cls.__uow_pid = os.getpid()
+
+            TransactionHooks.init()
+            OrmEventManager.init()
+        return cls.__uow
 
     @staticmethod
-    def update_expired_todos() -> Optional[List[Tuple[Todo, User]]]:
-        return todo_api_client.update_expired_todos()
+    def iter_expired_digests(todo_user_list: Iterable[Tuple[Todo, User]],
+                             max_todos: int,
+                             max_buffered_todos: int) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Group expired todos by owner to send one digest per user, while the todos are read.
+
+        :param todo_user_list: Expired todos and owner users
+        :param max_todos: Maximum todos of a digest, a digest is yielded once it is full
+        :param max_buffered_todos: Maximum todos held in memory, all digests are yielded once it is reached
+        :return: Email and todo titles of each digest
+        """
+        titles_by_email: Dict[str, List[str]] = {}
+        buffered_todos = 0
+        try:
+            for todo, user in todo_user_list:
+                titles = titles_by_email.setdefault(user.email, [])
+                titles.append(todo.title)
+                buffered_todos += 1
+
+                if len(titles) >= max_todos:
+                    yield user.email, titles_by_email.pop(user.email)
+                    buffered_todos -= len(titles)
+                elif buffered_todos >= max_buffered_todos:
+                    yield from titles_by_email.items()
+                    titles_by_email = {}
+                    buffered_todos = 0
+        except Exception:
+            # Todos read before the failure are already expired, their digests are still sent
+            yield from titles_by_email.items()
+            raise
+
+        yield from titles_by_email.items()
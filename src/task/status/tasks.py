@@ -1,9 +1,9 @@
 import logging
 
 from src.task.status.status_worker_service import StatusWorkerService
-from src.task.mail.tasks import send_expired_mail
+from src.task.mail.tasks import send_expired_digest_mail
 from src.task.task_lock import TaskLock
-from src.worker import celery
+from src.worker import celery, configuration
 
 
 logger = logging.getLogger(__name__)
@@ -11,12 +11,14 @@ logger = logging.getLogger(__name__)
 
 @celery.task(base=TaskLock)
 def update_expired_todos() -> None:
-    todo_user_list = StatusWorkerService.update_expired_todos()
-    if not todo_user_list:
+    # Digests are sent while expired todos are read, the whole list is not held in memory
+    digests = StatusWorkerService.iter_expired_digests(StatusWorkerService.iter_expired_todos(),
+                                                       configuration.MAIL_DIGEST_MAX_TODOS,
+                                                       configuration.MAIL_DIGEST_MAX_BUFFERED_TODOS)
+    digest_count = 0
+    for email, titles in digests:
+        send_expired_digest_mail.delay(email, titles)
+        digest_count += 1
+
+    if not digest_count:
         logger.info('No expired todo found.')
-        return
-
-    for todo, user in todo_user_list:
-        send_expired_mail.delay(todo.title, user.email)
-
-
@@ -1,17 +1,54 @@
 import logging
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime
 from celery import current_app
 
-from typing import Any
+from typing import Any, Optional, Tuple, Dict
+
+from redis.exceptions import LockError
+from redis.lock import Lock
+
+
+class _LockHeartbeat(threading.Thread):
+    """
+    Extends the TTL of a lock periodically while the task holding it runs.
+    The lock expires soon after the worker dies, instead of blocking the task for a fixed long TTL.
+    """
+
+    def __init__(self, lock: Lock, interval: float) -> None:
+        super().__init__(name=f'heartbeat:{lock.name}', daemon=True)
+        self.lock = lock
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.lock.reacquire()
+            except LockError:
+                logging.warning(f'Lock {self.lock.name} is lost, it could not be extended.')
+                return
+            except Exception:
+                # Retry on the next beat, the lock lives a TTL after the last extension
+                logging.warning(f'Lock {self.lock.name} could not be extended.', exc_info=True)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
 
 
 class TaskLock(current_app.Task):
     """
-    Celery task base implementation to avoid concurrent task execution by task values
+    Celery task base implementation to avoid concurrent task execution by task values.
+
+    A task is not enqueued while the same task is queued or running, and it is dropped at execution
+    if the same task is running. Tasks of this base must not retry themselves, retries would be dropped.
     """
 
     abstract = True
-    default_ttl = 10 * 60  # 10 minutes
+    default_ttl = 60  # seconds, TTL of the lock of a running task, extended by the heartbeat
+    heartbeat_interval = 20  # seconds, must be shorter than default_ttl
+    enqueue_ttl = 10 * 60  # seconds, a queued task that is lost blocks enqueueing at most this long
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super(TaskLock, self).__init__(*args, **kwargs)
@@ -21,21 +58,53 @@ class TaskLock(current_app.Task):
         kwargs_key = ['{}:{}'.format(k, str(v)) for k, v in sorted(kwargs.items())]
         return '_'.join([self.name] + args_key + kwargs_key)
 
+    def apply_async(self,
+                    args: Optional[Tuple[Any, ...]] = None,
+                    kwargs: Optional[Dict[str, Any]] = None,
+                    **options: Any) -> Any:
+        cache_key = self.__generate_lock_cache_key(*(args or ()), **(kwargs or {}))
+        lock_key = f'lock_task:{cache_key}'
+        enqueue_key = f'enqueued_task:{cache_key}'
+        from src.infrastructure.manager.redis_manager import RedisManager
+        redis_instance = RedisManager.get_redis()
+
+        if redis_instance.exists(lock_key) or not redis_instance.set(
+                name=enqueue_key,
+                value=datetime.now().isoformat(),
+                ex=self.enqueue_ttl,
+                nx=True):
+            logging.info(f'Task {self.name} is not enqueued, '
+                         f'because the same task is already queued or running.')
+            return None
+
+        try:
+            return super().apply_async(args, kwargs, **options)
+        except Exception:
+            redis_instance.delete(enqueue_key)
+            raise
+
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
-        lock_key = f'lock_task:{self.__generate_lock_cache_key(*args, **kwargs)}'
+        cache_key = self.__generate_lock_cache_key(*args, **kwargs)
         from src.infrastructure.manager.redis_manager import RedisManager
         redis_instance = RedisManager.get_redis()
-        locked = redis_instance.set(
-            name=lock_key,
-            value=datetime.now().isoformat(),
-            ex=timedelta(minutes=self.default_ttl),
-            nx=True)
+        # The heartbeat extends the lock from another thread, the lock token must not be thread local
+        lock = redis_instance.lock(f'lock_task:{cache_key}', timeout=self.default_ttl, thread_local=False)
+        locked = lock.acquire(blocking=False)
+
+        # The task is not queued anymore, it is either running or dropped
+        redis_instance.delete(f'enqueued_task:{cache_key}')
 
         if locked:
+            heartbeat = _LockHeartbeat(lock, self.heartbeat_interval)
+            heartbeat.start()
             try:
                 return self.run(*args, **kwargs)
             finally:
-                redis_instance.delete(lock_key)
+                heartbeat.stop()
+                try:
+                    lock.release()
+                except LockError:
+                    logging.warning(f'Lock of task {self.name} is expired.')
         else:
             logging.info(f'Task {self.name} could not be started, '
                          f'because there is another worker which does the same task.')
@@ -49,10 +49,13 @@ celery.conf.task_routes = [
 
 
 def __prepare_beat_schedule() -> Dict[str, Any]:
+    check_expired_todos_interval = timedelta(seconds=configuration.BEAT_CHECK_EXPIRED_TODOS_SECONDS) \
+        if configuration.BEAT_CHECK_EXPIRED_TODOS_SECONDS \
+        else timedelta(minutes=configuration.BEAT_CHECK_EXPIRED_TODOS_INTERVAL)
     schedule: Dict[str, Any] = {
         'beat_check_expired_todos': {
             'task': 'src.task.beats.beat_check_expired_todos',
-            'schedule': timedelta(minutes=configuration.BEAT_CHECK_EXPIRED_TODOS_INTERVAL),
+            'schedule': check_expired_todos_interval,
             'options': {'expires': configuration.EXPIRE_TIME_OF_TASKS}
         }
     }
@@ -59,6 +59,8 @@ def db_session() -> Generator[Session, Any, None]:
     yield _session_transaction
     if _session_transaction.is_active:
         _session_transaction.rollback()
+    # Tests without the fixture use the sessions of the unit of work
+    uow._session_transactions.remove(_session_transaction)
 
 
 @pytest.fixture(scope='function')
@@ -0,0 +1,37 @@
+import uuid
+
+from pytest_mock import MockerFixture
+
+from src.domain.common.factory.uuid import id_factory
+
+
+class TestIdFactory:
+
+    def test_version_and_variant(self):
+        for _ in range(100):
+            todo_id = uuid.UUID(id_factory())
+
+            assert todo_id.version == 7
+            assert todo_id.variant == uuid.RFC_4122
+
+    def test_timestamp_prefix(self, mocker: MockerFixture):
+        timestamp_ms = 1_760_780_000_123
+        mocker.patch('src.domain.common.factory.uuid.time.time_ns', return_value=timestamp_ms * 1_000_000 + 999_999)
+
+        todo_id = uuid.UUID(id_factory())
+
+        # The first 48 bits are the milliseconds since the epoch
+        assert todo_id.int >> 80 == timestamp_ms
+
+    def test_ids_ordered_across_milliseconds(self, mocker: MockerFixture):
+        timestamps_ns = [(1_760_780_000_000 + ms) * 1_000_000 for ms in range(0, 50, 5) for _ in range(10)]
+        mocker.patch('src.domain.common.factory.uuid.time.time_ns', side_effect=timestamps_ns)
+
+        ids = [id_factory() for _ in timestamps_ns]
+
+        # Ids of a later millisecond sort after all ids of the earlier ones, as strings and as bytes
+        millisecond_ids = [ids[i:i + 10] for i in range(0, len(ids), 10)]
+        for previous_ids, later_ids in zip(millisecond_ids, millisecond_ids[1:]):
+            assert max(previous_ids) < min(later_ids)
+            assert max(uuid.UUID(i).bytes for i in previous_ids) < min(uuid.UUID(i).bytes for i in later_ids)
+        assert len(set(ids)) == len(ids)
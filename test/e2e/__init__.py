@@ -1,9 +1,12 @@
+import asyncio
 from typing import Union
 
 from src.api.models.base_response import BaseResponse
 from flask import json, Response
 from werkzeug.test import TestResponse
 
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
+
 
 def get_api_url(url: str) -> str:
     return f'/api/v1{url}'
@@ -12,3 +15,13 @@ def get_api_url(url: str) -> str:
 def get_base_response(response: Union[Response, TestResponse]) -> BaseResponse:
     response_json = json.loads(response.data)
     return BaseResponse(**response_json)
+
+
+def wait_background_tasks() -> None:
+    """
+    Wait for the commit hooks of the async serving mode, they run in the background of the event loop.
+    """
+    async def wait() -> None:
+        await asyncio.gather(*EventLoopManager._EventLoopManager__background_tasks)  # type: ignore
+
+    EventLoopManager.run(wait())
@@ -1,5 +1,16 @@
+from typing import Any, Generator
+
 import pytest
 from flask import Flask
+from pytest_mock import MockerFixture
+from sqlalchemy import delete, select
+
+from src.config import app_config_manager
+from src.infrastructure.entity.todo.todo import Todo
+from src.infrastructure.entity.todo_list.todo_list import TodoList
+from src.infrastructure.manager.uow_manager import UOWManager
+from test import test_user_email
+from test.e2e import wait_background_tasks
 
 
 @pytest.fixture(scope='session')
@@ -8,3 +19,22 @@ def client(app: Flask):
     with app.test_client() as test_client:
         with app.app_context():
             yield test_client
+
+
+@pytest.fixture(scope='function')
+def async_mode(mocker: MockerFixture) -> Generator[None, Any, None]:
+    mocker.patch.object(app_config_manager.get_config(), 'API_ASYNC_MODE', True)
+    yield
+    wait_background_tasks()
+
+    # Async services commit on their own connections, their rows are deleted instead of rolled back
+    uow = UOWManager.get_uow()
+    user = uow.users.get_by_email(test_user_email)
+    with uow:
+        todo_ids = uow.session().scalars(select(Todo.id).where(Todo.user_id == user.id)).all()
+        uow.session().execute(delete(Todo).where(Todo.user_id == user.id))
+        uow.session().execute(delete(TodoList).where(TodoList.user_id == user.id))
+    if todo_ids:
+        uow.todos.redis.delete(*[uow.todos.get_todo_key(todo_id) for todo_id in todo_ids])
+        uow.todos.remove_from_todo_expiry_index(*todo_ids)
+    uow.todo_lists.invalidate_redis_entry(user.id)
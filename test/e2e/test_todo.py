@@ -1,20 +1,28 @@
 import uuid
+from typing import Any, Dict
 
 import pytest
 
 from datetime import datetime, timedelta
 from flask.testing import FlaskClient
 from http import HTTPStatus
+from pytest_mock import MockerFixture
 
+from src.api.helpers.orm_event_manager import OrmEventManager
 from src.api.security.guards import todo_scope, worker_scope
+from src.api.services.todo_api_service import TodoApiService
+from src.config import app_config_manager
 from src.domain.common.error.authentication_errors import PermissionDeniedError
+from src.domain.common.error.pagination_errors import InvalidCursorError
 from src.domain.todo.entity.todo import Todo
 from src.domain.todo.entity.todo_status import TodoStatuses
 from src.domain.todo_list.entity.todo_list import TodoList
 from src.domain.todo_list.entity.todo_list_status import TodoListStatuses
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
+from src.infrastructure.manager.redis_manager import RedisManager
 from src.infrastructure.repository.base.unit_of_work import UnitOfWork
 from test import test_user_email
-from test.e2e import get_api_url, get_base_response
+from test.e2e import get_api_url, get_base_response, wait_background_tasks
 from test.fakes.fake_authenticator import fake_permission
 
 
@@ -122,6 +130,53 @@ class TestTodoController:
         assert base_response.message == "Todo obtained."
         assert len(base_response.data) == 2
 
+    @fake_permission(todo_scope.read)  # Set token with read permission
+    def test_get_all_todos_paginated_case(self, client: FlaskClient):
+        response = client.get(get_api_url('/todo'))
+        all_todo_ids = [todo['id'] for todo in get_base_response(response).data]
+
+        todo_ids = []
+        next_cursor = None
+        while True:
+            params = {'page_size': 1, 'cursor': next_cursor} if next_cursor else {'page_size': 1}
+            response = client.get(get_api_url('/todo'), query_string=params)
+            base_response = get_base_response(response)
+
+            assert base_response.success
+            assert response.status_code == HTTPStatus.OK
+            assert len(base_response.data) <= 1
+
+            todo_ids.extend(todo['id'] for todo in base_response.data)
+            if not (next_cursor := base_response.next_cursor):
+                break
+
+        assert len(all_todo_ids) > 1
+        assert todo_ids == all_todo_ids
+
+    @fake_permission(todo_scope.read)  # Set token with read permission
+    def test_get_all_todos_stream_case(self, client: FlaskClient):
+        response = client.get(get_api_url('/todo'))
+        all_todo_ids = [todo['id'] for todo in get_base_response(response).data]
+
+        response = client.get(get_api_url('/todo'), query_string={'stream': 1})
+        # Reading the body buffers the response
+        assert response.is_streamed
+        base_response = get_base_response(response)
+
+        assert base_response.success
+        assert response.status_code == HTTPStatus.OK
+        assert base_response.message == "Todo obtained."
+        assert [todo['id'] for todo in base_response.data] == all_todo_ids
+
+    @fake_permission(todo_scope.read)  # Set token with read permission
+    def test_get_all_todos_invalid_cursor(self, client: FlaskClient):
+        response = client.get(get_api_url('/todo'), query_string={'cursor': 'invalid'})
+        base_response = get_base_response(response)
+
+        assert not base_response.success
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert base_response.code == InvalidCursorError.code
+
     @fake_permission(todo_scope.read)  # Set token with read permission
     def test_get_todo_not_available_case(self, client: FlaskClient):
         todo_id = str(uuid.uuid4())
@@ -132,6 +187,17 @@ class TestTodoController:
         assert response.status_code == HTTPStatus.BAD_REQUEST
         assert base_response.message == 'Invalid todo.'
 
+    @fake_permission(todo_scope.read)  # Set token with read permission
+    def test_get_todo_async_mode_not_available_case(self, client: FlaskClient, mocker: MockerFixture):
+        mocker.patch.object(app_config_manager.get_config(), 'API_ASYNC_MODE', True)
+        todo_id = str(uuid.uuid4())
+        response = client.get(get_api_url(f'/todo/{todo_id}'))
+        base_response = get_base_response(response)
+
+        assert not base_response.success
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert base_response.message == 'Invalid todo.'
+
     @fake_permission(todo_scope.read)  # Set token with read permission
     def test_get_todo_available_case(self, client: FlaskClient, uow: UnitOfWork):
         user = uow.users.get_by_email(test_user_email)
@@ -158,6 +224,29 @@ class TestTodoController:
         assert base_response.data['user_id'] == todo.user_id
         assert base_response.data['status_id'] == todo.status_id
 
+    @fake_permission(todo_scope.read)  # Set token with read permission
+    def test_get_todo_lazy_expired_case(self, client: FlaskClient, uow: UnitOfWork):
+        user = uow.users.get_by_email(test_user_email)
+        todo_list = uow.todo_lists.all()[0]
+
+        todo = Todo.create("title", "description", datetime.utcnow() - timedelta(hours=1), user.id, todo_list.id)
+        uow.todos.insert(todo)
+
+        response = client.get(get_api_url(f'/todo/{todo.id}'))
+        base_response = get_base_response(response)
+
+        assert base_response.success
+        assert response.status_code == HTTPStatus.OK
+        assert base_response.data['expired']
+
+        # Expiry is evaluated at read time, the status stays open until the sweep persists it
+        assert base_response.data['status_id'] == TodoStatuses.open.id
+        assert uow.todos.get(todo.id).status_id == TodoStatuses.open.id
+
+        response = client.get(get_api_url('/todo'))
+        base_response = get_base_response(response)
+        assert next(t for t in base_response.data if t['id'] == todo.id)['expired']
+
     @fake_permission(todo_scope.write)  # Set token with write permission
     def test_update_todo_not_exist(self, client: FlaskClient, uow: UnitOfWork):
         todo_id = str(uuid.uuid4())
@@ -275,3 +364,142 @@ class TestTodoController:
         assert db_todo.status == TodoStatuses.deleted
         assert db_todo.user_id == todo.user_id
         assert db_todo.title == todo.title
+
+
+@pytest.mark.usefixtures('client', 'async_mode')
+class TestTodoControllerAsyncMode:
+
+    @staticmethod
+    def _create_todo(client: FlaskClient, todo_list_id: str, title: str = 'async_todo') -> Dict[str, Any]:
+        response = client.post(
+            get_api_url('/todo'),
+            json={
+                'title': title,
+                'description': 'description',
+                'valid_until': (datetime.utcnow() + timedelta(days=7)).date().strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'todo_list_id': todo_list_id
+            })
+        assert response.status_code == HTTPStatus.CREATED
+        return get_base_response(response).data
+
+    @staticmethod
+    def _create_todo_list(client: FlaskClient) -> str:
+        response = client.post(get_api_url('/todo_list'), json={'name': 'async_todo_list'})
+        assert response.status_code == HTTPStatus.CREATED
+        return get_base_response(response).data['id']
+
+    @staticmethod
+    def _get_todo(client: FlaskClient, todo_id: str) -> Any:
+        # Commit hooks update the cached todo in the background
+        wait_background_tasks()
+        return client.get(get_api_url(f'/todo/{todo_id}'))
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_create_todo_success(self, client: FlaskClient):
+        todo = self._create_todo(client, self._create_todo_list(client))
+
+        response = self._get_todo(client, todo['id'])
+        base_response = get_base_response(response)
+
+        assert base_response.success
+        assert base_response.data['title'] == 'async_todo'
+        assert base_response.data['status_id'] == TodoStatuses.open.id
+        assert not base_response.data['expired']
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_update_todo_success_case(self, client: FlaskClient):
+        todo_list_id = self._create_todo_list(client)
+        todo = self._create_todo(client, todo_list_id)
+
+        response = client.put(
+            get_api_url(f'/todo/{todo["id"]}'),
+            json={
+                'title': 'async_todo_changed',
+                'description': 'description',
+                'valid_until': (datetime.utcnow() + timedelta(days=7)).date().strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'todo_list_id': todo_list_id,
+                'status_id': TodoStatuses.closed.id
+            })
+        assert get_base_response(response).success
+        assert response.status_code == HTTPStatus.OK
+
+        base_response = get_base_response(self._get_todo(client, todo['id']))
+        assert base_response.data['title'] == 'async_todo_changed'
+        assert base_response.data['status_id'] == TodoStatuses.closed.id
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_delete_todo_success_case(self, client: FlaskClient):
+        todo = self._create_todo(client, self._create_todo_list(client))
+
+        response = client.delete(get_api_url(f'/todo/{todo["id"]}'))
+        assert get_base_response(response).success
+        assert response.status_code == HTTPStatus.OK
+
+        response = self._get_todo(client, todo['id'])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert get_base_response(response).message == 'Invalid todo.'
+
+        response = client.delete(get_api_url(f'/todo/{todo["id"]}'))
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_get_all_todos_paginated_case(self, client: FlaskClient):
+        todo_list_id = self._create_todo_list(client)
+        created_ids = [self._create_todo(client, todo_list_id, f'async_todo_{i}')['id'] for i in range(3)]
+
+        todo_ids = []
+        next_cursor = None
+        while True:
+            params = {'page_size': 2, 'cursor': next_cursor} if next_cursor else {'page_size': 2}
+            response = client.get(get_api_url('/todo'), query_string=params)
+            base_response = get_base_response(response)
+
+            assert base_response.success
+            assert len(base_response.data) <= 2
+
+            todo_ids.extend(todo['id'] for todo in base_response.data)
+            if not (next_cursor := base_response.next_cursor):
+                break
+
+        assert sorted(todo_ids) == sorted(created_ids)
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_commit_hooks_update_redis(self, client: FlaskClient, uow: UnitOfWork):
+        user = uow.users.get_by_email(test_user_email)
+        todo_list_id = self._create_todo_list(client)
+        pages_key = uow.todo_lists.get_user_todo_list_pages_key(user.id)
+        async_redis = RedisManager.get_async_redis()
+
+        # A cached page of todo lists, it is invalidated by the writes of todos
+        client.get(get_api_url('/todo_list'))
+        wait_background_tasks()
+        assert EventLoopManager.run(async_redis.exists(pages_key))
+
+        todo = self._create_todo(client, todo_list_id)
+        wait_background_tasks()
+
+        cached_todo = EventLoopManager.run(async_redis.get(uow.todos.get_todo_key(todo['id'])))
+        assert Todo.parse_raw(cached_todo).title == 'async_todo'
+        assert EventLoopManager.run(async_redis.zscore(uow.todos.get_todo_expiry_index_key(), todo['id']))
+        assert not EventLoopManager.run(async_redis.exists(pages_key))
+
+        client.delete(get_api_url(f'/todo/{todo["id"]}'))
+        wait_background_tasks()
+
+        cached_todo = EventLoopManager.run(async_redis.get(uow.todos.get_todo_key(todo['id'])))
+        assert Todo.parse_raw(cached_todo).status_id == TodoStatuses.deleted.id
+        assert EventLoopManager.run(async_redis.zscore(uow.todos.get_todo_expiry_index_key(), todo['id'])) is None
+
+    def test_commit_hooks_do_not_block_loop(self, mocker: MockerFixture):
+        todo = Todo.create('title', None, datetime.utcnow() + timedelta(days=1), 'user_id', 'todo_list_id')
+        _spied_on_todo_committed = mocker.spy(TodoApiService, 'on_todo_committed')
+        _mocked_spawn = mocker.patch.object(EventLoopManager, 'spawn', side_effect=lambda coroutine: coroutine.close())
+
+        async def on_loop() -> None:
+            OrmEventManager._on_todos_written([todo])
+
+        EventLoopManager.run(on_loop())
+
+        # The blocking client of the sync service is not used on the loop thread
+        assert _mocked_spawn.call_count == 1
+        assert not _spied_on_todo_committed.called
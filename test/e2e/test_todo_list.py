@@ -1,16 +1,25 @@
+import asyncio
+import threading
 import pytest
 import uuid
+from typing import Any, Dict, List
+from pytest_mock import MockerFixture
 from src.api.security.guards import todo_scope
 from flask.testing import FlaskClient
 from http import HTTPStatus
 from datetime import datetime
+from src.config import app_config_manager
+from src.domain.common.error.timeout_errors import RequestTimeoutError
 from src.domain.todo.entity.todo import Todo
 from src.domain.todo.entity.todo_status import TodoStatuses
 from src.domain.todo_list.entity.todo_list import TodoList
 from src.domain.todo_list.entity.todo_list_status import TodoListStatuses
+from src.infrastructure.manager.event_loop_manager import EventLoopManager
+from src.infrastructure.manager.uow_manager import UOWManager
 from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from src.infrastructure.repository.todo_list.async_todo_list_repositories import AsyncTodoListRepository
 from test import test_user_email
-from test.e2e import get_api_url, get_base_response
+from test.e2e import get_api_url, get_base_response, wait_background_tasks
 from test.fakes.fake_authenticator import fake_permission
 
 
@@ -127,6 +136,8 @@ class TestTodoListController:
         assert base_response.data['todos'][0]['id'] == todo.id
         assert base_response.data['todos'][0]['user_id'] == todo.user_id
         assert base_response.data['todos'][0]['status_id'] == todo.status_id
+        # Valid until has passed, the expiry is reported without changing the status
+        assert base_response.data['todos'][0]['expired']
 
     @fake_permission(todo_scope.write)  # Set token with write permission
     def test_update_todo_not_exist(self, client: FlaskClient):
@@ -205,3 +216,130 @@ class TestTodoListController:
         assert db_todo_list.id == todo_list.id
         assert db_todo_list.user_id == todo_list.user_id
         assert db_todo_list.name == todo_list.name
+
+
+@pytest.mark.usefixtures('client', 'async_mode')
+class TestTodoListControllerAsyncMode:
+
+    @staticmethod
+    def _create_todo_list(client: FlaskClient, name: str = 'async_todo_list') -> str:
+        response = client.post(get_api_url('/todo_list'), json={'name': name})
+        assert response.status_code == HTTPStatus.CREATED
+        return get_base_response(response).data['id']
+
+    @staticmethod
+    def _get_todo_lists(client: FlaskClient) -> List[Dict[str, Any]]:
+        # Commit hooks invalidate the cached pages in the background
+        wait_background_tasks()
+        response = client.get(get_api_url('/todo_list'))
+        assert response.status_code == HTTPStatus.OK
+        return get_base_response(response).data
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_create_todo_list_success_case(self, client: FlaskClient):
+        assert self._get_todo_lists(client) == []
+
+        todo_list_id = self._create_todo_list(client)
+
+        todo_lists = self._get_todo_lists(client)
+        assert [todo_list['id'] for todo_list in todo_lists] == [todo_list_id]
+        assert todo_lists[0]['status_id'] == TodoListStatuses.open.id
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_update_todo_list_success_case(self, client: FlaskClient):
+        todo_list_id = self._create_todo_list(client)
+        assert self._get_todo_lists(client)[0]['name'] == 'async_todo_list'
+
+        response = client.put(
+            get_api_url(f'/todo_list/{todo_list_id}'),
+            json={
+                'name': 'async_todo_list_changed',
+                'status_id': TodoListStatuses.closed.id
+            })
+        assert get_base_response(response).success
+        assert response.status_code == HTTPStatus.OK
+
+        todo_list = self._get_todo_lists(client)[0]
+        assert todo_list['name'] == 'async_todo_list_changed'
+        assert todo_list['status_id'] == TodoListStatuses.closed.id
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_delete_todo_list_success_case(self, client: FlaskClient):
+        todo_list_id = self._create_todo_list(client)
+        assert len(self._get_todo_lists(client)) == 1
+
+        response = client.delete(get_api_url(f'/todo_list/{todo_list_id}'))
+        assert get_base_response(response).success
+        assert response.status_code == HTTPStatus.OK
+
+        assert self._get_todo_lists(client) == []
+        response = client.delete(get_api_url(f'/todo_list/{todo_list_id}'))
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @fake_permission(todo_scope.read, todo_scope.write)  # Set token with read and write permissions
+    def test_get_all_todo_lists_paginated_case(self, client: FlaskClient):
+        created_ids = [self._create_todo_list(client, f'async_todo_list_{i}') for i in range(3)]
+
+        def get_pages() -> List[str]:
+            wait_background_tasks()
+            todo_list_ids = []
+            next_cursor = None
+            while True:
+                params = {'page_size': 2, 'cursor': next_cursor} if next_cursor else {'page_size': 2}
+                response = client.get(get_api_url('/todo_list'), query_string=params)
+                base_response = get_base_response(response)
+
+                assert base_response.success
+                assert len(base_response.data) <= 2
+
+                todo_list_ids.extend(todo_list['id'] for todo_list in base_response.data)
+                if not (next_cursor := base_response.next_cursor):
+                    return todo_list_ids
+
+        assert sorted(get_pages()) == sorted(created_ids)
+        # Pages are cached, a new todo list invalidates them
+        created_ids.append(self._create_todo_list(client, 'async_todo_list_3'))
+        assert sorted(get_pages()) == sorted(created_ids)
+
+    @fake_permission(todo_scope.read)  # Set token with read permission
+    def test_timed_out_request_is_cancelled(self, client: FlaskClient, mocker: MockerFixture):
+        mocker.patch.object(app_config_manager.get_config(), 'API_ASYNC_TIMEOUT', 0.1)
+        cancelled = []
+
+        async def user_get_todo_list_with_todo(*args: Any, **kwargs: Any) -> None:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        mocker.patch.object(AsyncTodoListRepository, 'user_get_todo_list_with_todo',
+                            side_effect=user_get_todo_list_with_todo)
+
+        response = client.get(get_api_url(f'/todo_list/{uuid.uuid4()}'))
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert get_base_response(response).message == 'Request timed out. Please try later.'
+        wait_background_tasks()
+        assert cancelled == [True]
+
+    def test_cancelled_transaction_is_rolled_back(self, uow: UnitOfWork):
+        user = uow.users.get_by_email(test_user_email)
+        todo_list = TodoList.create('async_todo_list', user.id)
+        async_uow = UOWManager.get_async_uow()
+        transaction_ended = threading.Event()
+
+        async def create_todo_list() -> None:
+            try:
+                async with async_uow:
+                    async_uow.todo_lists.insert(todo_list)
+                    await async_uow.session().flush()
+                    await asyncio.sleep(5)
+            finally:
+                transaction_ended.set()
+
+        with pytest.raises(RequestTimeoutError):
+            EventLoopManager.run(create_todo_list(), timeout=0.1)
+
+        assert transaction_ended.wait(timeout=5)
+        assert uow.todo_lists.get(todo_list.id) is None
@@ -1,3 +1,4 @@
+import json
 import random
 from datetime import datetime
 from http import HTTPStatus
@@ -6,6 +7,7 @@ import pytest
 from dateutil.relativedelta import relativedelta
 from flask.testing import FlaskClient
 
+from src.api.models.base_response import BaseResponse
 from src.api.security.guards import worker_scope, todo_scope
 from src.domain.common.error.authentication_errors import PermissionDeniedError
 from src.domain.todo.entity.todo import Todo
@@ -21,6 +23,11 @@ from test.fakes.fake_authenticator import fake_permission
 @pytest.mark.usefixtures('client', 'db_session')
 class TestWorkerController:
 
+    @pytest.fixture(autouse=True)
+    def reset_expiry_index(self, uow: UnitOfWork) -> None:
+        # Rows of the rolled back test transaction are never indexed by the commit hooks, rebuild the index from it
+        uow.todos.redis.delete(uow.todos.get_todo_expiry_index_key(), uow.todos.get_todo_expiry_index_built_key())
+
     @fake_permission(todo_scope.write)  # Set token without worker permission
     def test_update_expired_todos_forbidden(self, client: FlaskClient):
         response = client.put(get_api_url('/worker/expired'))
@@ -80,3 +87,49 @@ class TestWorkerController:
         assert base_response.success
         assert response.status_code == HTTPStatus.OK
         assert len(base_response.data) == _expired_count
+
+    @fake_permission(worker_scope.worker)  # Set token with worker permission
+    def test_update_expired_todos_index_rebuild_case(self, client: FlaskClient, uow: UnitOfWork):
+        user = uow.users.get_by_email(test_user_email)
+        todo_list = uow.todo_lists.all()[0]
+
+        todo = Todo.create("title", "description", datetime.utcnow() - relativedelta(hours=1), user.id, todo_list.id)
+        uow.todos.insert(todo)
+        uow.session().flush()
+
+        # Drop the todo from the index as if it was written without events, and expire the index
+        uow.todos.remove_from_todo_expiry_index(todo.id)
+        uow.todos.redis.delete(uow.todos.get_todo_expiry_index_built_key())
+
+        response = client.put(get_api_url('/worker/expired'))
+        base_response = get_base_response(response)
+
+        assert base_response.success
+        assert response.status_code == HTTPStatus.OK
+        assert todo.id in [todo_user[0]['id'] for todo_user in base_response.data]
+        assert todo.id not in uow.todos.list_due_todo_ids(limit=100)
+
+    @fake_permission(worker_scope.worker)  # Set token with worker permission
+    def test_update_expired_todos_ndjson_case(self, client: FlaskClient, uow: UnitOfWork):
+        user = uow.users.get_by_email(test_user_email)
+        todo_list = uow.todo_lists.all()[0]
+
+        _expired_count = random.randint(5, 10)
+        for _ in range(_expired_count):
+            todo = Todo.create("title", "description", datetime.utcnow() - relativedelta(hours=1), user.id, todo_list.id)
+            uow.todos.insert(todo)
+
+        response = client.put(get_api_url('/worker/expired'), headers={'Accept': 'application/x-ndjson'})
+        # Reading the body buffers the response
+        assert response.is_streamed
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.mimetype == 'application/x-ndjson'
+        assert len(lines) == _expired_count + 1
+        assert all(todo['status_id'] == TodoStatuses.expired.id for todo, _ in lines[:-1])
+
+        # The response envelope follows the todo and user pairs
+        base_response = BaseResponse.parse_obj(lines[-1])
+        assert base_response.success
+        assert base_response.message == 'Expired todos updated.'
@@ -0,0 +1,70 @@
+import uuid
+from typing import Any, Dict, List, Tuple
+
+from src.domain.todo_list.entity.todo_list import TodoList
+from src.domain.user.entity.user import User
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+
+# Tables which must not be read with a full scan, status tables are small lookup tables
+indexed_tables = ('todo', 'todolist', 'user')
+
+
+def create_user() -> User:
+    """
+    User with a unique sub id and email, tests do not share the test user of conftest.
+    """
+    user_uuid = uuid.uuid4()
+    return User.create(f'Auth0|{user_uuid}', f'{user_uuid}@creainc.us')
+
+
+def insert_todo_list(uow: UnitOfWork, name: str) -> TodoList:
+    """
+    Insert a todo list of a new user and flush them, todos can reference both.
+    """
+    user = create_user()
+    uow.users.insert(user)
+    todo_list = TodoList.create(name, user.id)
+    uow.todo_lists.insert(todo_list)
+    uow.session().flush()
+    return todo_list
+
+
+def explain(uow: UnitOfWork, statement: str, parameters: Any) -> List[Dict[str, Any]]:
+    result = uow.session().connection().exec_driver_sql(f'EXPLAIN {statement}', parameters)
+    return [dict(row) for row in result.mappings()]
+
+
+def get_full_scans(uow: UnitOfWork, queries: List[Tuple[str, Any]]) -> List[str]:
+    """
+    Return queries that read an indexed table without any usable index.
+
+    Test tables are small, so the optimizer may still prefer a scan when an index is usable.
+    Possible keys are checked instead of the chosen access type.
+    """
+    full_scans = []
+    for statement, parameters in queries:
+        for row in explain(uow, statement, parameters):
+            if row.get('table') in indexed_tables and row.get('type') == 'ALL' and not row.get('possible_keys'):
+                full_scans.append(f'{row["table"]}: {statement}')
+    return full_scans
+
+
+def get_filesorts(uow: UnitOfWork, queries: List[Tuple[str, Any]]) -> List[str]:
+    """
+    Return queries whose order is not read from an index.
+    """
+    filesorts = []
+    for statement, parameters in queries:
+        for row in explain(uow, statement, parameters):
+            if 'Using filesort' in (row.get('Extra') or ''):
+                filesorts.append(f'{row["table"]}: {statement}')
+    return filesorts
+
+
+def get_possible_keys(uow: UnitOfWork, queries: List[Tuple[str, Any]], table: str) -> List[str]:
+    keys: List[str] = []
+    for statement, parameters in queries:
+        for row in explain(uow, statement, parameters):
+            if row.get('table') == table and row.get('possible_keys'):
+                keys.extend(row['possible_keys'].split(','))
+    return keys
@@ -0,0 +1,21 @@
+from typing import Any, Generator, List, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+
+
+@pytest.fixture(scope='function')
+def captured_queries(uow: UnitOfWork) -> Generator[List[Tuple[str, Any]], Any, None]:
+    engine = uow._scoped_session_factory.bind
+    queries: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(connection: Any, cursor: Any, statement: str, parameters: Any,
+                              context: Any, executemany: bool) -> None:
+        if statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            queries.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    yield queries
+    event.remove(engine, 'before_cursor_execute', before_cursor_execute)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import Any, List, Sequence
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src.config import app_config_manager
+from src.domain.todo.entity.todo import Todo
+from src.domain.todo.entity.todo_status import TodoStatuses
+from src.domain.todo_list.entity.todo_list import TodoList
+from src.infrastructure.entity.todo.todo import Todo as TodoEntity
+from src.infrastructure.repository.base.repository_events import RepositoryEvents
+from src.infrastructure.repository.base.transaction_hooks import TransactionHooks
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from test.repository import create_user
+
+
+@pytest.mark.usefixtures('app', 'db_session')
+class TestBulkWrites:
+
+    @staticmethod
+    def _create_todos(uow: UnitOfWork, count: int) -> List[Todo]:
+        user = create_user()
+        uow.users.insert(user)
+        todo_list = TodoList.create('bulk_todo_list', user.id)
+        # Pending rows are flushed before the rows referencing them are inserted
+        uow.todo_lists.insert(todo_list)
+        return [Todo.create(f'bulk_todo_{i}', None, datetime.utcnow() + timedelta(days=1), user.id, todo_list.id)
+                for i in range(count)]
+
+    @staticmethod
+    def _get_todos(uow: UnitOfWork, todos: Sequence[Todo]) -> List[Todo]:
+        uow.session().expire_all()
+        return sorted(uow.todos.get_many(*[todo.id for todo in todos]) or [], key=lambda todo: todo.title)
+
+    @staticmethod
+    def _run_after_commit_callbacks(uow: UnitOfWork) -> None:
+        # Callbacks run when the root transaction commits, tests roll it back
+        for callback in uow.session().info.pop(TransactionHooks._callbacks_key, []):
+            callback()
+
+    def test_bulk_insert_in_batches(self, uow: UnitOfWork, mocker: MockerFixture):
+        mocker.patch.object(app_config_manager.get_config(), 'DB_BULK_BATCH_SIZE', 2)
+        todos = self._create_todos(uow, 5)
+        uow.session().flush()
+        _spied_execute = mocker.spy(uow.session(), 'execute')
+
+        uow.todos.bulk_insert(*todos)
+
+        assert _spied_execute.call_count == 3
+        assert [todo.id for todo in self._get_todos(uow, todos)] == [todo.id for todo in todos]
+
+    def test_bulk_update(self, uow: UnitOfWork):
+        todos = self._create_todos(uow, 3)
+        uow.todos.bulk_insert(*todos)
+
+        for todo in todos:
+            todo.title = f'{todo.title}_changed'
+            todo.status_id = TodoStatuses.closed.id
+        uow.todos.bulk_update(*todos)
+
+        db_todos = self._get_todos(uow, todos)
+        assert [todo.title for todo in db_todos] == [todo.title for todo in todos]
+        assert all(todo.status_id == TodoStatuses.closed.id for todo in db_todos)
+        assert all(todo.modified_date is not None for todo in db_todos)
+
+    def test_bulk_upsert(self, uow: UnitOfWork):
+        existing_todo, new_todo = self._create_todos(uow, 2)
+        uow.todos.bulk_insert(existing_todo)
+
+        existing_todo.title = 'bulk_todo_0_changed'
+        uow.todos.bulk_upsert(existing_todo, new_todo)
+
+        db_todos = self._get_todos(uow, [existing_todo, new_todo])
+        assert [todo.title for todo in db_todos] == ['bulk_todo_0_changed', 'bulk_todo_1']
+        assert db_todos[0].modified_date is not None
+        assert db_todos[1].id == new_todo.id
+
+    def test_bulk_writes_dispatch_repository_events(self, uow: UnitOfWork, mocker: MockerFixture):
+        written: List[Any] = []
+        mocker.patch.dict(RepositoryEvents._write_listeners, {TodoEntity: [written.extend]})
+        self._run_after_commit_callbacks(uow)
+        todos = self._create_todos(uow, 2)
+
+        uow.todos.bulk_insert(*todos)
+        uow.todos.bulk_update(*todos)
+        uow.todos.bulk_upsert(*todos)
+
+        # Listeners are notified of committed writes only
+        assert not written
+        self._run_after_commit_callbacks(uow)
+        assert [todo.id for todo in written] == [todo.id for todo in todos] * 3
+
+    def test_bulk_writes_skip_empty(self, uow: UnitOfWork, mocker: MockerFixture):
+        _spied_execute = mocker.spy(uow.session(), 'execute')
+
+        uow.todos.bulk_insert()
+        uow.todos.bulk_update()
+        uow.todos.bulk_upsert()
+
+        assert _spied_execute.call_count == 0
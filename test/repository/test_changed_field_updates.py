@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from typing import Any, List, Tuple
+
+import pytest
+
+from src.domain.todo.entity.todo import Todo
+from src.domain.todo.entity.todo_status import TodoStatuses
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from test.repository import insert_todo_list
+
+
+@pytest.mark.usefixtures('app', 'db_session')
+class TestChangedFieldUpdates:
+
+    @staticmethod
+    def _insert_todo(uow: UnitOfWork) -> Todo:
+        todo_list = insert_todo_list(uow, 'changed_fields_todo_list')
+        todo = Todo.create('changed_fields_todo', None, datetime.utcnow() + timedelta(days=1),
+                           todo_list.user_id, todo_list.id)
+        uow.todos.insert(todo)
+        uow.session().flush()
+        return uow.todos.get(todo.id)
+
+    @staticmethod
+    def _updates(captured_queries: List[Tuple[str, Any]]) -> List[Tuple[str, Any]]:
+        return [(statement, parameters) for statement, parameters in captured_queries
+                if statement.lstrip().upper().startswith('UPDATE')]
+
+    def test_changed_fields_records_only_different_values(self):
+        todo = Todo.create('title', 'description', datetime.utcnow(), 'user_id', 'todo_list_id')
+
+        todo.title = 'title'
+        todo.description = 'description'
+        todo.status_id = todo.status_id
+        assert not todo.changed_fields
+
+        todo.title = 'changed_title'
+        assert todo.changed_fields == {'title'}
+
+        copied_todo = todo.copy()
+        todo.mark_clean()
+        assert copied_todo.changed_fields == {'title'}
+
+    def test_update_writes_changed_columns(self, uow: UnitOfWork, captured_queries: List[Tuple[str, Any]]):
+        todo = self._insert_todo(uow)
+        captured_queries.clear()
+
+        todo.title = 'changed_fields_todo_changed'
+        todo.description = None
+        uow.todos.update(todo)
+
+        updates = self._updates(captured_queries)
+        assert len(updates) == 1
+        statement, _ = updates[0]
+        assert 'title' in statement and 'modified_date' in statement
+        assert 'description' not in statement and 'status_id' not in statement
+        assert not todo.changed_fields
+
+        uow.session().expire_all()
+        db_todo = uow.todos.get(todo.id)
+        assert db_todo.title == 'changed_fields_todo_changed'
+        assert db_todo.modified_date is not None
+
+    def test_no_op_update_is_not_written(self, uow: UnitOfWork, captured_queries: List[Tuple[str, Any]]):
+        todo = self._insert_todo(uow)
+        captured_queries.clear()
+
+        todo.title = todo.title
+        todo.status_id = TodoStatuses.open.id
+        uow.todos.update(todo)
+        uow.todos.update_many(todo)
+        uow.session().flush()
+
+        assert not self._updates(captured_queries)
+        assert todo.modified_date is None
@@ -0,0 +1,157 @@
+import importlib.util
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import delete
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.mysql import pymysql
+
+from src.domain.common.factory.uuid import id_factory
+from src.domain.todo.entity.todo import Todo
+from src.domain.todo.entity.todo_status import TodoStatuses
+from src.domain.todo_list.entity.todo_list import TodoList
+from src.infrastructure.entity.base.compact_uuid import CompactUUID
+from src.infrastructure.entity.todo.todo import Todo as TodoEntity
+from src.infrastructure.entity.todo_list.todo_list import TodoList as TodoListEntity
+from src.infrastructure.entity.user.user import User as UserEntity
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from test.repository import create_user, insert_todo_list
+
+
+class TestCompactUUID:
+    _mysql_dialect = pymysql.dialect()
+
+    def _bind(self, value: Any) -> Any:
+        process = CompactUUID().bind_processor(self._mysql_dialect)
+        return process(value) if process else value
+
+    def _result(self, value: Any) -> Any:
+        process = CompactUUID().result_processor(self._mysql_dialect, None)
+        return process(value) if process else value
+
+    def test_mysql_round_trip(self):
+        todo_id = id_factory()
+
+        bound = self._bind(todo_id)
+
+        assert bound == uuid.UUID(todo_id).bytes
+        assert len(bound) == 16
+        assert self._result(bound) == todo_id
+        # Ids generated before UUIDv7 keep their value
+        legacy_id = str(uuid.uuid4())
+        assert self._result(self._bind(legacy_id)) == legacy_id
+
+    def test_mysql_binds_malformed_id_as_null(self):
+        assert self._bind('malformed') is None
+        assert self._bind(f'{id_factory()}0') is None
+        assert self._bind(None) is None
+        assert self._result(None) is None
+
+    def test_other_dialects_keep_string(self):
+        todo_id = id_factory()
+        compact_uuid = CompactUUID()
+
+        assert compact_uuid.process_bind_param(todo_id, sqlite.dialect()) == todo_id
+        assert compact_uuid.process_bind_param('malformed', sqlite.dialect()) == 'malformed'
+        assert compact_uuid.process_result_value(todo_id, sqlite.dialect()) == todo_id
+
+
+@pytest.mark.usefixtures('app', 'db_session')
+class TestCompactUUIDKeys:
+
+    def test_keys_round_trip(self, uow: UnitOfWork):
+        todo_list = insert_todo_list(uow, 'compact_uuid_todo_list')
+        todo = Todo.create('compact_uuid_todo', None, datetime.utcnow() + timedelta(days=1),
+                           todo_list.user_id, todo_list.id)
+        uow.todos.insert(todo)
+        uow.session().flush()
+        uow.session().expire_all()
+
+        db_todo = uow.todos.get(todo.id)
+
+        assert db_todo.id == todo.id
+        assert db_todo.user_id == todo_list.user_id
+        assert db_todo.todo_list_id == todo_list.id
+        assert uow.users.get(todo_list.user_id) is not None
+
+    def test_malformed_id_is_not_found(self, uow: UnitOfWork):
+        user_id = id_factory()
+
+        assert uow.todos.get('malformed') is None
+        assert uow.todos.user_get_todo(user_id, 'malformed') is None
+        assert not uow.todos.user_update_status(user_id, 'malformed', TodoStatuses.deleted)
+
+
+@pytest.mark.usefixtures('app')
+class TestCompactUUIDMigration:
+    _migration_path = Path(__file__).parents[2] / 'src' / 'migrations' / 'versions' / \
+        '20261018_100000_8f2d61c4b7a9_compact_uuid_keys.py'
+
+    @classmethod
+    def _load_migration(cls) -> ModuleType:
+        spec = importlib.util.spec_from_file_location('compact_uuid_keys', cls._migration_path)
+        assert spec and spec.loader
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+        return migration
+
+    @staticmethod
+    def _migrate(uow: UnitOfWork, step: Callable[[], None]) -> None:
+        # DDL commits implicitly, sessions must not hold metadata locks of the tables
+        uow.close()
+        with uow._scoped_session_factory.bind.begin() as connection:
+            with Operations.context(MigrationContext.configure(connection)):
+                step()
+
+    @staticmethod
+    def _column_types(uow: UnitOfWork, table: str) -> Any:
+        inspector = sa.inspect(uow._scoped_session_factory.bind)
+        return {column['name']: str(column['type']) for column in inspector.get_columns(table)}
+
+    @staticmethod
+    def _referred_tables(uow: UnitOfWork, table: str) -> Any:
+        inspector = sa.inspect(uow._scoped_session_factory.bind)
+        return sorted(foreign_key['referred_table'] for foreign_key in inspector.get_foreign_keys(table))
+
+    def test_downgrade_and_upgrade(self, uow: UnitOfWork):
+        migration = self._load_migration()
+        user = create_user()
+        todo_list = TodoList.create('migration_todo_list', user.id)
+        todo = Todo.create('migration_todo', None, datetime.utcnow() + timedelta(days=1), user.id, todo_list.id)
+        with uow:
+            uow.users.insert(user)
+            uow.session().flush()
+            uow.todo_lists.insert(todo_list)
+            uow.session().flush()
+            uow.todos.insert(todo)
+
+        try:
+            self._migrate(uow, migration.downgrade)
+
+            assert self._column_types(uow, 'todo')['todo_list_id'].startswith('VARCHAR(36)')
+            with uow._scoped_session_factory.bind.connect() as connection:
+                row = connection.exec_driver_sql(
+                    'SELECT id, user_id, todo_list_id FROM todo WHERE title = %s', ('migration_todo',)).one()
+            assert tuple(row) == (todo.id, user.id, todo_list.id)
+            assert self._referred_tables(uow, 'todo') == ['todolist', 'todostatus', 'user']
+
+            self._migrate(uow, migration.upgrade)
+
+            assert self._column_types(uow, 'todo')['todo_list_id'] == 'BINARY(16)'
+            assert self._column_types(uow, 'user')['id'] == 'BINARY(16)'
+            assert self._referred_tables(uow, 'todolist') == ['todoliststatus', 'user']
+            db_todo = uow.todos.get(todo.id)
+            assert (db_todo.user_id, db_todo.todo_list_id) == (user.id, todo_list.id)
+            assert uow.users.get(user.id).email == user.email
+        finally:
+            with uow:
+                uow.session().execute(delete(TodoEntity).where(TodoEntity.id == todo.id))
+                uow.session().execute(delete(TodoListEntity).where(TodoListEntity.id == todo_list.id))
+                uow.session().execute(delete(UserEntity).where(UserEntity.id == user.id))
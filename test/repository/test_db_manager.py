@@ -0,0 +1,79 @@
+from typing import Any, Generator, List
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Engine
+
+from src.config import app_config_manager
+from src.infrastructure.manager.db_manager import DBManager
+from src.profiling.request_timer import RequestTimer
+
+
+@pytest.mark.usefixtures('app')
+class TestDBManager:
+    _idle_threshold = 30
+
+    @pytest.fixture(scope='function')
+    def idle_ping_engine(self, mocker: MockerFixture) -> Generator[Engine, Any, None]:
+        config = app_config_manager.get_config()
+        mocker.patch.object(config, 'DB_POOL_PRE_PING', False)
+        mocker.patch.object(config, 'DB_POOL_PING_IDLE_THRESHOLD', self._idle_threshold)
+        engine = DBManager._create_engine(DBManager._get_engine_url())
+        yield engine
+        engine.dispose()
+
+    @staticmethod
+    def _idle(engine: Engine, seconds: float) -> None:
+        # Checked in connections are idle since their check in time
+        for record in list(engine.pool._pool.queue):
+            record.info['checked_in_at'] -= seconds
+
+    def test_pre_ping_is_default(self):
+        config = app_config_manager.get_config()
+        engine = DBManager._create_engine(DBManager._get_engine_url())
+
+        assert config.DB_POOL_PRE_PING
+        assert engine.pool._pre_ping
+        engine.dispose()
+
+    def test_idle_connection_is_pinged(self, idle_ping_engine: Engine, mocker: MockerFixture):
+        _spied_ping = mocker.spy(DBManager, '_ping_connection')
+        with idle_ping_engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
+
+        # Recently used connection
+        with idle_ping_engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
+        assert _spied_ping.call_count == 0
+
+        self._idle(idle_ping_engine, self._idle_threshold + 1)
+        with idle_ping_engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
+        assert _spied_ping.call_count == 1
+
+    def test_failed_ping_reconnects(self, idle_ping_engine: Engine, mocker: MockerFixture):
+        connects: List[Any] = []
+        event.listen(idle_ping_engine, 'connect', lambda dbapi_connection, record: connects.append(record))
+        with idle_ping_engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
+
+        mocker.patch.object(DBManager, '_ping_connection', side_effect=exc.DisconnectionError)
+        self._idle(idle_ping_engine, self._idle_threshold + 1)
+        with idle_ping_engine.connect() as connection:
+            assert connection.exec_driver_sql('SELECT 1').scalar() == 1
+
+        # The stale connection is discarded, the new one is not pinged
+        assert len(connects) == 2
+
+    def test_pool_metrics_in_request_timer_metrics(self):
+        scoped_session_factory = DBManager._create_session_factory()
+        scoped_session_factory().execute(text('SELECT 1'))
+        scoped_session_factory.remove()
+
+        metrics = RequestTimer.collect_metrics()
+
+        assert metrics['db_pool_size'] == app_config_manager.get_config().DB_POOL_SIZE
+        assert metrics['db_pool_checkouts'] == 1
+        assert metrics['db_pool_timeouts'] == 0
+        scoped_session_factory.bind.dispose()
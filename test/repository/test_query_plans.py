@@ -0,0 +1,72 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, List, Tuple
+
+import pytest
+
+from src.domain.todo.entity.todo import Todo
+from src.domain.todo.entity.todo_status import TodoStatuses
+from src.domain.todo_list.entity.todo_list import TodoList
+from src.domain.todo_list.entity.todo_list_status import TodoListStatuses
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from test import test_user_email
+from test.repository import get_filesorts, get_full_scans, get_possible_keys
+
+
+@pytest.mark.usefixtures('app', 'db_session')
+class TestQueryPlans:
+
+    def test_todo_queries(self, uow: UnitOfWork, captured_queries: List[Tuple[str, Any]]):
+        user = uow.users.get_by_email(test_user_email)
+        todo_list = TodoList.create('plan_todo_list', user.id)
+        uow.todo_lists.insert(todo_list)
+        uow.todos.insert_many(*[Todo.create(f'plan_todo_{i}', None, datetime.utcnow() - timedelta(days=1),
+                                            user.id, todo_list.id) for i in range(3)])
+        uow.session().flush()
+        captured_queries.clear()
+
+        _, next_cursor = uow.todos.user_list_todos_page(user.id, page_size=1)
+        uow.todos.user_list_todos_page(user.id, page_size=1, cursor=next_cursor)
+        page_queries = list(captured_queries)
+        uow.todos.user_list_todos(user.id)
+        list(uow.todos.user_iter_todos(user.id, batch_size=10))
+        uow.todos.user_list_todos_by_status(user.id, TodoStatuses.open)
+        uow.todos.user_list_todos_by_status(user.id, TodoStatuses.expired)
+        uow.todos.user_get_todo(user.id, str(uuid.uuid4()))
+        uow.todos.user_update_status(user.id, str(uuid.uuid4()), TodoStatuses.deleted)
+        listing_queries = list(captured_queries)
+
+        captured_queries.clear()
+        uow.todos.worker_update_expired_todos(limit=10)
+        expiry_queries = list(captured_queries)
+
+        assert not get_full_scans(uow, listing_queries + expiry_queries)
+        assert 'ix_todo_user_id_created_date' in get_possible_keys(uow, listing_queries[:1], 'todo')
+        assert len(page_queries) == 2
+        assert not get_filesorts(uow, page_queries)
+        assert 'ix_todo_status_id_valid_until' in get_possible_keys(uow, expiry_queries[:1], 'todo')
+
+    def test_todo_list_queries(self, uow: UnitOfWork, captured_queries: List[Tuple[str, Any]]):
+        user = uow.users.get_by_email(test_user_email)
+        uow.todo_lists.insert_many(*[TodoList.create(f'plan_todo_list_{i}', user.id) for i in range(3)])
+        uow.session().flush()
+        captured_queries.clear()
+
+        _, next_cursor = uow.todo_lists.user_list_todo_lists_page(user.id, page_size=1)
+        uow.todo_lists.user_list_todo_lists_page(user.id, page_size=1, cursor=next_cursor)
+        page_queries = list(captured_queries)
+        list(uow.todo_lists.user_iter_todo_lists(user.id, batch_size=10))
+        uow.todo_lists.user_get_todo_list(user.id, str(uuid.uuid4()))
+        uow.todo_lists.user_get_todo_list_with_todo(user.id, str(uuid.uuid4()))
+        uow.todo_lists.user_update_status(user.id, str(uuid.uuid4()), TodoListStatuses.deleted)
+
+        assert not get_full_scans(uow, captured_queries)
+        assert 'ix_todolist_user_id_created_date' in get_possible_keys(uow, captured_queries[:1], 'todolist')
+        assert len(page_queries) == 2
+        assert not get_filesorts(uow, page_queries)
+
+    def test_user_queries(self, uow: UnitOfWork, captured_queries: List[Tuple[str, Any]]):
+        uow.users.get_by_email(test_user_email)
+        uow.users.get_sub_id(str(uuid.uuid4()))
+
+        assert not get_full_scans(uow, captured_queries)
@@ -0,0 +1,88 @@
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import joinedload
+
+from src.domain.todo.entity.todo import Todo
+from src.domain.todo_list.entity.todo_list import TodoList
+from src.infrastructure.entity.todo.todo import Todo as TodoEntity
+from src.infrastructure.entity.todo_list.todo_list import TodoList as TodoListEntity
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from test.repository import insert_todo_list
+
+
+@pytest.mark.usefixtures('app', 'db_session')
+class TestTrustedModels:
+
+    @staticmethod
+    def _insert_todo_list(uow: UnitOfWork) -> TodoList:
+        todo_list = insert_todo_list(uow, 'trusted_todo_list')
+        uow.todos.insert_many(*[Todo.create(f'trusted_todo_{i}', None, datetime.utcnow() + timedelta(days=i),
+                                            todo_list.user_id, todo_list.id) for i in range(2)])
+        uow.session().flush()
+        uow.session().expire_all()
+        return todo_list
+
+    @staticmethod
+    def _assert_same(trusted: BaseModel, validated: BaseModel) -> None:
+        assert trusted == validated
+        # Values have the types of the validating path, like datetimes of ISO 8601 strings
+        for name, value in validated:
+            assert type(getattr(trusted, name)) is type(value), name
+
+    def test_rows(self, uow: UnitOfWork):
+        todo_list = self._insert_todo_list(uow)
+
+        rows = uow.todos.rows.filter(TodoEntity.todo_list_id == todo_list.id).all()
+
+        assert len(rows) == 2
+        for row in rows:
+            self._assert_same(Todo.from_orm_trusted(row), Todo.from_orm(row))
+
+    def test_nested_todos(self, uow: UnitOfWork):
+        todo_list = self._insert_todo_list(uow)
+
+        instance = uow.session().query(TodoListEntity) \
+            .options(joinedload(TodoListEntity.todos)) \
+            .filter(TodoListEntity.id == todo_list.id).one()
+        trusted, validated = TodoList.from_orm_trusted(instance), TodoList.from_orm(instance)
+
+        self._assert_same(trusted, validated)
+        assert len(trusted.todos) == 2
+        for trusted_todo, validated_todo in zip(trusted.todos, validated.todos):
+            assert isinstance(trusted_todo, Todo)
+            self._assert_same(trusted_todo, validated_todo)
+
+    def test_cache_entries(self, uow: UnitOfWork):
+        todo_list = self._insert_todo_list(uow)
+        todo_list_with_todos = uow.todo_lists.user_get_todo_list_with_todo(todo_list.user_id, todo_list.id)
+        todo = todo_list_with_todos.todos[0]
+
+        self._assert_same(Todo.parse_raw_trusted(todo.json()), Todo.parse_raw(todo.json()))
+        entry = todo_list_with_todos.json()
+        trusted, validated = TodoList.parse_raw_trusted(entry), TodoList.parse_raw(entry)
+        self._assert_same(trusted, validated)
+        for trusted_todo, validated_todo in zip(trusted.todos, validated.todos):
+            self._assert_same(trusted_todo, validated_todo)
+
+        # Optional fields missing from an entry get their defaults
+        data = json.loads(entry)
+        del data['todos'], data['modified_date']
+        self._assert_same(TodoList.parse_obj_trusted(data), TodoList.parse_obj(data))
+
+    @pytest.mark.parametrize('data', [{'id': 'x'}, {'title': 'title', 'valid_until': None}])
+    def test_missing_required_fields_are_validated(self, data: Any):
+        with pytest.raises(ValidationError):
+            Todo.parse_raw_trusted(json.dumps(data))
+        with pytest.raises(ValidationError):
+            Todo.from_orm_trusted(SimpleNamespace(**data))
+
+    def test_missing_required_fields_of_nested_todos_are_validated(self):
+        todo_list = TodoList.create('trusted_todo_list', 'user_id')
+
+        with pytest.raises(ValidationError):
+            TodoList.parse_obj_trusted({**todo_list.dict(), 'todos': [{'id': 'x'}]})
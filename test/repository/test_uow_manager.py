@@ -0,0 +1,94 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+from unittest.mock import AsyncMock
+
+import pytest
+from flask import Flask, g
+from pytest_mock import MockerFixture
+
+from src.infrastructure.manager.db_manager import DBManager
+from src.infrastructure.manager.uow_manager import UOWManager
+from src.infrastructure.repository.base.async_unit_of_work import AsyncUnitOfWork
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+
+
+@pytest.mark.usefixtures('app')
+class TestUOWManager:
+
+    @staticmethod
+    @contextmanager
+    def _request_context(app: Flask) -> Iterator[None]:
+        # A new app context, requests reuse the app context of the test client otherwise
+        with app.app_context(), app.test_request_context():
+            app.preprocess_request()
+            yield
+
+    @pytest.fixture(autouse=True)
+    def without_shared_uow(self, mocker: MockerFixture) -> None:
+        # Tests share one unit of work, requests get their own
+        mocker.patch.object(UOWManager, '_uow', None)
+
+    def test_uow_is_scoped_to_app_context(self, app: Flask, mocker: MockerFixture):
+        _spied_close = mocker.spy(UnitOfWork, 'close')
+
+        with self._request_context(app):
+            uow = UOWManager.get_uow()
+            assert UOWManager.get_uow() is uow
+            assert uow._scoped_session_factory is g.scoped_session_factory
+        assert _spied_close.call_count == 1
+
+        with self._request_context(app):
+            assert UOWManager.get_uow() is not uow
+            assert _spied_close.call_count == 1
+        assert _spied_close.call_count == 2
+
+    def test_concurrent_requests_do_not_share_uow(self, app: Flask):
+        uows: Dict[int, UnitOfWork] = {}
+        transaction_counts: List[int] = []
+        barrier = threading.Barrier(2, timeout=5)
+
+        def request(index: int) -> None:
+            with self._request_context(app):
+                uow = UOWManager.get_uow()
+                uows[index] = uow
+                if index == 0:
+                    with uow:
+                        barrier.wait()
+                        barrier.wait()
+                else:
+                    barrier.wait()
+                    # The transaction of the other request is not pushed to this unit of work
+                    transaction_counts.append(len(uow._session_transactions))
+                    barrier.wait()
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert uows[0] is not uows[1]
+        assert transaction_counts == [0]
+
+    def test_async_uow_closed_on_teardown(self, app: Flask, mocker: MockerFixture):
+        mocker.patch.object(DBManager, 'get_async_session_factory')
+        _mocked_close = mocker.patch.object(AsyncUnitOfWork, 'close', new_callable=AsyncMock)
+
+        with self._request_context(app):
+            async_uow = UOWManager.get_async_uow()
+            assert UOWManager.get_async_uow() is async_uow
+            assert not _mocked_close.called
+
+        _mocked_close.assert_awaited_once()
+
+    def test_context_uow_takes_precedence(self, app: Flask):
+        worker_uow = UnitOfWork(scoped_session_factory=DBManager._create_session_factory())
+
+        with self._request_context(app):
+            request_uow = UOWManager.get_uow()
+            with UOWManager.use_uow(worker_uow):
+                assert UOWManager.get_uow() is worker_uow
+            assert UOWManager.get_uow() is request_uow
+
+        worker_uow._scoped_session_factory.bind.dispose()
@@ -0,0 +1,122 @@
+import uuid
+from typing import Any, List, Tuple
+
+import pytest
+from pytest_mock import MockerFixture
+from redis import RedisError
+
+from src.domain.user.entity.user import User
+from src.domain.user.entity.user_status import UserStatuses
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from src.infrastructure.repository.user.user_repository import UserRepository
+from test.repository import create_user
+
+
+@pytest.mark.usefixtures('app', 'db_session')
+class TestUserRepository:
+
+    @staticmethod
+    def _insert_user(uow: UnitOfWork) -> User:
+        user = create_user()
+        uow.users.insert(user)
+        uow.session().flush()
+        return user
+
+    @staticmethod
+    def _is_cached(uow: UnitOfWork, sub_id: str) -> bool:
+        return UserRepository._user_local_cache.get(sub_id) is not None or \
+            bool(uow.users.redis.exists(uow.users.get_user_key(sub_id)))
+
+    def test_get_sub_id_cached_hit(self, uow: UnitOfWork, captured_queries: List[Tuple[str, Any]]):
+        user = self._insert_user(uow)
+        uow.users.update_user_cache_entry(user)
+        captured_queries.clear()
+
+        # In-process cache, then Redis
+        assert uow.users.get_sub_id_cached(user.sub_id).id == user.id
+        UserRepository._user_local_cache.pop(user.sub_id)
+        assert uow.users.get_sub_id_cached(user.sub_id).id == user.id
+
+        assert not captured_queries
+        uow.users.invalidate_user_cache_entry(user.sub_id)
+
+    def test_get_sub_id_cached_miss(self, uow: UnitOfWork, captured_queries: List[Tuple[str, Any]]):
+        user = self._insert_user(uow)
+        captured_queries.clear()
+
+        assert uow.users.get_sub_id_cached(user.sub_id).id == user.id
+        assert len(captured_queries) == 1
+
+        # Uncommitted users are not cached
+        assert not self._is_cached(uow, user.sub_id)
+
+    def test_update_invalidates_cache_entry(self, uow: UnitOfWork):
+        user = self._insert_user(uow)
+        uow.users.update_user_cache_entry(user)
+
+        user.status_id = UserStatuses.disabled.id
+        uow.users.update(user)
+
+        assert not self._is_cached(uow, user.sub_id)
+
+    def test_sub_id_change_invalidates_old_cache_entry(self, uow: UnitOfWork):
+        user = self._insert_user(uow)
+        old_sub_id = user.sub_id
+        uow.users.update_user_cache_entry(user)
+
+        user.sub_id = f'Auth0|{uuid.uuid4()}'
+        uow.users.update(user)
+
+        assert not self._is_cached(uow, old_sub_id)
+        assert uow.users.get_sub_id_cached(old_sub_id) is None
+
+    def test_redis_failure_does_not_fail_writes(self, uow: UnitOfWork, mocker: MockerFixture):
+        user = self._insert_user(uow)
+        uow.users.update_user_cache_entry(user)
+        mocker.patch.object(uow.users.redis, 'delete', side_effect=RedisError)
+
+        user.email = f'changed_{user.email}'
+        uow.users.update(user)
+
+        assert UserRepository._user_local_cache.get(user.sub_id) is None
+        mocker.stopall()
+        uow.users.invalidate_user_cache_entry(user.sub_id)
+
+    def test_redis_failure_reads_from_db(self, uow: UnitOfWork, mocker: MockerFixture):
+        user = self._insert_user(uow)
+        mocker.patch.object(uow.users.redis, 'get', side_effect=RedisError)
+        mocker.patch.object(uow.users.redis, 'set', side_effect=RedisError)
+
+        assert uow.users.get_sub_id_cached(user.sub_id).id == user.id
+
+    def test_writes_read_stored_sub_id_only_if_changed(self, uow: UnitOfWork,
+                                                       captured_queries: List[Tuple[str, Any]]):
+        user = self._insert_user(uow)
+        captured_queries.clear()
+
+        uow.users.update(user)
+        assert not captured_queries
+
+        user.status_id = UserStatuses.disabled.id
+        uow.users.update(user)
+        assert [statement.split()[0] for statement, _ in captured_queries] == ['UPDATE']
+
+        captured_queries.clear()
+        user.sub_id = f'Auth0|{uuid.uuid4()}'
+        uow.users.update(user)
+        assert [statement.split()[0] for statement, _ in captured_queries] == ['SELECT', 'UPDATE']
+
+    def test_delete_invalidates_cache_entry(self, uow: UnitOfWork, captured_queries: List[Tuple[str, Any]]):
+        user, other_user = self._insert_user(uow), self._insert_user(uow)
+        uow.users.update_user_cache_entry(user)
+        uow.users.update_user_cache_entry(other_user)
+        captured_queries.clear()
+
+        uow.users.delete(user)
+        assert [statement.split()[0] for statement, _ in captured_queries] == ['DELETE']
+        assert not self._is_cached(uow, user.sub_id)
+
+        # Sub ids of users deleted by id are read before
+        uow.users.delete(other_user.id)
+        assert not self._is_cached(uow, other_user.sub_id)
+        assert uow.users.get(other_user.id) is None
@@ -0,0 +1,18 @@
+import json
+from typing import Any, Dict, Tuple
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+jwks_uri = 'https://test.auth0.com/.well-known/jwks.json'
+
+
+def create_jwk(kid: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    :param kid: Key id of the JSON Web Key
+    :return: Private key and the JSON Web Key of its public key
+    """
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({'kid': kid, 'use': 'sig', 'alg': 'RS256'})
+    return private_key, jwk
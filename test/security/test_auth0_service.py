@@ -0,0 +1,89 @@
+import hashlib
+import time
+from typing import Any, Optional
+
+import jwt
+import pytest
+from pytest_mock import MockerFixture
+from requests_mock import Mocker
+
+from src.api.security.auth0_service import Auth0Service
+from src.domain.common.error.authentication_errors import InvalidTokenError
+from src.profiling.request_timer import RequestTimer
+from test.security import create_jwk
+
+
+class TestAuth0Service:
+
+    @pytest.fixture(scope='function')
+    def private_key(self, requests_mock: Mocker) -> Any:
+        private_key, jwk = create_jwk('kid-1')
+        requests_mock.get(Auth0Service().jwks_uri, json={'keys': [jwk]})
+        return private_key
+
+    @staticmethod
+    def _create_token(auth0_service: Auth0Service, private_key: Any, exp: Optional[int] = None) -> str:
+        now = int(time.time())
+        payload = {
+            'iss': auth0_service.issuer_url,
+            'aud': auth0_service.audience,
+            'sub': 'Auth0|test',
+            'iat': now,
+            'exp': exp or now + 600
+        }
+        return jwt.encode(payload, private_key, algorithm='RS256', headers={'kid': 'kid-1'})
+
+    def test_validate_jwt_cache_hit(self, private_key: Any, mocker: MockerFixture):
+        auth0_service = Auth0Service()
+        token = self._create_token(auth0_service, private_key)
+        _spied_decode = mocker.spy(jwt, 'decode')
+
+        payload = auth0_service.validate_jwt(token)
+
+        assert auth0_service.validate_jwt(token) == payload
+        assert _spied_decode.call_count == 1
+        assert auth0_service.token_cache_stats()['hits'] == 1
+        assert auth0_service.token_cache_stats()['misses'] == 1
+
+    def test_validate_jwt_cache_key_is_token_digest(self, private_key: Any):
+        auth0_service = Auth0Service()
+        token = self._create_token(auth0_service, private_key)
+
+        auth0_service.validate_jwt(token)
+
+        assert auth0_service.token_payload_cache.get(hashlib.sha256(token.encode()).hexdigest()) is not None
+        assert auth0_service.token_payload_cache.get(token) is None
+
+    def test_validate_jwt_cache_expires_at_exp(self, private_key: Any, mocker: MockerFixture):
+        auth0_service = Auth0Service()
+        exp = int(time.time()) + 60
+        token = self._create_token(auth0_service, private_key, exp=exp)
+        auth0_service.validate_jwt(token)
+        _spied_decode = mocker.spy(jwt, 'decode')
+
+        _mocked_time = mocker.patch('src.infrastructure.cache.ttl_lru_cache.time')
+        _mocked_time.time.return_value = exp - 1
+        auth0_service.validate_jwt(token)
+        assert _spied_decode.call_count == 0
+
+        _mocked_time.time.return_value = exp
+        auth0_service.validate_jwt(token)
+        assert _spied_decode.call_count == 1
+        assert len(auth0_service.token_payload_cache) == 0
+
+    def test_validate_jwt_invalid_token_not_cached(self, private_key: Any):
+        auth0_service = Auth0Service()
+        token = self._create_token(auth0_service, private_key)
+
+        with pytest.raises(InvalidTokenError):
+            auth0_service.validate_jwt(token[:-2])
+        assert len(auth0_service.token_payload_cache) == 0
+
+    def test_token_cache_stats_in_request_timer_metrics(self, private_key: Any):
+        auth0_service = Auth0Service()
+        auth0_service.validate_jwt(self._create_token(auth0_service, private_key))
+
+        metrics = RequestTimer.collect_metrics()
+
+        assert metrics['auth0_token_cache_misses'] == 1
+        assert metrics['auth0_token_cache_size'] == 1
@@ -0,0 +1,91 @@
+import pytest
+from requests_mock import Mocker
+
+from src.api.security.jwks_key_store import JwksKeyStore
+from src.domain.common.error.authentication_errors import InvalidTokenError
+from src.infrastructure.client.http_session import create_http_session
+from test.security import create_jwk, jwks_uri
+
+
+class TestJwksKeyStore:
+    _ttl = 600
+    _stale_ttl = 3600
+
+    def _create_key_store(self, min_refresh_interval: int = 30) -> JwksKeyStore:
+        return JwksKeyStore(jwks_uri, create_http_session(), ttl=self._ttl, stale_ttl=self._stale_ttl,
+                            min_refresh_interval=min_refresh_interval)
+
+    def test_fresh_key_served_from_memory(self, requests_mock: Mocker):
+        _, jwk = create_jwk('kid-1')
+        jwks_mock = requests_mock.get(jwks_uri, json={'keys': [jwk]})
+        key_store = self._create_key_store()
+
+        key = key_store.get_signing_key('kid-1')
+
+        assert key_store.get_signing_key('kid-1') is key
+        assert jwks_mock.call_count == 1
+
+    def test_unknown_kid_refetches_rotated_keys(self, requests_mock: Mocker):
+        _, jwk = create_jwk('kid-1')
+        _, rotated_jwk = create_jwk('kid-2')
+        jwks_mock = requests_mock.get(jwks_uri, [{'json': {'keys': [jwk]}},
+                                                 {'json': {'keys': [jwk, rotated_jwk]}}])
+        key_store = self._create_key_store(min_refresh_interval=0)
+        key_store.get_signing_key('kid-1')
+
+        assert key_store.get_signing_key('kid-2') is not None
+        assert jwks_mock.call_count == 2
+
+    def test_unknown_kid_refetch_rate_limited(self, requests_mock: Mocker):
+        _, jwk = create_jwk('kid-1')
+        jwks_mock = requests_mock.get(jwks_uri, json={'keys': [jwk]})
+        key_store = self._create_key_store()
+
+        with pytest.raises(InvalidTokenError):
+            key_store.get_signing_key('unknown')
+        with pytest.raises(InvalidTokenError):
+            key_store.get_signing_key('unknown')
+
+        # The second unknown kid is rejected without a refetch
+        assert jwks_mock.call_count == 1
+        assert key_store.get_signing_key('kid-1') is not None
+        assert jwks_mock.call_count == 1
+
+    def test_stale_key_served_while_refreshing(self, requests_mock: Mocker):
+        _, jwk = create_jwk('kid-1')
+        jwks_mock = requests_mock.get(jwks_uri, json={'keys': [jwk]})
+        key_store = self._create_key_store()
+        key = key_store.get_signing_key('kid-1')
+
+        key_store._fetched_at -= self._ttl + 1
+        assert key_store.get_signing_key('kid-1') is key
+
+        # The background refresh holds the lock until it is finished
+        assert key_store._background_refresh_lock.acquire(timeout=5)
+        key_store._background_refresh_lock.release()
+        assert jwks_mock.call_count == 2
+        assert key_store.age < self._ttl
+
+    def test_stale_key_served_when_refresh_fails(self, requests_mock: Mocker):
+        _, jwk = create_jwk('kid-1')
+        jwks_mock = requests_mock.get(jwks_uri, [{'json': {'keys': [jwk]}}, {'status_code': 503}])
+        key_store = self._create_key_store()
+        key = key_store.get_signing_key('kid-1')
+
+        key_store._fetched_at -= self._ttl + 1
+        assert key_store.get_signing_key('kid-1') is key
+
+        assert key_store._background_refresh_lock.acquire(timeout=5)
+        key_store._background_refresh_lock.release()
+        assert jwks_mock.call_count == 2
+        assert key_store.get_signing_key('kid-1') is key
+
+    def test_expired_key_set_rejected_when_refetch_fails(self, requests_mock: Mocker):
+        _, jwk = create_jwk('kid-1')
+        requests_mock.get(jwks_uri, [{'json': {'keys': [jwk]}}, {'status_code': 503}])
+        key_store = self._create_key_store()
+        key_store.get_signing_key('kid-1')
+
+        key_store._fetched_at -= self._ttl + self._stale_ttl + 1
+        with pytest.raises(InvalidTokenError):
+            key_store.get_signing_key('kid-1')
@@ -0,0 +1,147 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+from redis.exceptions import ConnectionError
+
+from src.api.models.dto.user_info_dto import UserInfoResponseDto
+from src.api.security.user_provisioner import UserProvisioner
+from src.domain.user.entity.user import User
+from src.infrastructure.manager.auth_manager import AuthManager
+from src.infrastructure.manager.redis_manager import RedisManager
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from test.repository import create_user
+
+
+@pytest.mark.usefixtures('app')
+class TestUserProvisioner:
+    _concurrent_requests = 5
+
+    def test_concurrent_first_login_provisions_once(self, mocker: MockerFixture):
+        user = create_user()
+        upsert_started = threading.Event()
+        release_upsert = threading.Event()
+
+        def upsert_user(*args: Any) -> User:
+            upsert_started.set()
+            release_upsert.wait(timeout=5)
+            return user
+
+        _mocked_upsert_user = mocker.patch.object(UserProvisioner, '_upsert_user', side_effect=upsert_user)
+
+        with ThreadPoolExecutor(max_workers=self._concurrent_requests) as executor:
+            futures = [executor.submit(UserProvisioner.provision, user.sub_id, 'token')
+                       for _ in range(self._concurrent_requests)]
+            assert upsert_started.wait(timeout=5)
+            # Followers wait on the future of the leader
+            time.sleep(0.1)
+            release_upsert.set()
+            users = [future.result(timeout=5) for future in futures]
+
+        assert _mocked_upsert_user.call_count == 1
+        assert {u.id for u in users} == {user.id}
+        assert user.sub_id not in UserProvisioner._in_flight
+
+    def test_provision_waits_for_lock_of_another_worker(self, mocker: MockerFixture):
+        user = create_user()
+        _mocked_upsert_user = mocker.patch.object(UserProvisioner, '_upsert_user', return_value=user)
+
+        # Lock held by another gunicorn worker
+        lock = RedisManager.get_redis().lock(f'lock_user_provision:{user.sub_id}', timeout=5)
+        assert lock.acquire(blocking=False)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(UserProvisioner.provision, user.sub_id, 'token')
+            time.sleep(0.2)
+            assert not _mocked_upsert_user.called
+            lock.release()
+
+            assert future.result(timeout=5).id == user.id
+        assert _mocked_upsert_user.call_count == 1
+
+    def test_follower_retries_after_wait_timeout(self, mocker: MockerFixture):
+        user = create_user()
+        release_upsert = threading.Event()
+        upsert_calls = []
+
+        def upsert_user(*args: Any) -> User:
+            upsert_calls.append(threading.get_ident())
+            if len(upsert_calls) == 1:
+                # Leader is slower than the follower waits
+                release_upsert.wait(timeout=5)
+            return user
+
+        mocker.patch.object(UserProvisioner, '_future_wait', 0.1)
+        mocker.patch.object(UserProvisioner, '_upsert_user', side_effect=upsert_user)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(UserProvisioner.provision, user.sub_id, 'token')
+            while not upsert_calls:
+                time.sleep(0.01)
+            follower = executor.submit(UserProvisioner.provision, user.sub_id, 'token')
+            time.sleep(0.3)
+            # The retry waits for the Redis lock of the leader
+            assert len(upsert_calls) == 1
+            release_upsert.set()
+
+            assert follower.result(timeout=5).id == user.id
+            assert leader.result(timeout=5).id == user.id
+        assert len(upsert_calls) == 2
+
+    def test_leader_error_is_raised_to_followers(self, mocker: MockerFixture):
+        user = create_user()
+        upsert_started = threading.Event()
+        release_upsert = threading.Event()
+
+        def upsert_user(*args: Any) -> User:
+            upsert_started.set()
+            release_upsert.wait(timeout=5)
+            raise ValueError('userinfo failed')
+
+        mocker.patch.object(UserProvisioner, '_upsert_user', side_effect=upsert_user)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(UserProvisioner.provision, user.sub_id, 'token')
+            assert upsert_started.wait(timeout=5)
+            follower = executor.submit(UserProvisioner.provision, user.sub_id, 'token')
+            time.sleep(0.1)
+            release_upsert.set()
+
+            with pytest.raises(ValueError):
+                leader.result(timeout=5)
+            with pytest.raises(ValueError):
+                follower.result(timeout=5)
+        assert user.sub_id not in UserProvisioner._in_flight
+
+    def test_provision_without_redis_lock(self, mocker: MockerFixture):
+        user = create_user()
+        _mocked_upsert_user = mocker.patch.object(UserProvisioner, '_upsert_user', return_value=user)
+        lock = mocker.patch.object(RedisManager.get_redis(), 'lock').return_value
+        lock.acquire.side_effect = ConnectionError('Redis is down')
+
+        assert UserProvisioner.provision(user.sub_id, 'token').id == user.id
+        assert _mocked_upsert_user.call_count == 1
+        assert not lock.release.called
+
+    def test_racing_insert_reads_user_of_another_worker(self, mocker: MockerFixture, uow: UnitOfWork):
+        user = create_user()
+        with uow:
+            uow.users.insert(user)
+
+        try:
+            # Another worker inserts the user after both workers read it
+            get_sub_id = uow.users.get_sub_id
+            _mocked_get_sub_id = mocker.patch.object(uow.users, 'get_sub_id',
+                                                     side_effect=[None, get_sub_id(user.sub_id)])
+            mocker.patch.object(uow.users, 'get_by_email', return_value=None)
+            mocker.patch.object(AuthManager.get_auth(), 'get_userinfo',
+                                return_value=UserInfoResponseDto(sub=user.sub_id, email=user.email))
+
+            assert UserProvisioner.provision(user.sub_id, 'token').id == user.id
+            assert _mocked_get_sub_id.call_count == 2
+        finally:
+            mocker.stopall()
+            with uow:
+                uow.users.delete(user)
@@ -1,3 +1,4 @@
+import json
 from http import HTTPStatus
 
 import pytest
@@ -34,7 +35,7 @@ class TestCheckExpiredTodos:
             )
         )
 
-        _mocked_send_expired_mail = mocker.patch('src.task.mail.tasks.send_expired_mail.delay',
+        _mocked_send_expired_mail = mocker.patch('src.task.mail.tasks.send_expired_digest_mail.delay',
                                                  return_value=True)
         beat_check_expired_todos.delay()
 
@@ -59,13 +60,72 @@ class TestCheckExpiredTodos:
             )
         )
 
-        _mocked_send_expired_mail = mocker.patch('src.task.mail.tasks.send_expired_mail.delay',
+        _mocked_send_expired_mail = mocker.patch('src.task.mail.tasks.send_expired_digest_mail.delay',
                                                  return_value=True)
 
         beat_check_expired_todos.delay()
 
+        # All expired todos belong to the same user
         assert _mocked_send_expired_mail.called
-        assert _mocked_send_expired_mail.call_count == 8
+        assert _mocked_send_expired_mail.call_count == 1
+        assert len(_mocked_send_expired_mail.call_args.args[1]) == 8
+
+    @fake_permission(worker_scope.worker)  # Set token with worker permission
+    def test_check_expired_todos_ndjson_success(self, requests_mock: Mocker, mocker: MockerFixture):
+        requests_mock.post(
+            f'https://{worker_config_manager.get_config().AUTH0_DOMAIN}/oauth/token',
+            json=get_mocker_response(
+                path=self._mocker_response_path,
+                file_name='worker_auth-success'
+            )
+        )
+
+        # Todo and user pairs as lines, followed by the response envelope
+        success_response = get_mocker_response(path=self._mocker_response_path,
+                                               file_name='check_expired_todos-success')
+        lines = [json.dumps(todo_user) for todo_user in success_response.pop('data')] + [json.dumps(success_response)]
+        requests_mock.put(
+            f'{worker_config_manager.get_config().TODO_API_URL}/api/v1/worker/expired',
+            text='\n'.join(lines) + '\n',
+            headers={'Content-Type': 'application/x-ndjson; charset=utf-8'}
+        )
+
+        _mocked_send_expired_mail = mocker.patch('src.task.mail.tasks.send_expired_digest_mail.delay',
+                                                 return_value=True)
+
+        beat_check_expired_todos.delay()
+
+        assert requests_mock.request_history[-1].headers['Accept'].startswith('application/x-ndjson')
+        assert _mocked_send_expired_mail.call_count == 1
+        assert len(_mocked_send_expired_mail.call_args.args[1]) == 8
+
+    @fake_permission(worker_scope.worker)  # Set token with worker permission
+    def test_check_expired_todos_ndjson_interrupted(self, requests_mock: Mocker, mocker: MockerFixture):
+        requests_mock.post(
+            f'https://{worker_config_manager.get_config().AUTH0_DOMAIN}/oauth/token',
+            json=get_mocker_response(
+                path=self._mocker_response_path,
+                file_name='worker_auth-success'
+            )
+        )
+
+        # Response without the envelope line
+        success_response = get_mocker_response(path=self._mocker_response_path,
+                                               file_name='check_expired_todos-success')
+        requests_mock.put(
+            f'{worker_config_manager.get_config().TODO_API_URL}/api/v1/worker/expired',
+            text='\n'.join(json.dumps(todo_user) for todo_user in success_response['data']),
+            headers={'Content-Type': 'application/x-ndjson; charset=utf-8'}
+        )
+
+        _mocked_send_expired_mail = mocker.patch('src.task.mail.tasks.send_expired_digest_mail.delay',
+                                                 return_value=True)
+
+        with pytest.raises(Exception, match='Response is interrupted'):
+            beat_check_expired_todos.delay()
+
+        # Todos received before the interruption are notified
+        assert _mocked_send_expired_mail.call_count == 1
 
     @fake_permission(worker_scope.worker)  # Set token with worker permission
     def test_check_expired_todos_error(self, requests_mock: Mocker, mocker: MockerFixture):
@@ -0,0 +1,121 @@
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Generator, List, Tuple
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+from requests import Session
+from urllib3.exceptions import NewConnectionError, ReadTimeoutError
+
+from src.config import worker_config_manager
+from src.infrastructure.client.http_session import JitterRetry, create_http_session
+from src.infrastructure.client.todo_api_client import TodoApiClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep connections alive
+    received: List[Tuple[str, str]] = []
+    unavailable_count = 0
+    slow_seconds = 0.5
+
+    def _respond(self) -> None:
+        _Handler.received.append((self.command, self.path))
+        if self.path == '/slow':
+            time.sleep(self.slow_seconds)
+        if self.path == '/unavailable' and _Handler.unavailable_count > 0:
+            _Handler.unavailable_count -= 1
+            status = HTTPStatus.SERVICE_UNAVAILABLE
+        else:
+            status = HTTPStatus.OK
+        body = b'{}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_PUT = _respond
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class TestHttpSession:
+    _retries = 2
+
+    @pytest.fixture(scope='function')
+    def server_url(self) -> Generator[str, Any, None]:
+        _Handler.received = []
+        _Handler.unavailable_count = 0
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture(scope='function')
+    def todo_api_session(self, mocker: MockerFixture) -> Session:
+        config = worker_config_manager.get_config()
+        mocker.patch.object(config, 'TODO_API_HTTP_RETRIES', self._retries)
+        mocker.patch.object(config, 'TODO_API_HTTP_BACKOFF', 0)
+        return TodoApiClient()._TodoApiClient__get_http_session()  # type: ignore
+
+    def test_jitter_retry_backoff(self, mocker: MockerFixture):
+        retry = JitterRetry(total=5, backoff_factor=1)
+        for _ in range(3):
+            retry = retry.increment(method='GET', error=NewConnectionError(None, 'refused'))  # type: ignore
+        _mocked_uniform = mocker.patch('src.infrastructure.client.http_session.random.uniform', return_value=0.5)
+
+        assert retry.get_backoff_time() == 0.5
+        # Up to the exponential backoff of the third retry
+        _mocked_uniform.assert_called_once_with(0, 4)
+
+    def test_jitter_retry_read_errors_of_idempotent_methods(self):
+        retry = JitterRetry(total=3, allowed_methods=frozenset({'GET'}), status_forcelist=(503,))
+        error = ReadTimeoutError(None, '/', 'Read timed out.')  # type: ignore
+
+        assert retry.is_retry('GET', HTTPStatus.SERVICE_UNAVAILABLE)
+        assert not retry.is_retry('PUT', HTTPStatus.SERVICE_UNAVAILABLE)
+        assert retry.increment(method='GET', error=error).total == 2
+        with pytest.raises(ReadTimeoutError):
+            retry.increment(method='PUT', error=error)
+        # Requests are not sent if the connection fails, every method is retried
+        assert retry.increment(method='PUT', error=NewConnectionError(None, 'refused')).total == 2  # type: ignore
+
+    def test_todo_api_session_retries_idempotent_requests(self, server_url: str, todo_api_session: Session):
+        _Handler.unavailable_count = 1
+        assert todo_api_session.get(f'{server_url}/unavailable', timeout=1).status_code == HTTPStatus.OK
+        assert len(_Handler.received) == 2
+
+        _Handler.unavailable_count = 1
+        response = todo_api_session.put(f'{server_url}/unavailable', timeout=1)
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert len(_Handler.received) == 3
+
+    def test_todo_api_session_read_timeout(self, server_url: str, todo_api_session: Session):
+        # The update may be applied by the server, it is not sent again
+        with pytest.raises(requests.ReadTimeout):
+            todo_api_session.put(f'{server_url}/slow', timeout=0.1)
+        assert _Handler.received == [('PUT', '/slow')]
+
+        with pytest.raises(requests.ConnectionError):
+            todo_api_session.get(f'{server_url}/slow', timeout=0.1)
+        assert _Handler.received.count(('GET', '/slow')) == self._retries + 1
+
+    def test_connect_hook_called_for_new_connections(self, server_url: str):
+        connects: List[Tuple[str, float]] = []
+        session = create_http_session(connect_hook=lambda host, seconds: connects.append((host, seconds)))
+
+        for _ in range(3):
+            assert session.get(f'{server_url}/', timeout=1).status_code == HTTPStatus.OK
+
+        # Pooled connection is reused
+        assert len(connects) == 1
+        assert connects[0][0] == '127.0.0.1'
+        assert connects[0][1] >= 0
+        session.close()
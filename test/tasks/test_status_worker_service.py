@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+from typing import Any, Iterator, List, Tuple
+
+import pytest
+from pytest_mock import MockerFixture
+from requests_mock import Mocker
+from sqlalchemy.exc import OperationalError
+
+from src.config import app_config_manager, worker_config_manager
+from src.domain.todo.entity.todo import Todo
+from src.domain.todo.entity.todo_status import TodoStatuses
+from src.domain.user.entity.user import User
+from src.infrastructure.manager.db_manager import DBManager
+from src.infrastructure.manager.uow_manager import UOWManager
+from src.infrastructure.repository.base.unit_of_work import UnitOfWork
+from src.infrastructure.repository.todo.todo_repository import TodoRepository
+from src.task.beats import beat_check_expired_todos
+from src.task.status.status_worker_service import StatusWorkerService
+from test.repository import create_user, insert_todo_list
+from test.tasks import get_mocker_response
+
+
+@pytest.mark.usefixtures('app', 'celery', 'db_session')
+class TestStatusWorkerService:
+    _mocker_response_path = 'test_check_expired_todos'
+    _chunk_size = 2
+    _expired_count = 5
+
+    @pytest.fixture(scope='function')
+    def db_mode(self, uow: UnitOfWork, mocker: MockerFixture) -> None:
+        mocker.patch.object(worker_config_manager.get_config(), 'STATUS_WORKER_MODE', 'db')
+        mocker.patch.object(app_config_manager.get_config(), 'DB_EXPIRE_CHUNK_SIZE', self._chunk_size)
+        # The worker runs in the test transaction, chunks are committed as savepoints
+        mocker.patch.object(StatusWorkerService, '_StatusWorkerService__get_uow', return_value=uow)
+        mocker.patch.object(uow, 'close')
+        # Rows of the rolled back test transaction are never indexed by the commit hooks, rebuild the index from it
+        uow.todos.redis.delete(uow.todos.get_todo_expiry_index_key(), uow.todos.get_todo_expiry_index_built_key())
+
+    def _insert_expired_todos(self, uow: UnitOfWork) -> Tuple[User, List[Todo]]:
+        todo_list = insert_todo_list(uow, 'expired_todo_list')
+        user = uow.users.get(todo_list.user_id)
+        todos = [Todo.create(f'expired_todo_{i}', None, datetime.utcnow() - timedelta(hours=i + 1), user.id, todo_list.id)
+                 for i in range(self._expired_count)]
+        uow.todos.insert_many(*todos)
+        uow.session().flush()
+        return user, todos
+
+    @staticmethod
+    def _get_status_ids(uow: UnitOfWork, todos: List[Todo]) -> List[int]:
+        uow.session().expire_all()
+        return [uow.todos.get(todo.id).status_id for todo in todos]
+
+    @pytest.mark.usefixtures('db_mode')
+    def test_check_expired_todos_db_mode(self, uow: UnitOfWork, requests_mock: Mocker, mocker: MockerFixture):
+        _, todos = self._insert_expired_todos(uow)
+        _spied_update_expired_todos = mocker.spy(TodoRepository, 'worker_update_expired_todos')
+        _mocked_send_expired_mail = mocker.patch('src.task.mail.tasks.send_expired_digest_mail.delay',
+                                                 return_value=True)
+
+        beat_check_expired_todos.delay()
+
+        # One transaction per chunk, the API is not called
+        assert _spied_update_expired_todos.call_count == 3
+        assert not requests_mock.request_history
+        assert _mocked_send_expired_mail.call_count == 1
+        assert sorted(_mocked_send_expired_mail.call_args.args[1]) == sorted(todo.title for todo in todos)
+        assert self._get_status_ids(uow, todos) == [TodoStatuses.expired.id] * self._expired_count
+
+    @pytest.mark.usefixtures('db_mode')
+    def test_check_expired_todos_db_error_falls_back_to_api(self,
+                                                            uow: UnitOfWork,
+                                                            requests_mock: Mocker,
+                                                            mocker: MockerFixture):
+        user, todos = self._insert_expired_todos(uow)
+        worker_update_expired_todos = TodoRepository.worker_update_expired_todos
+        calls: List[Any] = []
+
+        def update_expired_todos(*args: Any, **kwargs: Any) -> List[Tuple[Todo, User]]:
+            calls.append(args)
+            if len(calls) == 2:
+                raise OperationalError('UPDATE todo', {}, Exception('Lost connection to MySQL server'))
+            return worker_update_expired_todos(*args, **kwargs)
+
+        mocker.patch.object(TodoRepository, 'worker_update_expired_todos', autospec=True,
+                            side_effect=update_expired_todos)
+        requests_mock.post(
+            f'https://{worker_config_manager.get_config().AUTH0_DOMAIN}/oauth/token',
+            json=get_mocker_response(path=self._mocker_response_path, file_name='worker_auth-success'))
+        requests_mock.put(
+            f'{worker_config_manager.get_config().TODO_API_URL}/api/v1/worker/expired',
+            json=get_mocker_response(path=self._mocker_response_path, file_name='check_expired_todos-success'))
+        _mocked_send_expired_mail = mocker.patch('src.task.mail.tasks.send_expired_digest_mail.delay',
+                                                 return_value=True)
+
+        beat_check_expired_todos.delay()
+
+        # The first chunk is committed before the failure, the API continues with the others
+        assert self._get_status_ids(uow, todos) == \
+            [TodoStatuses.open.id] * (self._expired_count - self._chunk_size) + \
+            [TodoStatuses.expired.id] * self._chunk_size
+        assert requests_mock.request_history[-1].method == 'PUT'
+        digests = {call.args[0]: call.args[1] for call in _mocked_send_expired_mail.call_args_list}
+        assert len(digests.pop(user.email)) == self._chunk_size
+        assert [len(titles) for titles in digests.values()] == [8]
+
+    def test_get_uow_does_not_replace_shared_uow(self, uow: UnitOfWork, mocker: MockerFixture):
+        mocker.patch.object(StatusWorkerService, '_StatusWorkerService__uow', None)
+        mocker.patch.object(DBManager, '_create_session_factory')
+
+        worker_uow = StatusWorkerService._StatusWorkerService__get_uow()  # type: ignore
+
+        assert worker_uow is not uow
+        assert UOWManager._uow is uow
+        with UOWManager.use_uow(worker_uow):
+            assert UOWManager.get_uow() is worker_uow
+        assert UOWManager.get_uow() is uow
+
+
+class TestExpiredDigests:
+
+    @staticmethod
+    def _expired_todos(*users: User) -> List[Tuple[Todo, User]]:
+        return [(Todo.create(f'expired_todo_{i}', None, datetime.utcnow(), user.id, 'todo_list_id'), user)
+                for i, user in enumerate(users)]
+
+    def test_full_digests_are_yielded(self):
+        user = create_user()
+        todo_user_list = self._expired_todos(*[user] * 5)
+
+        digests = list(StatusWorkerService.iter_expired_digests(todo_user_list, max_todos=2, max_buffered_todos=10))
+
+        assert digests == [(user.email, ['expired_todo_0', 'expired_todo_1']),
+                           (user.email, ['expired_todo_2', 'expired_todo_3']),
+                           (user.email, ['expired_todo_4'])]
+
+    def test_buffered_digests_are_yielded_at_limit(self):
+        first_user, second_user = create_user(), create_user()
+        todo_user_list = self._expired_todos(first_user, second_user, first_user, second_user, first_user)
+        read_todos: List[Tuple[Todo, User]] = []
+
+        def read(todos: List[Tuple[Todo, User]]) -> Iterator[Tuple[Todo, User]]:
+            for todo_user in todos:
+                read_todos.append(todo_user)
+                yield todo_user
+
+        digests = StatusWorkerService.iter_expired_digests(read(todo_user_list), max_todos=10, max_buffered_todos=3)
+
+        # Digests of all users are yielded before the rest of the todos are read
+        assert next(digests) == (first_user.email, ['expired_todo_0', 'expired_todo_2'])
+        assert next(digests) == (second_user.email, ['expired_todo_1'])
+        assert len(read_todos) == 3
+        assert list(digests) == [(second_user.email, ['expired_todo_3']), (first_user.email, ['expired_todo_4'])]
+
+    def test_read_digests_are_yielded_on_error(self):
+        first_user, second_user = create_user(), create_user()
+        todo_user_list = self._expired_todos(first_user, second_user, first_user)
+
+        def read() -> Iterator[Tuple[Todo, User]]:
+            yield from todo_user_list
+            raise OperationalError('UPDATE todo', {}, Exception('Lost connection to MySQL server'))
+
+        digests = []
+        with pytest.raises(OperationalError):
+            for digest in StatusWorkerService.iter_expired_digests(read(), max_todos=10, max_buffered_todos=10):
+                digests.append(digest)
+
+        assert digests == [(first_user.email, ['expired_todo_0', 'expired_todo_2']),
+                           (second_user.email, ['expired_todo_1'])]
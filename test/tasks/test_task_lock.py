@@ -0,0 +1,100 @@
+import time
+from typing import Any, Iterator, List
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src.infrastructure.manager.redis_manager import RedisManager
+from src.task.status.tasks import update_expired_todos
+
+
+@pytest.mark.usefixtures('celery')
+class TestTaskLock:
+    _lock_key = f'lock_task:{update_expired_todos.name}'
+    _enqueue_key = f'enqueued_task:{update_expired_todos.name}'
+    _ttl = 0.5
+
+    @pytest.fixture(scope='function')
+    def short_ttl(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(update_expired_todos, 'default_ttl', self._ttl)
+        mocker.patch.object(update_expired_todos, 'heartbeat_interval', self._ttl / 5)
+
+    def test_not_enqueued_while_running(self, mocker: MockerFixture):
+        _mocked_iter_expired_todos = mocker.patch(
+            'src.task.status.status_worker_service.StatusWorkerService.iter_expired_todos', return_value=iter([]))
+
+        redis = RedisManager.get_redis()
+        redis.set(self._lock_key, 'running', ex=60)
+        try:
+            assert update_expired_todos.delay() is None
+        finally:
+            redis.delete(self._lock_key)
+
+        assert not _mocked_iter_expired_todos.called
+        assert not redis.exists(self._enqueue_key)
+
+    def test_not_enqueued_while_queued(self, mocker: MockerFixture):
+        _mocked_iter_expired_todos = mocker.patch(
+            'src.task.status.status_worker_service.StatusWorkerService.iter_expired_todos', return_value=iter([]))
+
+        redis = RedisManager.get_redis()
+        redis.set(self._enqueue_key, 'queued', ex=60)
+        try:
+            assert update_expired_todos.delay() is None
+        finally:
+            redis.delete(self._enqueue_key)
+
+        assert not _mocked_iter_expired_todos.called
+
+    def test_lock_released_after_run(self, mocker: MockerFixture):
+        _mocked_iter_expired_todos = mocker.patch(
+            'src.task.status.status_worker_service.StatusWorkerService.iter_expired_todos', return_value=iter([]))
+
+        update_expired_todos.delay()
+
+        redis = RedisManager.get_redis()
+        assert _mocked_iter_expired_todos.called
+        assert not redis.exists(self._lock_key)
+        assert not redis.exists(self._enqueue_key)
+
+    @pytest.mark.usefixtures('short_ttl')
+    def test_lock_extended_while_running(self, mocker: MockerFixture):
+        redis = RedisManager.get_redis()
+        lock_exists: List[bool] = []
+
+        def iter_expired_todos() -> Iterator[Any]:
+            # The task runs longer than the TTL of the lock
+            for _ in range(4):
+                time.sleep(self._ttl / 2)
+                lock_exists.append(bool(redis.exists(self._lock_key)))
+            return iter([])
+
+        mocker.patch('src.task.status.status_worker_service.StatusWorkerService.iter_expired_todos',
+                     side_effect=iter_expired_todos)
+
+        update_expired_todos.delay()
+
+        assert lock_exists == [True] * 4
+        assert not redis.exists(self._lock_key)
+
+    @pytest.mark.usefixtures('short_ttl')
+    def test_lost_lock_is_not_released(self, mocker: MockerFixture, caplog: pytest.LogCaptureFixture):
+        redis = RedisManager.get_redis()
+
+        def iter_expired_todos() -> Iterator[Any]:
+            # The lock expires and another worker acquires it
+            redis.set(self._lock_key, 'another_token', ex=60)
+            time.sleep(self._ttl)
+            return iter([])
+
+        mocker.patch('src.task.status.status_worker_service.StatusWorkerService.iter_expired_todos',
+                     side_effect=iter_expired_todos)
+
+        try:
+            update_expired_todos.delay()
+
+            assert f'Lock {self._lock_key} is lost, it could not be extended.' in caplog.messages
+            assert f'Lock of task {update_expired_todos.name} is expired.' in caplog.messages
+            assert redis.get(self._lock_key) == 'another_token'
+        finally:
+            redis.delete(self._lock_key)